@@ -0,0 +1,221 @@
+"""Per-user cache of assignment reads, invalidated by generation counters.
+
+Every user has a generation number. Cached results are keyed by
+``(user_id, generation, query)``, and every write to a user's assignments bumps
+the generation after it commits, so all earlier entries become unreachable at
+once and age out of the LRU. Results live in process memory. The generations
+live in a store shared by all processes, so a write in one process (web app,
+worker, reminder shard) invalidates the caches of all of them:
+
+- ``SQLiteGenerationStore``: processes on one host, and tests
+- ``RedisGenerationStore``: any Redis-compatible server; needs the optional
+  ``redis`` package
+- ``LocalGenerationStore``: this process only (default). The worker always
+  writes from another process, so with this store results are not cached and
+  every read goes to the database.
+"""
+import os
+import sqlite3
+import threading
+from config import Config
+from caching import LRUCache
+
+class LocalGenerationStore:
+    """Generations in a dict; only coherent within one process"""
+
+    name = 'local'
+    shared = False
+
+    def __init__(self):
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        return self._generations.get(user_id, 0)
+
+    def bump_many(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+class SQLiteGenerationStore:
+    """Generations in a SQLite file shared by the processes of one host"""
+
+    name = 'sqlite'
+    shared = True
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._connect().execute("""
+            CREATE TABLE IF NOT EXISTS assignment_cache_generations (
+                user_id INTEGER PRIMARY KEY,
+                generation INTEGER NOT NULL
+            )
+        """)
+
+    def _connect(self):
+        """One connection per thread (and process), reused across calls"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, user_id):
+        row = self._connect().execute(
+            "SELECT generation FROM assignment_cache_generations WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump_many(self, user_ids):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("""
+                INSERT INTO assignment_cache_generations (user_id, generation) VALUES (?, 1)
+                ON CONFLICT(user_id) DO UPDATE SET generation = generation + 1
+            """, [(user_id,) for user_id in user_ids])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+class RedisGenerationStore:
+    """Generations in a Redis-compatible server (one INCR per user on writes)"""
+
+    name = 'redis'
+    shared = True
+    KEY_PREFIX = 'deadline-tracker:assignments:gen:'
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("ASSIGNMENT_CACHE_REDIS_URL is set but the redis package is not installed")
+        self._client = redis.Redis.from_url(url, socket_timeout=1)
+
+    def get(self, user_id):
+        value = self._client.get(f"{self.KEY_PREFIX}{user_id}")
+        return int(value) if value else 0
+
+    def bump_many(self, user_ids):
+        pipeline = self._client.pipeline(transaction=False)
+        for user_id in user_ids:
+            pipeline.incr(f"{self.KEY_PREFIX}{user_id}")
+        pipeline.execute()
+
+def get_generation_store():
+    """Generation store selected by ASSIGNMENT_CACHE_REDIS_URL / ASSIGNMENT_CACHE_SQLITE_PATH"""
+    if Config.ASSIGNMENT_CACHE_REDIS_URL:
+        return RedisGenerationStore(Config.ASSIGNMENT_CACHE_REDIS_URL)
+    if Config.ASSIGNMENT_CACHE_SQLITE_PATH:
+        return SQLiteGenerationStore(Config.ASSIGNMENT_CACHE_SQLITE_PATH)
+    return LocalGenerationStore()
+
+class AssignmentCache:
+    """Read-through cache of a user's assignment queries.
+
+    ``maxsize`` bounds the number of cached results across all users; 0
+    disables the cache, and so does a generation store that is not shared.
+    ``ttl`` bounds how long a result is kept even if its generation never
+    changes, which covers writes made outside the models (manual SQL,
+    migrations). If the generation store is unreachable, reads go
+    to the database and the local entries are dropped on the next write.
+    """
+
+    def __init__(self, store=None, maxsize=4096, ttl=300):
+        self.store = store
+        self._results = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._stats = {'bumps': 0, 'store_errors': 0}
+
+    def _get_store(self):
+        if self.store is None:
+            with self._lock:
+                if self.store is None:
+                    self.store = get_generation_store()
+        return self.store
+
+    def _error(self, action, error):
+        with self._lock:
+            self._stats['store_errors'] += 1
+        print(f"⚠️  Assignment cache store {action} failed: {error}")
+
+    def get_or_load(self, user_id, query, load):
+        """Return the cached result of ``query`` for ``user_id``, calling ``load()`` on a miss.
+
+        ``load`` must return a row dict, a list of row dicts or None. Callers
+        get fresh copies of the rows and may modify them.
+        """
+        if not self.is_enabled():
+            return load()
+        generation = self.generation(user_id)
+        if generation is None:
+            return load()
+        key = (user_id, generation, query)
+        cached = self._results.get(key)
+        if cached is None:
+            result = load()
+            cached = (tuple(result) if isinstance(result, (list, tuple)) else result,)
+            self._results.set(key, cached)
+        result = cached[0]
+        if isinstance(result, tuple):
+            return [dict(row) for row in result]
+        return dict(result) if result is not None else None
+
+    def generation(self, user_id):
+        """The user's current generation, or None if the store is unreachable"""
+        try:
+            return self._get_store().get(user_id)
+        except Exception as e:
+            self._error('read', e)
+            return None
+
+    def is_shared(self):
+        """True if generations are shared with the other processes"""
+        return self._get_store().shared
+
+    def is_enabled(self):
+        """True if results are cached; only with a size and a shared generation store"""
+        if self._results.maxsize <= 0:
+            return False
+        try:
+            return self.is_shared()
+        except Exception as e:
+            self._error('open', e)
+            return False
+
+    def invalidate(self, *user_ids):
+        """Bump the generation of every given user; call after the write commits"""
+        user_ids = {user_id for user_id in user_ids if user_id is not None}
+        if not user_ids:
+            return
+        try:
+            self._get_store().bump_many(sorted(user_ids))
+        except Exception as e:
+            self._error('bump', e)
+            # Generations are unknown; no local entry can be trusted
+            self._results.clear()
+            return
+        with self._lock:
+            self._stats['bumps'] += len(user_ids)
+
+    def metrics(self):
+        with self._lock:
+            metrics = dict(self._stats)
+        metrics.update(self._results.stats())
+        metrics['store'] = self.store.name if self.store is not None else None
+        metrics['enabled'] = self.store is not None and self.is_enabled()
+        return metrics
+
+_assignment_cache = AssignmentCache(
+    maxsize=Config.ASSIGNMENT_CACHE_SIZE,
+    ttl=Config.ASSIGNMENT_CACHE_TTL
+)
+
+def get_assignment_cache():
+    """Return the process-wide assignment cache"""
+    return _assignment_cache
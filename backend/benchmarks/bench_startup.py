@@ -0,0 +1,62 @@
+"""Startup benchmark: import-to-first-request latency of the API.
+
+Every run starts a fresh interpreter that imports app.py (building the app
+with create_app()), then serves GET /api/health through the test client.
+Reports the median import time, first-request time and their total, and
+which of the lazily imported modules were loaded by the time the first
+request finished (none of them should be).
+
+    cd backend && python benchmarks/bench_startup.py [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Modules that must not be loaded just to build the app and serve a request
+# that does not need them
+LAZY_MODULES = ('pytz', 'smtplib', 'email.mime.multipart', 'email_templates')
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().get('/api/health')
+served = time.perf_counter()
+assert response.status_code == 200, response.status_code
+import threading
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'first_request_ms': (served - imported) * 1000,
+    'loaded': [m for m in %r if m in sys.modules],
+    'threads': threading.active_count()
+}))
+""" % (LAZY_MODULES,)
+
+
+def run_once():
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD], cwd=BACKEND_DIR, check=True,
+        capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(runs):
+    results = [run_once() for _ in range(runs)]
+    import_ms = statistics.median(r['import_ms'] for r in results)
+    request_ms = statistics.median(r['first_request_ms'] for r in results)
+    print(f"runs:               {runs}")
+    print(f"import app:         {import_ms:8.1f} ms (median)")
+    print(f"first request:      {request_ms:8.1f} ms (median)")
+    print(f"import to response: {import_ms + request_ms:8.1f} ms")
+    print(f"threads running:    {results[-1]['threads']}")
+    print(f"lazy modules loaded: {results[-1]['loaded'] or 'none'}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
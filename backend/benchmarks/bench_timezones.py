@@ -0,0 +1,74 @@
+"""Microbenchmark: converting due dates of a result set from UTC to local time.
+
+Compares the per-row conversion the assignment routes used before the
+timezones module (pytz.timezone() lookup, strptime attempts and strftime for
+every row) with timezones.convert_rows(), which resolves the tzinfo once and
+takes a fast path for the naive datetimes PyMySQL returns.
+
+    cd backend && python benchmarks/bench_timezones.py [rows]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pytz
+from timezones import convert_rows
+
+
+def legacy_convert_utc_to_eat(utc_datetime_str):
+    """The conversion routes/assignments.py ran for every row before"""
+    try:
+        if not utc_datetime_str:
+            return None
+        if isinstance(utc_datetime_str, str):
+            for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d']:
+                try:
+                    utc_dt = datetime.strptime(utc_datetime_str, fmt)
+                    break
+                except ValueError:
+                    continue
+            else:
+                return utc_datetime_str
+        else:
+            utc_dt = utc_datetime_str
+        if utc_dt.tzinfo is None:
+            utc_dt = pytz.UTC.localize(utc_dt)
+        eat_tz = pytz.timezone('Africa/Nairobi')
+        eat_dt = utc_dt.astimezone(eat_tz)
+        return eat_dt.strftime('%Y-%m-%d %H:%M:%S')
+    except Exception:
+        return utc_datetime_str
+
+
+def make_rows(count):
+    start = datetime(2025, 1, 1, 8, 0, 0)
+    return [{'id': i, 'due_date': start + timedelta(minutes=37 * i)} for i in range(count)]
+
+
+def bench(label, convert, count):
+    rows = make_rows(count)
+    started = time.perf_counter()
+    convert(rows)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<36} {elapsed * 1000:9.1f} ms  {count / elapsed:12,.0f} rows/s")
+    return rows
+
+
+def legacy(rows):
+    for row in rows:
+        if row['due_date']:
+            row['due_date'] = legacy_convert_utc_to_eat(row['due_date'])
+
+
+def main(count):
+    expected = bench('per-row convert_utc_to_eat (before)', legacy, count)
+    actual = bench('convert_rows, EAT', lambda rows: convert_rows(rows, 'Africa/Nairobi'), count)
+    assert actual == expected, 'convert_rows output differs from the legacy conversion'
+    bench('convert_rows, America/New_York (DST)', lambda rows: convert_rows(rows, 'America/New_York'), count)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Bounded, thread-safe LRU cache whose entries expire after ``ttl`` seconds.
+
+    ``maxsize`` of 0 disables caching (every lookup is a miss). Hit, miss and
+    eviction counters are kept for metrics.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expired': 0,
+            'invalidations': 0
+        }
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` (``default`` if absent or expired)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, self._MISSING)
+            if entry is not self._MISSING:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._data.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return value
+                del self._data[key]
+                self._stats['expired'] += 1
+            self._stats['misses'] += 1
+            return default
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._data.pop(key, self._MISSING) is not self._MISSING:
+                self._stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, size=len(self._data), maxsize=self.maxsize, ttl=self.ttl)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else None
+        return stats
@@ -35,6 +35,17 @@ class Config:
             }
         return None
     
+    # Database connection pool
+    DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE') or 1)
+    DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE') or 10)
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT') or 10)  # Seconds to wait for a free connection
+    DB_POOL_MAX_LIFETIME = int(os.environ.get('DB_POOL_MAX_LIFETIME') or 1800)  # Recycle connections after 30 minutes
+    DB_POOL_PING_INTERVAL = int(os.environ.get('DB_POOL_PING_INTERVAL') or 30)  # Ping connections idle longer than this
+    DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT') or 10)
+    
+    # Schema migrations
+    AUTO_MIGRATE = os.environ.get('AUTO_MIGRATE', 'true').lower() == 'true'  # Apply pending migrations at startup
+    
     # Email Configuration
     MAIL_SERVER = os.environ.get('MAIL_SERVER') or 'smtp.gmail.com'
     MAIL_PORT = int(os.environ.get('MAIL_PORT') or 587)
@@ -43,6 +54,62 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME') or 'deadline.tracker.app@gmail.com'  # Default sender
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD') or ''  # App password required
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER') or 'deadline.tracker.app@gmail.com'
+    MAIL_POOL_WORKERS = int(os.environ.get('MAIL_POOL_WORKERS') or 4)  # SMTP sender threads, one session each
+    MAIL_QUEUE_SIZE = int(os.environ.get('MAIL_QUEUE_SIZE') or 1000)  # Bounded outgoing queue
+    MAIL_ENQUEUE_TIMEOUT = float(os.environ.get('MAIL_ENQUEUE_TIMEOUT') or 5)  # Seconds to wait when the queue is full
+    MAIL_SESSION_IDLE_TIMEOUT = int(os.environ.get('MAIL_SESSION_IDLE_TIMEOUT') or 60)  # Close idle SMTP sessions
+    MAIL_SMTP_TIMEOUT = int(os.environ.get('MAIL_SMTP_TIMEOUT') or 30)
+    
+    # User profile cache (per process)
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE') or 1024)  # Profiles held in memory; 0 disables
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL') or 300)  # Seconds; bounds staleness of writes by other processes
+    
+    # Per-user assignment cache; only active with a Redis or SQLite generation store, which keeps processes coherent
+    ASSIGNMENT_CACHE_SIZE = int(os.environ.get('ASSIGNMENT_CACHE_SIZE') or 4096)  # Cached query results; 0 disables
+    ASSIGNMENT_CACHE_TTL = int(os.environ.get('ASSIGNMENT_CACHE_TTL') or 300)  # Seconds; backstop for writes outside the models
+    ASSIGNMENT_CACHE_REDIS_URL = os.environ.get('ASSIGNMENT_CACHE_REDIS_URL') or ''  # e.g. redis://localhost:6379/0 (needs redis)
+    ASSIGNMENT_CACHE_SQLITE_PATH = os.environ.get('ASSIGNMENT_CACHE_SQLITE_PATH') or ''  # Single-host/testing alternative to Redis
+    
+    # Live events (GET /api/events); Redis or SQLite carries events between processes
+    EVENTS_REDIS_URL = os.environ.get('EVENTS_REDIS_URL') or ''  # e.g. redis://localhost:6379/0 (needs redis)
+    EVENTS_SQLITE_PATH = os.environ.get('EVENTS_SQLITE_PATH') or ''  # Single-host/testing alternative to Redis
+    EVENTS_BUFFER_SIZE = int(os.environ.get('EVENTS_BUFFER_SIZE') or 200)  # Events per user kept for Last-Event-ID resume
+    EVENTS_BUFFER_USERS = int(os.environ.get('EVENTS_BUFFER_USERS') or 10000)  # Users with in-process replay buffers (local backend)
+    EVENTS_QUEUE_SIZE = int(os.environ.get('EVENTS_QUEUE_SIZE') or 1000)  # Undelivered events before a slow stream is closed
+    EVENTS_HEARTBEAT = int(os.environ.get('EVENTS_HEARTBEAT') or 15)  # Seconds between keep-alive comments on idle streams
+    EVENTS_MAX_STREAM = int(os.environ.get('EVENTS_MAX_STREAM') or 3600)  # Streams are closed after this; clients reconnect and resume
+    
+    # Delta sync (GET /api/assignments/changes)
+    TOMBSTONE_RETENTION_DAYS = int(os.environ.get('TOMBSTONE_RETENTION_DAYS') or 30)  # Older sync tokens get a full resync
+    
+    # Email outbox dispatcher
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE') or 50)
+    OUTBOX_POLL_INTERVAL = float(os.environ.get('OUTBOX_POLL_INTERVAL') or 5)
+    OUTBOX_LEASE_SECONDS = int(os.environ.get('OUTBOX_LEASE_SECONDS') or 300)  # Claimed rows are reclaimed after this
+    OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS') or 5)
+    OUTBOX_BACKOFF_BASE = int(os.environ.get('OUTBOX_BACKOFF_BASE') or 60)  # Seconds; doubles on every failed attempt
+    
+    # Reminders
+    REMINDER_BATCH_SIZE = int(os.environ.get('REMINDER_BATCH_SIZE') or 500)  # Assignments per bookkeeping transaction
+    REMINDER_DIGEST_ENABLED = os.environ.get('REMINDER_DIGEST_ENABLED', 'true').lower() == 'true'  # One email per user per run
+    REMINDER_LEAD_DAYS = float(os.environ.get('REMINDER_LEAD_DAYS') or 3)  # Remind this long before the due date
+    REMINDER_SCHEDULER_HORIZON = int(os.environ.get('REMINDER_SCHEDULER_HORIZON') or 21600)  # Seconds of fire times held in memory
+    REMINDER_SCHEDULER_COALESCE = int(os.environ.get('REMINDER_SCHEDULER_COALESCE') or 30)  # Fire reminders this close together as one batch
+    REMINDER_SCHEDULER_RESYNC = int(os.environ.get('REMINDER_SCHEDULER_RESYNC') or 3600)  # Reload the whole window as a safety net
+    REMINDER_SCHEDULER_POLL = int(os.environ.get('REMINDER_SCHEDULER_POLL') or 15)  # Seconds between polls for writes by other processes
+    REMINDER_SHARDS = int(os.environ.get('REMINDER_SHARDS') or 1)  # >1 fans reminder passes out over worker processes by user_id
+    REMINDER_SHARD_WORKERS = int(os.environ.get('REMINDER_SHARD_WORKERS') or 0)  # Processes; 0 = min(shards, CPU count)
+    REMINDER_SHARD_CLAIM_TTL = int(os.environ.get('REMINDER_SHARD_CLAIM_TTL') or 300)  # Seconds a node holds a shard it is processing
+    REMINDER_SHARD_MIN_BATCH = int(os.environ.get('REMINDER_SHARD_MIN_BATCH') or 1000)  # Smaller scheduler batches stay in-process
+    
+    # Leader election for singleton background jobs
+    LEADER_LEASE_TTL = int(os.environ.get('LEADER_LEASE_TTL') or 30)  # Seconds; bounds failover time
+    LEADER_LEASE_SQLITE_PATH = os.environ.get('LEADER_LEASE_SQLITE_PATH') or ''  # Single-host/testing alternative to MySQL leases
+    
+    # Background worker (python -m worker)
+    WORKER_MAINTENANCE_INTERVAL = int(os.environ.get('WORKER_MAINTENANCE_INTERVAL') or 3600)  # Seconds between maintenance runs
+    WORKER_METRICS_INTERVAL = int(os.environ.get('WORKER_METRICS_INTERVAL') or 60)  # Seconds between metrics log lines
+    WORKER_METRICS_PORT = int(os.environ.get('WORKER_METRICS_PORT') or 0)  # Serve worker metrics as JSON; 0 disables
     
     # Application Settings
     APP_NAME = 'Deadline Tracker'
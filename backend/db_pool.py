@@ -0,0 +1,228 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+    pass
+
+
+class PooledConnection:
+    """Bookkeeping wrapper around a raw DB-API connection"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+
+    def age(self):
+        return time.monotonic() - self.created_at
+
+    def idle_time(self):
+        return time.monotonic() - self.last_used_at
+
+
+class ConnectionPool:
+    """Bounded, thread-safe connection pool.
+
+    Connections are created lazily up to ``max_size`` and ``min_size`` of them
+    are kept warm. A connection is pinged on checkout if it has been idle for
+    longer than ``ping_interval`` seconds and is recycled once it is older than
+    ``max_lifetime`` seconds, so callers never see connections the server or a
+    proxy has silently dropped.
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, timeout=10,
+                 max_lifetime=1800, ping_interval=30):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._connect = connect
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+
+        self._idle = []
+        self._size = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._pid = os.getpid()
+
+        self._stats = {
+            'checkouts': 0,
+            'created': 0,
+            'closed': 0,
+            'recycled': 0,
+            'failed_pings': 0,
+            'timeouts': 0,
+            'wait_time_total': 0.0
+        }
+
+    def _check_fork(self):
+        """Drop connections inherited from a parent process (must hold the lock)"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle = []
+            self._size = 0
+
+    def _open(self):
+        raw = self._connect()
+        with self._cond:
+            self._stats['created'] += 1
+        return PooledConnection(raw)
+
+    def _discard(self, pooled):
+        try:
+            pooled.raw.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._stats['closed'] += 1
+            self._cond.notify()
+
+    def _is_usable(self, pooled):
+        """Recycle old connections and ping ones that sat idle for a while"""
+        if self.max_lifetime and pooled.age() > self.max_lifetime:
+            with self._cond:
+                self._stats['recycled'] += 1
+            return False
+        if self.ping_interval is not None and pooled.idle_time() > self.ping_interval:
+            try:
+                pooled.raw.ping(reconnect=False)
+            except Exception:
+                with self._cond:
+                    self._stats['failed_pings'] += 1
+                return False
+        return True
+
+    def acquire(self, timeout=None):
+        """Check out a connection, waiting up to ``timeout`` seconds for one"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        started = time.monotonic()
+
+        while True:
+            pooled = None
+            create = False
+            with self._cond:
+                self._check_fork()
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"Timed out after {timeout}s waiting for a database connection"
+                        )
+                    self._cond.wait(remaining)
+                if self._idle:
+                    pooled = self._idle.pop()
+                else:
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    pooled = self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_usable(pooled):
+                self._discard(pooled)
+                continue
+
+            with self._cond:
+                self._stats['checkouts'] += 1
+                self._stats['wait_time_total'] += time.monotonic() - started
+            return pooled
+
+    def release(self, pooled, discard=False):
+        """Return a connection to the pool, rolling back any open transaction"""
+        if not discard:
+            try:
+                pooled.raw.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            if self._pid != os.getpid():
+                return
+
+        if discard:
+            self._discard(pooled)
+            return
+
+        pooled.last_used_at = time.monotonic()
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager yielding a raw connection from the pool"""
+        pooled = self.acquire(timeout)
+        discard = False
+        try:
+            yield pooled.raw
+        except Exception as e:
+            # Connection-level errors leave the session in an unknown state
+            discard = _is_connection_error(e)
+            raise
+        finally:
+            self.release(pooled, discard=discard)
+
+    def prefill(self):
+        """Open connections until ``min_size`` are available"""
+        while True:
+            with self._cond:
+                self._check_fork()
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                pooled = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            with self._cond:
+                self._idle.append(pooled)
+                self._cond.notify()
+
+    def close(self):
+        """Close every idle connection"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._discard(pooled)
+
+    def stats(self):
+        """Snapshot of pool usage counters"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats['size'] = self._size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._size - len(self._idle)
+            stats['min_size'] = self.min_size
+            stats['max_size'] = self.max_size
+        checkouts = stats['checkouts']
+        stats['avg_wait_ms'] = round(stats.pop('wait_time_total') / checkouts * 1000, 3) if checkouts else 0.0
+        return stats
+
+
+def _is_connection_error(error):
+    """True for errors that mean the underlying connection is unusable"""
+    try:
+        import pymysql
+    except ImportError:
+        return False
+    if isinstance(error, pymysql.err.InterfaceError):
+        return True
+    if isinstance(error, pymysql.err.OperationalError) and error.args:
+        # 2006: server has gone away, 2013: lost connection during query
+        return error.args[0] in (2006, 2013, 2014, 2045, 2055)
+    return False
@@ -1,66 +1,240 @@
 from config import Config
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import os
+import queue
 import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+class MailQueueFullError(Exception):
+    """Raised when the outgoing mail queue stays full past the enqueue timeout"""
+    pass
+
+class SMTPSenderPool:
+    """Fixed-size pool of SMTP sender threads fed by a bounded queue.
+    
+    Each worker keeps one authenticated SMTP session open between messages,
+    reconnecting when the server drops it and closing it after
+    ``idle_timeout`` seconds without work. ``submit`` blocks for at most
+    ``enqueue_timeout`` seconds when the queue is full, then raises
+    MailQueueFullError so callers feel backpressure instead of piling up threads.
+    """
+    
+    def __init__(self, workers=4, queue_size=1000, enqueue_timeout=5, idle_timeout=60, smtp_timeout=30):
+        self.workers = workers
+        self.enqueue_timeout = enqueue_timeout
+        self.idle_timeout = idle_timeout
+        self.smtp_timeout = smtp_timeout
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._threads = []
+        self._pid = None
+        self._latencies = deque(maxlen=1000)
+        self._stats = {
+            'submitted': 0,
+            'sent': 0,
+            'failed': 0,
+            'rejected': 0,
+            'reconnects': 0
+        }
+    
+    def _ensure_started(self):
+        """Start worker threads on first use in this process (threads don't survive fork)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self._queue.maxsize)
+            self._threads = []
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"smtp-sender-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            self._pid = os.getpid()
+    
+    def submit(self, msg, recipients, timeout=None):
+        """Queue a message for delivery and return a Future resolved when it is sent"""
+        self._ensure_started()
+        future = Future()
+        timeout = self.enqueue_timeout if timeout is None else timeout
+        try:
+            self._queue.put((msg, recipients, future, time.monotonic()), timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise MailQueueFullError(f"Mail queue is full ({self._queue.maxsize} messages)")
+        with self._lock:
+            self._stats['submitted'] += 1
+        return future
+    
+    def _open_session(self):
+        import smtplib
+        if Config.MAIL_USE_SSL:
+            server = smtplib.SMTP_SSL(Config.MAIL_SERVER, Config.MAIL_PORT, timeout=self.smtp_timeout)
+        else:
+            server = smtplib.SMTP(Config.MAIL_SERVER, Config.MAIL_PORT, timeout=self.smtp_timeout)
+            if Config.MAIL_USE_TLS:
+                server.starttls()
+        server.login(Config.MAIL_USERNAME, Config.MAIL_PASSWORD)
+        return server
+    
+    @staticmethod
+    def _close_session(server):
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+    
+    def _deliver(self, server, msg, recipients):
+        """Send one message, reconnecting once if the session went stale"""
+        import smtplib
+        for attempt in range(2):
+            if server is None:
+                server = self._open_session()
+                if attempt:
+                    with self._lock:
+                        self._stats['reconnects'] += 1
+            try:
+                server.sendmail(Config.MAIL_DEFAULT_SENDER, recipients, msg.as_string())
+                return server
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPSenderRefused, OSError):
+                self._close_session(server)
+                server = None
+                if attempt:
+                    raise
+        return server
+    
+    def _run(self):
+        server = None
+        while True:
+            try:
+                msg, recipients, future, queued_at = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                # Don't hold an idle session open until the server times it out
+                self._close_session(server)
+                server = None
+                continue
+            
+            started = time.monotonic()
+            try:
+                server = self._deliver(server, msg, recipients)
+                with self._lock:
+                    self._stats['sent'] += 1
+                    self._latencies.append((time.monotonic() - started, started - queued_at))
+                print(f"Email sent successfully: {msg['Subject']} to {recipients}")
+                future.set_result(True)
+            except Exception as e:
+                self._close_session(server)
+                server = None
+                with self._lock:
+                    self._stats['failed'] += 1
+                print(f"Failed to send email: {e}")
+                print(f"Email content: {msg['Subject']} to {recipients}")
+                future.set_exception(e)
+            finally:
+                self._queue.task_done()
+    
+    def metrics(self):
+        """Queue depth, delivery counters and send/queue latency percentiles"""
+        with self._lock:
+            stats = dict(self._stats)
+            latencies = list(self._latencies)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['queue_capacity'] = self._queue.maxsize
+        stats['workers'] = self.workers
+        stats['running'] = self._pid == os.getpid()
+        
+        def percentile(values, pct):
+            if not values:
+                return 0.0
+            values = sorted(values)
+            return round(values[min(len(values) - 1, int(len(values) * pct))] * 1000, 1)
+        
+        send_times = [send for send, _ in latencies]
+        wait_times = [wait for _, wait in latencies]
+        stats['send_latency_ms'] = {'p50': percentile(send_times, 0.5), 'p95': percentile(send_times, 0.95)}
+        stats['queue_wait_ms'] = {'p50': percentile(wait_times, 0.5), 'p95': percentile(wait_times, 0.95)}
+        return stats
+
+_sender_pool = SMTPSenderPool(
+    workers=Config.MAIL_POOL_WORKERS,
+    queue_size=Config.MAIL_QUEUE_SIZE,
+    enqueue_timeout=Config.MAIL_ENQUEUE_TIMEOUT,
+    idle_timeout=Config.MAIL_SESSION_IDLE_TIMEOUT,
+    smtp_timeout=Config.MAIL_SMTP_TIMEOUT
+)
+
+def get_sender_pool():
+    """Return the process-wide SMTP sender pool"""
+    return _sender_pool
+
+def get_mail_metrics():
+    """Metrics for the outgoing mail pipeline"""
+    return _sender_pool.metrics()
+
+def get_templates():
+    """Return the compiled email templates; Jinja2 is imported on first use"""
+    from email_templates import get_templates as load_templates
+    return load_templates()
 
 def init_mail(app):
     """Initialize email service with the app"""
-    # For now, we'll use a simple SMTP setup
-    # This can be enhanced later with Flask-Mail
-    pass
+    # Compile the email templates once up front. Sender threads start lazily
+    # on the first message, so nothing is started here (and nothing is
+    # inherited across a fork)
+    get_templates()
 
-def send_email(subject, recipients, body, html_body=None, sender_email=None):
-    """Send email with the given parameters using SMTP"""
-    try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        
-        # Use provided sender email or default
-        from_email = sender_email or Config.MAIL_DEFAULT_SENDER or Config.MAIL_USERNAME
-        msg['From'] = from_email
-        msg['To'] = ', '.join(recipients)
-        
-        # Add text and HTML parts
-        text_part = MIMEText(body, 'plain')
-        msg.attach(text_part)
-        
-        if html_body:
-            html_part = MIMEText(html_body, 'html')
-            msg.attach(html_part)
-        
-        # Send email asynchronously
-        thread = threading.Thread(target=send_email_async, args=(msg, recipients))
-        thread.start()
-        
-        return True
-    except Exception as e:
-        print(f"Failed to create email: {e}")
-        return False
+def build_message(subject, recipients, body, html_body=None, sender_email=None):
+    """Build a multipart text/HTML message"""
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    
+    # Use provided sender email or default
+    from_email = sender_email or Config.MAIL_DEFAULT_SENDER or Config.MAIL_USERNAME
+    msg['From'] = from_email
+    msg['To'] = ', '.join(recipients)
+    
+    # Add text and HTML parts
+    text_part = MIMEText(body, 'plain')
+    msg.attach(text_part)
+    
+    if html_body:
+        html_part = MIMEText(html_body, 'html')
+        msg.attach(html_part)
+    
+    return msg
 
-def send_email_async(msg, recipients):
-    """Send email asynchronously using SMTP"""
+def mail_configured():
+    """True when SMTP credentials are set"""
+    return bool(Config.MAIL_USERNAME and Config.MAIL_PASSWORD)
+
+def send_email(subject, recipients, body, html_body=None, sender_email=None,
+               user_id=None, assignment_id=None, notification_type='general'):
+    """Queue an email in the durable outbox; the outbox dispatcher delivers it"""
     try:
         # Only send if email is configured
-        if not Config.MAIL_USERNAME or not Config.MAIL_PASSWORD:
-            print(f"Email not configured. Would send: {msg['Subject']} to {recipients}")
-            return
-        
-        # Create SMTP session
-        server = smtplib.SMTP(Config.MAIL_SERVER, Config.MAIL_PORT)
-        server.starttls()
-        server.login(Config.MAIL_USERNAME, Config.MAIL_PASSWORD)
-        
-        # Send email
-        text = msg.as_string()
-        server.sendmail(Config.MAIL_DEFAULT_SENDER, recipients, text)
-        server.quit()
-        
-        print(f"Email sent successfully: {msg['Subject']} to {recipients}")
+        if not mail_configured():
+            print(f"Email not configured. Would send: {subject} to {recipients}")
+            return True
+        
+        from models import EmailNotification
+        EmailNotification.enqueue(
+            ', '.join(recipients), subject, body, html_body, sender_email,
+            user_id=user_id, assignment_id=assignment_id, notification_type=notification_type
+        )
+        return True
     except Exception as e:
-        print(f"Failed to send email: {e}")
-        print(f"Email content: {msg['Subject']} to {recipients}")
+        print(f"Failed to queue email: {e}")
+        return False
 
 class EmailService:
     """Email service for various types of notifications"""
@@ -68,165 +242,80 @@ class EmailService:
     @staticmethod
     def send_verification_email(email, first_name, verification_token):
         """Send email verification email"""
-        subject = f"Verify your {Config.APP_NAME} account"
-        
         verification_url = f"{Config.APP_URL}/api/auth/verify-email/{verification_token}"
         
-        body = f"""
-        Hello {first_name},
-        
-        Thank you for registering with {Config.APP_NAME}! Please verify your email address by clicking the link below:
+        subject, body, html_body = get_templates().render(
+            'verification', first_name=first_name, verification_url=verification_url
+        )
         
-        {verification_url}
-        
-        If you didn't create an account, you can safely ignore this email.
-        
-        Best regards,
-        The {Config.APP_NAME} Team
-        """
-        
-        html_body = f"""
-        <html>
-        <body>
-            <h2>Welcome to {Config.APP_NAME}!</h2>
-            <p>Hello {first_name},</p>
-            <p>Thank you for registering with {Config.APP_NAME}! Please verify your email address by clicking the button below:</p>
-            <p>
-                <a href="{verification_url}" style="background-color: #007bff; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px; display: inline-block;">
-                    Verify Email Address
-                </a>
-            </p>
-            <p>Or copy and paste this link into your browser:</p>
-            <p><a href="{verification_url}">{verification_url}</a></p>
-            <p>If you didn't create an account, you can safely ignore this email.</p>
-            <p>Best regards,<br>The {Config.APP_NAME} Team</p>
-        </body>
-        </html>
-        """
-        
-        return send_email(subject, [email], body, html_body)
+        return send_email(subject, [email], body, html_body, notification_type='verification')
     
     @staticmethod
     def send_password_reset_email(email, first_name, reset_token):
         """Send password reset email"""
-        subject = f"Reset your {Config.APP_NAME} password"
-        
         reset_url = f"{Config.APP_URL}/reset-password?token={reset_token}"
         
-        body = f"""
-        Hello {first_name},
+        subject, body, html_body = get_templates().render(
+            'password_reset', first_name=first_name, reset_url=reset_url
+        )
         
-        You requested to reset your password for your {Config.APP_NAME} account. Click the link below to set a new password:
-        
-        {reset_url}
-        
-        This link will expire in 24 hours. If you didn't request a password reset, you can safely ignore this email.
-        
-        Best regards,
-        The {Config.APP_NAME} Team
-        """
-        
-        html_body = f"""
-        <html>
-        <body>
-            <h2>Password Reset Request</h2>
-            <p>Hello {first_name},</p>
-            <p>You requested to reset your password for your {Config.APP_NAME} account. Click the button below to set a new password:</p>
-            <p>
-                <a href="{reset_url}" style="background-color: #dc3545; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px; display: inline-block;">
-                    Reset Password
-                </a>
-            </p>
-            <p>Or copy and paste this link into your browser:</p>
-            <p><a href="{reset_url}">{reset_url}</a></p>
-            <p><strong>This link will expire in 24 hours.</strong></p>
-            <p>If you didn't request a password reset, you can safely ignore this email.</p>
-            <p>Best regards,<br>The {Config.APP_NAME} Team</p>
-        </body>
-        </html>
-        """
-        
-        return send_email(subject, [email], body, html_body)
+        return send_email(subject, [email], body, html_body, notification_type='password_reset')
+    
+    @staticmethod
+    def _reminder_sender(email):
+        # Use the user's email as sender if no system email is configured
+        return None if mail_configured() else email
+    
+    @staticmethod
+    def build_deadline_reminder_email(email, first_name, assignment):
+        """Build the subject, bodies and sender of a deadline reminder email"""
+        subject, body, html_body = get_templates().render_reminder_batch([(first_name, assignment)])[0]
+        
+        return {
+            'subject': subject,
+            'body': body,
+            'html_body': html_body,
+            'sender_email': EmailService._reminder_sender(email)
+        }
+    
+    @staticmethod
+    def build_deadline_reminder_batch(recipients):
+        """Build reminder emails for [(email, first_name, assignment)] in one pass"""
+        rendered = get_templates().render_reminder_batch(
+            [(first_name, assignment) for _, first_name, assignment in recipients]
+        )
+        return [{
+            'subject': subject,
+            'body': body,
+            'html_body': html_body,
+            'sender_email': EmailService._reminder_sender(email)
+        } for (email, _, _), (subject, body, html_body) in zip(recipients, rendered)]
+    
+    @staticmethod
+    def build_deadline_digest_email(email, first_name, assignments):
+        """Build one digest email covering several assignments (already in display order)"""
+        subject, body, html_body = get_templates().render_digest(first_name, assignments)
+        
+        return {
+            'subject': subject,
+            'body': body,
+            'html_body': html_body,
+            'sender_email': EmailService._reminder_sender(email)
+        }
     
     @staticmethod
     def send_deadline_reminder_email(email, first_name, assignment):
         """Send deadline reminder email"""
-        subject = f"Deadline Reminder: {assignment['title']}"
-        
-        due_date = assignment['due_date'].strftime('%B %d, %Y at %I:%M %p') if hasattr(assignment['due_date'], 'strftime') else assignment['due_date']
-        
-        body = f"""
-        Hello {first_name},
-        
-        This is a reminder that you have an upcoming deadline:
-        
-        Assignment: {assignment['title']}
-        Description: {assignment['description'] or 'No description provided'}
-        Due Date: {due_date}
-        Priority: {assignment['priority'].title()}
-        Status: {assignment['status'].title()}
-        
-        Please make sure to complete this assignment on time!
-        
-        Best regards,
-        The {Config.APP_NAME} Team
-        """
-        
-        html_body = f"""
-        <html>
-        <body>
-            <h2>Deadline Reminder</h2>
-            <p>Hello {first_name},</p>
-            <p>This is a reminder that you have an upcoming deadline:</p>
-            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                <h3 style="color: #dc3545; margin-top: 0;">{assignment['title']}</h3>
-                <p><strong>Description:</strong> {assignment['description'] or 'No description provided'}</p>
-                <p><strong>Due Date:</strong> {due_date}</p>
-                <p><strong>Priority:</strong> <span style="color: {'#dc3545' if assignment['priority'] == 'high' else '#ffc107' if assignment['priority'] == 'medium' else '#28a745'}">{assignment['priority'].title()}</span></p>
-                <p><strong>Status:</strong> <span style="color: {'#28a745' if assignment['status'] == 'completed' else '#ffc107' if assignment['status'] == 'in-progress' else '#6c757d'}">{assignment['status'].title()}</span></p>
-            </div>
-            <p>Please make sure to complete this assignment on time!</p>
-            <p>Best regards,<br>The {Config.APP_NAME} Team</p>
-        </body>
-        </html>
-        """
-        
-        # Use the user's email as sender if no system email is configured
-        sender_email = None
-        if not Config.MAIL_USERNAME or not Config.MAIL_PASSWORD:
-            sender_email = email  # Use user's email as sender
-        
-        return send_email(subject, [email], body, html_body, sender_email)
+        content = EmailService.build_deadline_reminder_email(email, first_name, assignment)
+        return send_email(
+            content['subject'], [email], content['body'], content['html_body'], content['sender_email'],
+            user_id=assignment.get('user_id'), assignment_id=assignment.get('id'),
+            notification_type='deadline_reminder'
+        )
     
     @staticmethod
     def send_welcome_email(email, first_name):
         """Send welcome email after email verification"""
-        subject = f"Welcome to {Config.APP_NAME}!"
-        
-        body = f"""
-        Hello {first_name},
-        
-        Welcome to {Config.APP_NAME}! Your email has been verified and your account is now active.
-        
-        You can now log in to your account and start managing your deadlines and assignments.
-        
-        If you have any questions or need help, please don't hesitate to contact us.
-        
-        Best regards,
-        The {Config.APP_NAME} Team
-        """
-        
-        html_body = f"""
-        <html>
-        <body>
-            <h2>Welcome to {Config.APP_NAME}!</h2>
-            <p>Hello {first_name},</p>
-            <p>Welcome to {Config.APP_NAME}! Your email has been verified and your account is now active.</p>
-            <p>You can now log in to your account and start managing your deadlines and assignments.</p>
-            <p>If you have any questions or need help, please don't hesitate to contact us.</p>
-            <p>Best regards,<br>The {Config.APP_NAME} Team</p>
-        </body>
-        </html>
-        """
+        subject, body, html_body = get_templates().render('welcome', first_name=first_name)
         
-        return send_email(subject, [email], body, html_body)
+        return send_email(subject, [email], body, html_body, notification_type='welcome')
@@ -0,0 +1,162 @@
+import html
+import os
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from config import Config
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', 'mail')
+
+# Every email is rendered from <name>.txt and <name>.html in TEMPLATE_DIR
+EMAIL_TEMPLATES = ('verification', 'password_reset', 'deadline_reminder', 'deadline_digest', 'welcome')
+
+SUBJECTS = {
+    'verification': "Verify your {app_name} account",
+    'password_reset': "Reset your {app_name} password",
+    'deadline_reminder': "Deadline Reminder: {title}",
+    'deadline_digest': "Deadline Reminder: {count} upcoming assignments",
+    'welcome': "Welcome to {app_name}!"
+}
+
+PRIORITY_COLORS = {'high': '#dc3545', 'medium': '#ffc107'}
+DEFAULT_PRIORITY_COLOR = '#28a745'
+STATUS_COLORS = {'completed': '#28a745', 'in-progress': '#ffc107'}
+DEFAULT_STATUS_COLOR = '#6c757d'
+
+MONTH_NAMES = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+)
+
+def format_due_date(value):
+    """Format a due date the way reminder emails show it ('%B %d, %Y at %I:%M %p', without strftime)"""
+    if hasattr(value, 'strftime'):
+        hour = value.hour % 12 or 12
+        meridiem = 'PM' if value.hour >= 12 else 'AM'
+        return f"{MONTH_NAMES[value.month - 1]} {value.day:02d}, {value.year} at {hour:02d}:{value.minute:02d} {meridiem}"
+    return value
+
+# Fields of reminder_context(); the reminder templates only substitute these
+REMINDER_FIELDS = (
+    'first_name', 'title', 'description', 'due_date',
+    'priority_label', 'priority_color', 'status_label', 'status_color'
+)
+# Fields that can carry user text; labels and colours come from the CHECK-constrained
+# priority/status values and are safe in HTML as they are
+REMINDER_USER_FIELDS = ('first_name', 'title', 'description', 'due_date')
+
+_SLOT = '\x00'
+
+class _PrerenderedFrame:
+    """A flat template rendered once into a str.format pattern.
+    
+    Everything except the per-message fields (markup, app name, ...) is
+    rendered up front; rendering a message is one format_map() call, after
+    HTML-escaping the ``escaped`` fields. Only valid for templates without
+    control flow on the fields.
+    """
+    
+    def __init__(self, template, fields, escaped=()):
+        output = template.render({field: f"{_SLOT}{field}{_SLOT}" for field in fields})
+        parts = output.split(_SLOT)
+        # Odd positions hold field names, even positions static text
+        self._pattern = ''.join(
+            f"{{{part}}}" if i % 2 else part.replace('{', '{{').replace('}', '}}')
+            for i, part in enumerate(parts)
+        )
+        self._escaped = tuple(escaped)
+    
+    def render(self, context):
+        if self._escaped:
+            context = dict(context)
+            for field in self._escaped:
+                context[field] = html.escape(str(context[field]))
+        return self._pattern.format_map(context)
+
+def _create_environment():
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        # User supplied fields (titles, descriptions, names) are escaped in HTML bodies
+        autoescape=select_autoescape(enabled_extensions=('html',), default_for_string=False),
+        auto_reload=False,
+        cache_size=-1
+    )
+    # Values that never change per message are bound once as globals
+    env.globals.update(
+        app_name=Config.APP_NAME,
+        app_url=Config.APP_URL
+    )
+    return env
+
+def reminder_context(first_name, assignment):
+    """Flat template context for a deadline reminder.
+    
+    Derived values (formatted date, labels, colours) are computed once here
+    and shared by the text and HTML templates.
+    """
+    priority = assignment['priority']
+    status = assignment['status']
+    return {
+        'first_name': first_name,
+        'title': assignment['title'],
+        'description': assignment.get('description') or 'No description provided',
+        'due_date': format_due_date(assignment['due_date']),
+        'priority_label': priority.title(),
+        'priority_color': PRIORITY_COLORS.get(priority, DEFAULT_PRIORITY_COLOR),
+        'status_label': status.title(),
+        'status_color': STATUS_COLORS.get(status, DEFAULT_STATUS_COLOR)
+    }
+
+class EmailTemplates:
+    """Email templates compiled once at startup.
+
+    Templates are loaded and compiled when the instance is created; rendering
+    only executes the compiled template functions.
+    """
+
+    def __init__(self):
+        self.env = _create_environment()
+        self._compiled = {
+            name: (self.env.get_template(f"{name}.txt"), self.env.get_template(f"{name}.html"))
+            for name in EMAIL_TEMPLATES
+        }
+        text_template, html_template = self._compiled['deadline_reminder']
+        self._reminder_frames = (
+            _PrerenderedFrame(text_template, REMINDER_FIELDS),
+            _PrerenderedFrame(html_template, REMINDER_FIELDS, escaped=REMINDER_USER_FIELDS)
+        )
+
+    def render(self, name, subject_fields=None, **context):
+        """Render an email; returns (subject, text_body, html_body)"""
+        text_template, html_template = self._compiled[name]
+        subject = SUBJECTS[name].format(app_name=Config.APP_NAME, **(subject_fields or {}))
+        return subject, text_template.render(context), html_template.render(context)
+
+    def render_reminder_batch(self, items):
+        """Render deadline reminders for [(first_name, assignment)].
+
+        Returns a list of (subject, text_body, html_body) in the same order.
+        The per-message cost is the same as rendering one item at a time;
+        batching only saves the per-call lookups.
+        """
+        text_render, html_render = (frame.render for frame in self._reminder_frames)
+        subject_format = SUBJECTS['deadline_reminder'].format
+        rendered = []
+        append = rendered.append
+        for first_name, assignment in items:
+            context = reminder_context(first_name, assignment)
+            append((subject_format(title=assignment['title']), text_render(context), html_render(context)))
+        return rendered
+
+    def render_digest(self, first_name, assignments):
+        """Render one digest email listing several assignments"""
+        items = [reminder_context(first_name, assignment) for assignment in assignments]
+        return self.render('deadline_digest', subject_fields={'count': len(items)},
+                           first_name=first_name, items=items)
+
+_templates = None
+
+def get_templates():
+    """Return the process-wide compiled templates"""
+    global _templates
+    if _templates is None:
+        _templates = EmailTemplates()
+    return _templates
@@ -0,0 +1,395 @@
+"""Per-user event pub/sub behind GET /api/events.
+
+Publishers (assignment writes, the outbox dispatcher) call
+``get_event_bus().publish(user_id, type, data)``. Every process fans events
+out to its own subscribers (open SSE streams) in memory. The backend decides
+how events travel between processes and how far back a reconnecting client
+can resume from its Last-Event-ID:
+
+- ``LocalEventBus``: this process only (default). The worker runs in another
+  process, so its reminder.sent events only reach streams with a shared backend
+- ``SQLiteEventBus``: processes on one host share an events table that each
+  process tails with one polling thread; the local stand-in for multi-worker
+  setups and tests
+- ``RedisEventBus``: a stream per user for resume plus one pub/sub channel;
+  needs the optional ``redis`` package
+
+An idle subscriber is a deque and a condition variable, with no thread or
+database connection of its own, so thousands of open streams cost little
+memory. Serving them needs a server that does not tie up an OS thread per
+connection, e.g. ``gunicorn -k gevent``; see the README.
+"""
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from config import Config
+from models import on_assignment_change
+
+class Subscription:
+    """Events queued for one open stream"""
+
+    def __init__(self, bus, user_id, max_queue):
+        self.bus = bus
+        self.user_id = user_id
+        self.max_queue = max_queue
+        self.overflowed = False
+        self._events = deque()
+        self._cond = threading.Condition(threading.Lock())
+
+    def push(self, event):
+        with self._cond:
+            if len(self._events) >= self.max_queue:
+                # The client is not keeping up; it reconnects and resumes from its Last-Event-ID
+                self.overflowed = True
+            else:
+                self._events.append(event)
+            self._cond.notify()
+
+    def get(self, timeout):
+        """Wait up to ``timeout`` seconds; return the queued events (possibly none)"""
+        with self._cond:
+            if not self._events and not self.overflowed:
+                self._cond.wait(timeout)
+            events = list(self._events)
+            self._events.clear()
+            return events
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+class EventBus:
+    """In-process fan-out shared by all backends.
+
+    Events are dicts with ``id`` (string, increasing per user), ``user_id``,
+    ``type`` and ``data``. ``replay`` returns (events after an id, complete),
+    where ``complete`` is False when older events may have been dropped and
+    the client has to resync.
+    """
+
+    name = None
+    shared = False
+
+    def __init__(self, buffer_size=200, max_queue=1000):
+        self.buffer_size = buffer_size
+        self.max_queue = max_queue
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._stats = {'published': 0, 'delivered': 0, 'overflowed': 0}
+
+    def subscribe(self, user_id):
+        subscription = Subscription(self, user_id, self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        self._ensure_listening()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+            if subscription.overflowed:
+                self._stats['overflowed'] += 1
+
+    def _dispatch(self, event):
+        """Hand an event to this process's subscribers of its user"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(event['user_id'], ()))
+            self._stats['delivered'] += len(subscribers)
+        for subscription in subscribers:
+            subscription.push(event)
+
+    def _ensure_listening(self):
+        """Start receiving events from other processes (cross-process backends)"""
+
+    def publish(self, user_id, event_type, data):
+        raise NotImplementedError
+
+    def replay(self, user_id, last_event_id):
+        raise NotImplementedError
+
+    def _count_published(self):
+        with self._lock:
+            self._stats['published'] += 1
+
+    def metrics(self):
+        with self._lock:
+            metrics = dict(self._stats)
+            metrics['subscribers'] = sum(len(subscribers) for subscribers in self._subscribers.values())
+            metrics['users'] = len(self._subscribers)
+        metrics['backend'] = self.name
+        return metrics
+
+class LocalEventBus(EventBus):
+    """Events stay in this process; the last ``buffer_size`` per user can be replayed.
+
+    Buffers are kept for the ``max_users`` users with the most recent events;
+    a user whose buffer was evicted gets a resync when replaying from before
+    the eviction. Ids are prefixed with a per-process boot id, so an id from
+    before a restart is recognised and answered with a resync instead of a
+    wrong replay.
+    """
+
+    name = 'local'
+
+    def __init__(self, buffer_size=200, max_queue=1000, max_users=10000):
+        super().__init__(buffer_size, max_queue)
+        self.max_users = max_users
+        self._boot = uuid.uuid4().hex[:8]
+        self._counter = itertools.count(1)
+        # user_id -> [deque of (event, sequence), sequence of the newest event dropped for the user]
+        self._buffers = OrderedDict()
+        self._evicted_through = 0  # Newest sequence of any evicted user buffer
+
+    def publish(self, user_id, event_type, data):
+        with self._lock:
+            sequence = next(self._counter)
+            event = {
+                'id': f"{self._boot}-{sequence}",
+                'user_id': user_id,
+                'type': event_type,
+                'data': data
+            }
+            entry = self._buffers.get(user_id)
+            if entry is None:
+                # Events of an evicted buffer for this user may be older than the watermark
+                entry = self._buffers[user_id] = [deque(maxlen=self.buffer_size), self._evicted_through]
+                while len(self._buffers) > self.max_users:
+                    _, (evicted, _) = self._buffers.popitem(last=False)
+                    self._evicted_through = max(self._evicted_through, evicted[-1][1])
+            else:
+                self._buffers.move_to_end(user_id)
+                if len(entry[0]) == self.buffer_size:
+                    entry[1] = entry[0][0][1]
+            entry[0].append((event, sequence))
+        self._count_published()
+        self._dispatch(event)
+        return event['id']
+
+    def replay(self, user_id, last_event_id):
+        boot, _, sequence = last_event_id.partition('-')
+        if boot != self._boot or not sequence.isdigit():
+            return [], False
+        sequence = int(sequence)
+        with self._lock:
+            entry = self._buffers.get(user_id)
+            buffered = list(entry[0]) if entry else []
+            dropped_through = entry[1] if entry else self._evicted_through
+        return [event for event, seq in buffered if seq > sequence], sequence >= dropped_through
+
+    def metrics(self):
+        metrics = super().metrics()
+        with self._lock:
+            metrics['buffered_users'] = len(self._buffers)
+        return metrics
+
+class SQLiteEventBus(EventBus):
+    """Events in a SQLite file that every process on the host tails.
+
+    Publishing is one INSERT. Each subscribing process runs a single thread
+    that polls for new rows every ``poll_interval`` seconds and dispatches
+    them; events older than ``retention`` seconds are pruned.
+    """
+
+    name = 'sqlite'
+    shared = True
+
+    def __init__(self, path, buffer_size=200, max_queue=1000, poll_interval=0.5, retention=3600):
+        super().__init__(buffer_size, max_queue)
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._local = threading.local()
+        self._thread = None
+        self._pid = None
+        self._published = 0
+        self._connect().execute("""
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._connect().execute("CREATE INDEX IF NOT EXISTS idx_events_user ON events (user_id, id)")
+
+    def _connect(self):
+        """One connection per thread (and process), reused across calls"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _event(row):
+        return {'id': str(row[0]), 'user_id': row[1], 'type': row[2], 'data': json.loads(row[3])}
+
+    def publish(self, user_id, event_type, data):
+        conn = self._connect()
+        cursor = conn.execute(
+            "INSERT INTO events (user_id, type, data, created_at) VALUES (?, ?, ?, ?)",
+            (user_id, event_type, json.dumps(data, default=str), time.time())
+        )
+        self._count_published()
+        self._published += 1
+        if self._published % 1000 == 0:
+            conn.execute("DELETE FROM events WHERE created_at < ?", (time.time() - self.retention,))
+        return str(cursor.lastrowid)
+
+    def replay(self, user_id, last_event_id):
+        if not last_event_id.isdigit():
+            return [], False
+        conn = self._connect()
+        rows = conn.execute("""
+            SELECT id, user_id, type, data FROM events
+            WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?
+        """, (user_id, int(last_event_id), self.buffer_size)).fetchall()
+        oldest = conn.execute("SELECT MIN(id) FROM events").fetchone()[0]
+        complete = len(rows) < self.buffer_size and (oldest is None or oldest <= int(last_event_id) + 1)
+        return [self._event(row) for row in rows], complete
+
+    def _ensure_listening(self):
+        with self._lock:
+            if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._tail, name='event-bus-sqlite', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _tail(self):
+        conn = self._connect()
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+        while True:
+            rows = []
+            try:
+                rows = conn.execute(
+                    "SELECT id, user_id, type, data FROM events WHERE id > ? ORDER BY id LIMIT 1000", (last_id,)
+                ).fetchall()
+                for row in rows:
+                    last_id = row[0]
+                    self._dispatch(self._event(row))
+            except Exception as e:
+                print(f"❌ Error reading events: {e}")
+            if len(rows) < 1000:
+                time.sleep(self.poll_interval)
+
+class RedisEventBus(EventBus):
+    """Events in a Redis stream per user (for resume) plus one pub/sub channel (for push)"""
+
+    name = 'redis'
+    shared = True
+    KEY_PREFIX = 'deadline-tracker:events:'
+    CHANNEL = 'deadline-tracker:events'
+
+    def __init__(self, url, buffer_size=200, max_queue=1000):
+        super().__init__(buffer_size, max_queue)
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("EVENTS_REDIS_URL is set but the redis package is not installed")
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self._thread = None
+        self._pid = None
+
+    @staticmethod
+    def _sequence(event_id):
+        """Stream ids ('<ms>-<seq>') as comparable tuples"""
+        ms, _, seq = event_id.partition('-')
+        return int(ms), int(seq or 0)
+
+    def publish(self, user_id, event_type, data):
+        payload = json.dumps(data, default=str)
+        event_id = self._client.xadd(
+            f"{self.KEY_PREFIX}{user_id}", {'type': event_type, 'data': payload},
+            maxlen=self.buffer_size, approximate=True
+        )
+        self._client.publish(self.CHANNEL, json.dumps(
+            {'id': event_id, 'user_id': user_id, 'type': event_type, 'data': payload}
+        ))
+        self._count_published()
+        return event_id
+
+    def replay(self, user_id, last_event_id):
+        try:
+            last = self._sequence(last_event_id)
+        except ValueError:
+            return [], False
+        key = f"{self.KEY_PREFIX}{user_id}"
+        entries = self._client.xrange(key, min=f"({last_event_id}", count=self.buffer_size)
+        first = self._client.xrange(key, count=1)
+        complete = len(entries) < self.buffer_size and (not first or self._sequence(first[0][0]) <= last
+                                                         or self._client.xlen(key) < self.buffer_size)
+        return [
+            {'id': event_id, 'user_id': user_id, 'type': fields['type'], 'data': json.loads(fields['data'])}
+            for event_id, fields in entries
+        ], complete
+
+    def _ensure_listening(self):
+        with self._lock:
+            if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._listen, name='event-bus-redis', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.CHANNEL)
+                for message in pubsub.listen():
+                    event = json.loads(message['data'])
+                    event['data'] = json.loads(event['data'])
+                    self._dispatch(event)
+            except Exception as e:
+                print(f"❌ Error reading events from Redis: {e}")
+                time.sleep(1)
+
+def _create_event_bus():
+    """Backend selected by EVENTS_REDIS_URL / EVENTS_SQLITE_PATH (in-process when unset)"""
+    options = {'buffer_size': Config.EVENTS_BUFFER_SIZE, 'max_queue': Config.EVENTS_QUEUE_SIZE}
+    if Config.EVENTS_REDIS_URL:
+        return RedisEventBus(Config.EVENTS_REDIS_URL, **options)
+    if Config.EVENTS_SQLITE_PATH:
+        return SQLiteEventBus(Config.EVENTS_SQLITE_PATH, **options)
+    return LocalEventBus(max_users=Config.EVENTS_BUFFER_USERS, **options)
+
+_event_bus = None
+_event_bus_lock = threading.Lock()
+
+def get_event_bus():
+    """Return the process-wide event bus, creating it on first use"""
+    global _event_bus
+    if _event_bus is None:
+        with _event_bus_lock:
+            if _event_bus is None:
+                _event_bus = _create_event_bus()
+    return _event_bus
+
+def publish(user_id, event_type, data):
+    """Publish an event; failures are logged and never reach the caller"""
+    try:
+        return get_event_bus().publish(user_id, event_type, data)
+    except Exception as e:
+        print(f"⚠️  Could not publish {event_type} event: {e}")
+        return None
+
+def publish_assignment_change(action, assignment_id, user_id, assignment):
+    """Assignment write hook: push 'assignment.created/updated/deleted' to the user's streams"""
+    publish(user_id, f"assignment.{action}", {
+        'id': assignment_id,
+        'assignment': dict(assignment) if assignment else None
+    })
+
+on_assignment_change(publish_assignment_change)
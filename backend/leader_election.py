@@ -0,0 +1,282 @@
+import atexit
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from config import Config
+from models import get_db, get_db_connection
+
+class MySQLLeaseStore:
+    """Leases in the leader_leases table, timed by the database clock"""
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+
+    @contextmanager
+    def _connect(self):
+        """A pooled connection, or with ``timeout`` a dedicated one whose calls give up after that many seconds"""
+        if not self.timeout:
+            with get_db() as conn:
+                yield conn
+            return
+        conn = get_db_connection(connect_timeout=self.timeout, read_timeout=self.timeout,
+                                 write_timeout=self.timeout)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def try_acquire(self, name, holder, ttl):
+        """Take or renew the lease; return True if ``holder`` holds it for ``ttl`` more seconds"""
+        with self._connect() as conn:
+            with conn.cursor() as cursor:
+                # acquired_at is assigned before holder so it still sees the previous holder
+                cursor.execute("""
+                    UPDATE leader_leases
+                    SET acquired_at = IF(holder = %s, acquired_at, UTC_TIMESTAMP(6)),
+                        holder = %s,
+                        expires_at = UTC_TIMESTAMP(6) + INTERVAL %s SECOND
+                    WHERE name = %s AND (holder = %s OR expires_at < UTC_TIMESTAMP(6))
+                """, (holder, holder, ttl, name, holder))
+                acquired = cursor.rowcount == 1
+                if not acquired:
+                    cursor.execute("""
+                        INSERT IGNORE INTO leader_leases (name, holder, expires_at, acquired_at)
+                        VALUES (%s, %s, UTC_TIMESTAMP(6) + INTERVAL %s SECOND, UTC_TIMESTAMP(6))
+                    """, (name, holder, ttl))
+                    acquired = cursor.rowcount == 1
+                conn.commit()
+                return acquired
+
+    def release(self, name, holder):
+        with self._connect() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE leader_leases SET expires_at = UTC_TIMESTAMP(6)
+                    WHERE name = %s AND holder = %s
+                """, (name, holder))
+                conn.commit()
+
+    def current(self, name):
+        with self._connect() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT holder, expires_at, acquired_at, expires_at > UTC_TIMESTAMP(6) AS active
+                    FROM leader_leases WHERE name = %s
+                """, (name,))
+                return cursor.fetchone()
+
+class SQLiteLeaseStore:
+    """Leases in a SQLite file; for single-host deployments and local testing"""
+
+    def __init__(self, path, timeout=10):
+        self.path = path
+        self.timeout = timeout
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS leader_leases (
+                    name TEXT PRIMARY KEY,
+                    holder TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    acquired_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    def try_acquire(self, name, holder, ttl):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute("""
+                UPDATE leader_leases
+                SET acquired_at = CASE WHEN holder = ? THEN acquired_at ELSE ? END,
+                    holder = ?, expires_at = ?
+                WHERE name = ? AND (holder = ? OR expires_at < ?)
+            """, (holder, now, holder, now + ttl, name, holder, now))
+            acquired = cursor.rowcount == 1
+            if not acquired:
+                cursor = conn.execute("""
+                    INSERT OR IGNORE INTO leader_leases (name, holder, expires_at, acquired_at)
+                    VALUES (?, ?, ?, ?)
+                """, (name, holder, now + ttl, now))
+                acquired = cursor.rowcount == 1
+            conn.execute("COMMIT")
+            return acquired
+        finally:
+            conn.close()
+
+    def release(self, name, holder):
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE leader_leases SET expires_at = ? WHERE name = ? AND holder = ?",
+                         (time.time(), name, holder))
+        finally:
+            conn.close()
+
+    def current(self, name):
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT holder, expires_at, acquired_at FROM leader_leases WHERE name = ?",
+                               (name,)).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        return {'holder': row[0], 'expires_at': row[1], 'acquired_at': row[2], 'active': row[1] > time.time()}
+
+def get_lease_store(timeout=None):
+    """Lease store selected by LEADER_LEASE_SQLITE_PATH (MySQL when unset); ``timeout`` bounds each call"""
+    if Config.LEADER_LEASE_SQLITE_PATH:
+        return SQLiteLeaseStore(Config.LEADER_LEASE_SQLITE_PATH, timeout=timeout or 10)
+    return MySQLLeaseStore(timeout=timeout)
+
+class LeaderElection:
+    """Runs a job in exactly one process across workers and hosts.
+
+    Every candidate tries to take or renew a lease named ``name`` every
+    ``ttl / 3`` seconds. The holder runs ``on_elected``; when it cannot renew
+    (lost the lease, database unreachable) it calls ``on_demoted``. Leadership
+    also ends on its own at a local deadline, the start of the last successful
+    renewal plus ``ttl``, which is never later than the lease's expiry even if
+    a renewal call hangs. Leader-only actions must check ``is_leader()``
+    (which checks that deadline) right before they run; an action already
+    running when the deadline passes is not interrupted. If the leader dies,
+    another candidate takes over within ``ttl`` plus one heartbeat.
+    """
+
+    def __init__(self, name, on_elected, on_demoted, store=None, ttl=30):
+        self.name = name
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.store = store
+        self.ttl = ttl
+        self.heartbeat = ttl / 3.0
+        self.holder = None
+        self._is_leader = False
+        self._lease_deadline = None  # time.monotonic() by which the held lease may have expired
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._stats = {
+            'elections_won': 0,
+            'demotions': 0,
+            'heartbeat_errors': 0
+        }
+
+    def is_leader(self):
+        """True while this process holds the lease; checks the local lease deadline, not only the last heartbeat"""
+        deadline = self._lease_deadline
+        return (self._is_leader and self._pid == os.getpid()
+                and deadline is not None and time.monotonic() < deadline)
+
+    def _become_leader(self):
+        self._is_leader = True
+        self._stats['elections_won'] += 1
+        print(f"👑 {self.holder} is now leader for '{self.name}'")
+        self.on_elected()
+
+    def _step_down(self, reason):
+        if not self._is_leader:
+            return
+        self._is_leader = False
+        self._stats['demotions'] += 1
+        print(f"⚠️  {self.holder} stepped down as leader for '{self.name}': {reason}")
+        self.on_demoted()
+
+    def heartbeat_once(self):
+        """Try to take or renew the lease and start/stop the job accordingly"""
+        started = time.monotonic()
+        try:
+            acquired = self.store.try_acquire(self.name, self.holder, self.ttl)
+        except Exception as e:
+            with self._lock:
+                self._stats['heartbeat_errors'] += 1
+            print(f"❌ Leader heartbeat failed for '{self.name}': {e}")
+            # Keep leading through brief outages, but not past the point the next heartbeat could renew
+            if self._lease_deadline is None or time.monotonic() + self.heartbeat >= self._lease_deadline:
+                self._step_down('lease could not be renewed')
+            return self.is_leader()
+
+        if acquired:
+            # The store set the new expiry after ``started``, so this deadline never outlasts the lease
+            self._lease_deadline = started + self.ttl
+            if not self._is_leader:
+                self._become_leader()
+        else:
+            self._lease_deadline = None
+            self._step_down('lease held by another process')
+        return self.is_leader()
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            self.heartbeat_once()
+            self._stop.wait(self.heartbeat)
+        self._step_down('shutting down')
+        try:
+            self.store.release(self.name, self.holder)
+        except Exception:
+            pass
+
+    def start(self):
+        """Start campaigning in a background thread (once per process)"""
+        with self._lock:
+            if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+                return True
+            # A forked child must not inherit the parent's identity or leadership
+            self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+            self._is_leader = False
+            self._lease_deadline = None
+            if self.store is None:
+                # Calls return (or fail) well before the lease could expire under a stalled database
+                self.store = get_lease_store(timeout=self.heartbeat / 2)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name=f'leader-{self.name}', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+        return True
+
+    def stop(self, timeout=5):
+        """Step down, release the lease so a successor can take over immediately"""
+        self._stop.set()
+        if self._thread and self._pid == os.getpid():
+            self._thread.join(timeout)
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['name'] = self.name
+        stats['holder'] = self.holder
+        stats['is_leader'] = self.is_leader()
+        stats['ttl'] = self.ttl
+        return stats
+
+def _start_scheduler():
+    from reminder_scheduler import get_reminder_scheduler
+    get_reminder_scheduler().start(guard=_scheduler_election.is_leader)
+
+def _stop_scheduler():
+    from reminder_scheduler import get_reminder_scheduler
+    get_reminder_scheduler().stop()
+
+_scheduler_election = LeaderElection(
+    'reminder_scheduler',
+    on_elected=_start_scheduler,
+    on_demoted=_stop_scheduler,
+    ttl=Config.LEADER_LEASE_TTL
+)
+
+def get_scheduler_election():
+    """Return the election that decides which process runs the reminder scheduler"""
+    return _scheduler_election
+
+@atexit.register
+def _release_leases():
+    if _scheduler_election.is_leader():
+        _scheduler_election.stop()
@@ -0,0 +1,227 @@
+"""Versioned schema migrations.
+
+Migration files live in ``database/migrations`` and are named
+``<version>_<description>.sql`` (e.g. ``0002_add_indexes.sql``). Each file is
+applied once, in version order, and recorded in the ``schema_migrations`` table.
+
+Usage:
+    python migrate.py status          Show current and latest schema versions
+    python migrate.py upgrade [N]     Apply pending migrations (up to version N)
+    python migrate.py stamp N         Record version N as applied without running it
+"""
+import os
+import re
+import sys
+import pymysql
+from config import Config
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'database', 'migrations')
+MIGRATION_LOCK_NAME = 'deadline_tracker_schema_migrations'
+MIGRATION_LOCK_TIMEOUT = 60
+
+_FILENAME_RE = re.compile(r'^(\d+)_([\w\-]+)\.sql$')
+
+# MySQL errors for DDL whose object already exists are treated as no-ops so
+# migrations can run against databases created by the old init_db(); any other
+# error (data errors, missing objects, ...) aborts the migration
+_ALREADY_EXISTS_ERRORS = {
+    1050,  # ER_TABLE_EXISTS_ERROR
+    1060,  # ER_DUP_FIELDNAME
+    1061,  # ER_DUP_KEYNAME
+    3822,  # ER_CHECK_CONSTRAINT_DUP_NAME (0001's CHECK constraints on old databases)
+}
+
+_MISSING_TABLE = 1146
+
+
+def discover_migrations():
+    """Return [(version, name, path)] for every migration file, ordered by version"""
+    migrations = []
+    seen = {}
+    for filename in os.listdir(MIGRATIONS_DIR):
+        match = _FILENAME_RE.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in seen:
+            raise ValueError(f"Duplicate migration version {version}: {seen[version]} and {filename}")
+        seen[version] = filename
+        migrations.append((version, match.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    migrations.sort()
+    return migrations
+
+
+def latest_version():
+    """Highest migration version shipped with the code"""
+    migrations = discover_migrations()
+    return migrations[-1][0] if migrations else 0
+
+
+def split_statements(sql):
+    """Split a migration file into individual statements"""
+    statements = []
+    current = []
+    for line in sql.split('\n'):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('--'):
+            continue
+        current.append(line)
+        if stripped.endswith(';'):
+            statement = '\n'.join(current).strip().rstrip(';').strip()
+            if statement:
+                statements.append(statement)
+            current = []
+    trailing = '\n'.join(current).strip()
+    if trailing:
+        statements.append(trailing)
+    return statements
+
+
+def get_current_version(cursor):
+    """Return the applied schema version (0 for an empty database) in one query"""
+    try:
+        cursor.execute("SELECT MAX(version) AS version FROM schema_migrations")
+    except pymysql.err.ProgrammingError as e:
+        if e.args and e.args[0] == _MISSING_TABLE:
+            return 0
+        raise
+    row = cursor.fetchone()
+    return (row['version'] or 0) if row else 0
+
+
+def _ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+
+def _execute_statement(cursor, statement):
+    try:
+        cursor.execute(statement)
+    except pymysql.err.MySQLError as e:
+        if e.args and e.args[0] in _ALREADY_EXISTS_ERRORS:
+            print(f"⚠️  Already applied: {statement[:60]}...")
+        else:
+            raise
+
+
+def apply_migrations(target=None, verbose=True):
+    """Apply pending migrations up to ``target`` (defaults to the latest).
+
+    A named lock serialises concurrent runners, e.g. several workers booting
+    against an out-of-date database at the same time.
+    """
+    from models import get_db
+
+    applied = []
+    with get_db() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT GET_LOCK(%s, %s) AS acquired", (MIGRATION_LOCK_NAME, MIGRATION_LOCK_TIMEOUT))
+            if not cursor.fetchone()['acquired']:
+                raise RuntimeError("Timed out waiting for the schema migration lock")
+            try:
+                _ensure_migrations_table(cursor)
+                current = get_current_version(cursor)
+
+                for version, name, path in discover_migrations():
+                    if version <= current or (target is not None and version > target):
+                        continue
+                    if verbose:
+                        print(f"🗄️  Applying migration {version:04d}_{name}...")
+                    with open(path, 'r') as f:
+                        statements = split_statements(f.read())
+                    for statement in statements:
+                        _execute_statement(cursor, statement)
+                    # DDL commits implicitly in MySQL, so record each version as soon as it lands
+                    cursor.execute(
+                        "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                        (version, name)
+                    )
+                    conn.commit()
+                    applied.append(version)
+                    if verbose:
+                        print(f"✅ Migration {version:04d}_{name} applied")
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK_NAME,))
+    return applied
+
+
+def stamp(version):
+    """Mark every migration up to ``version`` as applied without running it"""
+    from models import get_db
+
+    with get_db() as conn:
+        with conn.cursor() as cursor:
+            _ensure_migrations_table(cursor)
+            for migration_version, name, _ in discover_migrations():
+                if migration_version <= version:
+                    cursor.execute(
+                        "INSERT IGNORE INTO schema_migrations (version, name) VALUES (%s, %s)",
+                        (migration_version, name)
+                    )
+            conn.commit()
+
+
+def ensure_schema_current():
+    """Startup check: one query when the schema is up to date.
+
+    Pending migrations are applied when ``AUTO_MIGRATE`` is enabled, otherwise
+    a warning is printed and ``python migrate.py upgrade`` must be run.
+    """
+    from models import get_db
+
+    with get_db() as conn:
+        with conn.cursor() as cursor:
+            current = get_current_version(cursor)
+
+    latest = latest_version()
+    if current >= latest:
+        return current
+
+    if not Config.AUTO_MIGRATE:
+        print(f"⚠️  Database schema is at version {current}, code expects {latest}. "
+              f"Run 'python migrate.py upgrade'.")
+        return current
+
+    apply_migrations()
+    return latest
+
+
+def main(argv):
+    command = argv[1] if len(argv) > 1 else 'status'
+
+    if command == 'status':
+        from models import get_db
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                current = get_current_version(cursor)
+        latest = latest_version()
+        print(f"Current schema version: {current}")
+        print(f"Latest available version: {latest}")
+        for version, name, _ in discover_migrations():
+            marker = '✅' if version <= current else '⏳'
+            print(f"  {marker} {version:04d}_{name}")
+        return 0
+
+    if command == 'upgrade':
+        target = int(argv[2]) if len(argv) > 2 else None
+        applied = apply_migrations(target)
+        if not applied:
+            print("✅ Database schema is already up to date")
+        return 0
+
+    if command == 'stamp' and len(argv) > 2:
+        stamp(int(argv[2]))
+        print(f"✅ Stamped schema version {argv[2]}")
+        return 0
+
+    print(__doc__)
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -1,152 +1,92 @@
 import pymysql
 import os
 import secrets
+import threading
 import string
-from datetime import datetime, timedelta
 from contextlib import contextmanager
 from werkzeug.security import generate_password_hash, check_password_hash
 from config import Config
+from db_pool import ConnectionPool
+from caching import LRUCache
+from assignment_cache import get_assignment_cache
 
-def get_db_connection():
-    """Create a MySQL database connection using Railway MySQL URI"""
-    # Parse the MySQL URI from config
-    mysql_config = Config().get_mysql_config()
-    
-    if mysql_config:
-        return pymysql.connect(
-            host=mysql_config['host'],
-            port=mysql_config['port'],
-            user=mysql_config['user'],
-            password=mysql_config['password'],
-            database=mysql_config['database'],
-            charset='utf8mb4',
-            cursorclass=pymysql.cursors.DictCursor
-        )
-    else:
-        # Fallback to environment variables if URI parsing fails
-        return pymysql.connect(
-            host=os.environ.get('MYSQL_HOST', 'localhost'),
-            port=int(os.environ.get('MYSQL_PORT', 3306)),
-            user=os.environ.get('MYSQL_USER', 'root'),
-            password=os.environ.get('MYSQL_PASSWORD', ''),
-            database=os.environ.get('MYSQL_DATABASE', 'deadline_tracker'),
-            charset='utf8mb4',
-            cursorclass=pymysql.cursors.DictCursor
-        )
+_mysql_config = None
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_mysql_config():
+    """Parse the MySQL URI once per process"""
+    global _mysql_config
+    if _mysql_config is None:
+        _mysql_config = Config().get_mysql_config() or {
+            'host': os.environ.get('MYSQL_HOST', 'localhost'),
+            'port': int(os.environ.get('MYSQL_PORT', 3306)),
+            'user': os.environ.get('MYSQL_USER', 'root'),
+            'password': os.environ.get('MYSQL_PASSWORD', ''),
+            'database': os.environ.get('MYSQL_DATABASE', 'deadline_tracker')
+        }
+    return _mysql_config
+
+def get_db_connection(connect_timeout=None, **options):
+    """Create a new MySQL database connection using Railway MySQL URI; ``options`` are extra pymysql.connect() arguments"""
+    mysql_config = _get_mysql_config()
+    
+    return pymysql.connect(
+        host=mysql_config['host'],
+        port=mysql_config['port'],
+        user=mysql_config['user'],
+        password=mysql_config['password'],
+        database=mysql_config['database'],
+        charset='utf8mb4',
+        cursorclass=pymysql.cursors.DictCursor,
+        connect_timeout=connect_timeout or Config.DB_CONNECT_TIMEOUT,
+        # Due dates are naive UTC; keep NOW() and TIMESTAMP columns (sent_at,
+        # updated_at, ...) on the same clock whatever the server's time zone
+        init_command="SET time_zone = '+00:00'",
+        **options
+    )
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    get_db_connection,
+                    min_size=Config.DB_POOL_MIN_SIZE,
+                    max_size=Config.DB_POOL_MAX_SIZE,
+                    timeout=Config.DB_POOL_TIMEOUT,
+                    max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+                    ping_interval=Config.DB_POOL_PING_INTERVAL
+                )
+    return _pool
 
 @contextmanager
 def get_db():
-    """Context manager for database connections"""
-    conn = get_db_connection()
-    try:
+    """Context manager for pooled database connections"""
+    with get_pool().connection() as conn:
         yield conn
-    finally:
-        conn.close()
 
 def init_db():
-    """Initialize the database with tables"""
-    with get_db() as conn:
-        with conn.cursor() as cursor:
-            # Step 1: Create tables from schema.sql
-            print("\n🗄️  Step 1: Creating tables from schema.sql...")
-            schema_path = os.path.join(os.path.dirname(__file__), '..', 'database', 'schema.sql')
-            print(f"📁 Schema file path: {schema_path}")
-            
-            with open(schema_path, 'r') as f:
-                schema = f.read()
-                print(f"📄 Schema file content length: {len(schema)} characters")
-                
-                # Remove comments and split by CREATE TABLE
-                lines = schema.split('\n')
-                clean_lines = []
-                for line in lines:
-                    line = line.strip()
-                    if line and not line.startswith('--'):
-                        clean_lines.append(line)
-                
-                clean_schema = '\n'.join(clean_lines)
-                print(f"🧹 Clean schema length: {len(clean_schema)} characters")
-                
-                # Split by CREATE TABLE (case insensitive)
-                table_statements = []
-                current_statement = ""
-                
-                for line in clean_lines:
-                    if line.upper().startswith('CREATE TABLE'):
-                        if current_statement:
-                            table_statements.append(current_statement.strip())
-                        current_statement = line
-                    elif line:
-                        current_statement += " " + line
-                
-                if current_statement:
-                    table_statements.append(current_statement.strip())
-                
-                print(f"🔍 Found {len(table_statements)} CREATE TABLE statements")
-                
-                for i, statement in enumerate(table_statements):
-                    print(f"📝 Table Statement {i+1}: {statement[:100]}...")
-                    try:
-                        cursor.execute(statement)
-                        print(f"✅ Executed: {statement[:50]}...")
-                    except Exception as e:
-                        if 'already exists' in str(e).lower():
-                            print(f"⚠️  Table already exists: {statement[:50]}...")
-                        else:
-                            print(f"❌ Error executing: {statement[:50]}... - {e}")
-                            raise
-            
-            # Step 2: Create indexes
-            print("\n🔍 Step 2: Creating indexes...")
-            index_statements = [
-                "CREATE INDEX idx_users_email ON users(email)",
-                "CREATE INDEX idx_users_verification_token ON users(email_verification_token)",
-                "CREATE INDEX idx_users_reset_token ON users(reset_password_token)",
-                "CREATE INDEX idx_assignments_user_id ON assignments(user_id)",
-                "CREATE INDEX idx_assignments_due_date ON assignments(due_date)",
-                "CREATE INDEX idx_assignments_status ON assignments(status)",
-                "CREATE INDEX idx_assignments_notification_sent ON assignments(email_notification_sent)",
-                "CREATE INDEX idx_email_notifications_user_id ON email_notifications(user_id)",
-                "CREATE INDEX idx_email_notifications_status ON email_notifications(status)",
-                "CREATE INDEX idx_email_notifications_sent_at ON email_notifications(sent_at)"
-            ]
-            
-            for statement in index_statements:
-                try:
-                    cursor.execute(statement)
-                    print(f"✅ Executed: {statement[:50]}...")
-                except Exception as e:
-                    if any(phrase in str(e).lower() for phrase in [
-                        'duplicate key name', 'already exists', 'duplicate entry'
-                    ]):
-                        print(f"⚠️  Index already exists: {statement[:50]}...")
-                    else:
-                        print(f"❌ Error executing: {statement[:50]}... - {e}")
-                        print(f"   Continuing with next statement...")
-                        continue
-            
-            # Step 3: Add constraints
-            print("\n🔒 Step 3: Adding constraints...")
-            constraint_statements = [
-                "ALTER TABLE assignments ADD CONSTRAINT chk_priority CHECK (priority IN ('low', 'medium', 'high'))",
-                "ALTER TABLE assignments ADD CONSTRAINT chk_status CHECK (status IN ('pending', 'in-progress', 'completed'))"
-            ]
-            
-            for statement in constraint_statements:
-                try:
-                    cursor.execute(statement)
-                    print(f"✅ Executed: {statement[:50]}...")
-                except Exception as e:
-                    if any(phrase in str(e).lower() for phrase in [
-                        'already exists', 'duplicate check constraint'
-                    ]):
-                        print(f"⚠️  Constraint already exists: {statement[:50]}...")
-                    else:
-                        print(f"❌ Error executing: {statement[:50]}... - {e}")
-                        print(f"   Continuing with next statement...")
-                        continue
-            
-            conn.commit()
+    """Verify the schema version at startup; one query when it is current"""
+    from migrate import ensure_schema_current
+    return ensure_schema_current()
+
+# Columns safe to cache and hand to callers: no password hash or tokens
+USER_PROFILE_COLUMNS = 'id, email, first_name, last_name, email_verified, timezone, created_at, updated_at'
+
+# Per-process read-through caches; writes made through User invalidate them, and
+# the TTL bounds how long another process's write can go unseen
+_user_profiles = LRUCache(maxsize=Config.USER_CACHE_SIZE, ttl=Config.USER_CACHE_TTL)
+_user_ids_by_email = LRUCache(maxsize=Config.USER_CACHE_SIZE, ttl=Config.USER_CACHE_TTL)
+
+def get_user_cache_metrics():
+    """Hit/miss counters of the user profile cache and its email index"""
+    return {
+        'profiles': _user_profiles.stats(),
+        'email_index': _user_ids_by_email.stats()
+    }
 
 class User:
     """User model for authentication and user management"""
@@ -180,31 +120,73 @@ class User:
     
     @staticmethod
     def get_user_by_email(email):
-        """Get user by email"""
+        """Get a user's profile by email (cached; no password hash or tokens)"""
+        user_id = _user_ids_by_email.get(email)
+        if user_id is not None:
+            profile = _user_profiles.get(user_id)
+            if profile is not None:
+                return dict(profile)
+        return User._load_profile('email', email)
+    
+    @staticmethod
+    def get_user_by_id(user_id):
+        """Get a user's profile by ID (cached; no password hash or tokens)"""
+        profile = _user_profiles.get(user_id)
+        if profile is not None:
+            return dict(profile)
+        return User._load_profile('id', user_id)
+    
+    @staticmethod
+    def _load_profile(column, value):
+        """Read a profile from the database and cache it"""
         with get_db() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("SELECT * FROM users WHERE email = %s", (email,))
-                return cursor.fetchone()
+                cursor.execute(f"SELECT {USER_PROFILE_COLUMNS} FROM users WHERE {column} = %s", (value,))
+                profile = cursor.fetchone()
+        if profile:
+            _user_profiles.set(profile['id'], profile)
+            _user_ids_by_email.set(profile['email'], profile['id'])
+            return dict(profile)
+        return None
     
     @staticmethod
-    def get_user_by_id(user_id):
-        """Get user by ID"""
+    def invalidate_cache(user_id):
+        """Drop a user's cached profile; call after any change to the users row"""
+        _user_profiles.invalidate(user_id)
+    
+    @staticmethod
+    def get_timezone(user_id):
+        """Get the user's stored timezone name (None when unset)"""
+        user = User.get_user_by_id(user_id)
+        return user['timezone'] if user else None
+    
+    @staticmethod
+    def update_timezone(user_id, timezone):
+        """Store the user's timezone name"""
         with get_db() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("SELECT * FROM users WHERE id = %s", (user_id,))
-                return cursor.fetchone()
+                cursor.execute("UPDATE users SET timezone = %s WHERE id = %s", (timezone, user_id))
+                conn.commit()
+                updated = cursor.rowcount > 0
+        User.invalidate_cache(user_id)
+        return updated
     
     @staticmethod
     def verify_user(email, password):
         """Verify user credentials"""
         print(f"Verifying user: {email}")
-        user = User.get_user_by_email(email)
+        # Credentials are never cached; read the row with its password hash
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"SELECT {USER_PROFILE_COLUMNS}, password_hash FROM users WHERE email = %s", (email,))
+                user = cursor.fetchone()
         print(f"User found: {user is not None}")
         if user:
             print(f"User email verified: {user['email_verified']}")
             password_match = check_password_hash(user['password_hash'], password)
             print(f"Password match: {password_match}")
             if password_match:
+                user.pop('password_hash')
                 return user
         return None
     
@@ -213,13 +195,19 @@ class User:
         """Verify email verification token"""
         with get_db() as conn:
             with conn.cursor() as cursor:
+                cursor.execute("SELECT id FROM users WHERE email_verification_token = %s FOR UPDATE", (token,))
+                user = cursor.fetchone()
+                if not user:
+                    conn.commit()
+                    return False
                 cursor.execute("""
                     UPDATE users 
                     SET email_verified = TRUE, email_verification_token = NULL 
-                    WHERE email_verification_token = %s
-                """, (token,))
+                    WHERE id = %s
+                """, (user['id'],))
                 conn.commit()
-                return cursor.rowcount > 0
+        User.invalidate_cache(user['id'])
+        return True
     
     @staticmethod
     def create_reset_token(email):
@@ -227,13 +215,13 @@ class User:
         with get_db() as conn:
             with conn.cursor() as cursor:
                 reset_token = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(32))
-                expires = datetime.now() + timedelta(hours=24)
                 
+                # Expiry on the database clock, like the NOW() it is checked against
                 cursor.execute("""
                     UPDATE users 
-                    SET reset_password_token = %s, reset_password_expires = %s 
+                    SET reset_password_token = %s, reset_password_expires = NOW() + INTERVAL 24 HOUR 
                     WHERE email = %s
-                """, (reset_token, expires, email))
+                """, (reset_token, email))
                 conn.commit()
                 
                 return reset_token if cursor.rowcount > 0 else None
@@ -243,36 +231,355 @@ class User:
         """Reset password using token"""
         with get_db() as conn:
             with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id FROM users
+                    WHERE reset_password_token = %s AND reset_password_expires > NOW()
+                    FOR UPDATE
+                """, (token,))
+                user = cursor.fetchone()
+                if not user:
+                    conn.commit()
+                    return False
                 password_hash = generate_password_hash(new_password)
                 cursor.execute("""
                     UPDATE users 
                     SET password_hash = %s, reset_password_token = NULL, reset_password_expires = NULL 
-                    WHERE reset_password_token = %s AND reset_password_expires > NOW()
-                """, (password_hash, token))
+                    WHERE id = %s
+                """, (password_hash, user['id']))
                 conn.commit()
-                return cursor.rowcount > 0
+        User.invalidate_cache(user['id'])
+        return True
+
+# Counters kept in user_assignment_stats; priority counters only include open assignments
+STATS_COUNTERS = (
+    'total', 'completed', 'pending', 'in_progress',
+    'high_priority', 'medium_priority', 'low_priority', 'no_due_date'
+)
+
+def _stats_contribution(assignment):
+    """Rollup counters contributed by a single assignment (status, priority, due_date)"""
+    contribution = dict.fromkeys(STATS_COUNTERS, 0)
+    if not assignment:
+        return contribution
+    status = assignment['status']
+    contribution['total'] = 1
+    if status == 'completed':
+        contribution['completed'] = 1
+    else:
+        if status == 'pending':
+            contribution['pending'] = 1
+        elif status == 'in-progress':
+            contribution['in_progress'] = 1
+        priority_key = f"{assignment['priority']}_priority"
+        if priority_key in contribution:
+            contribution[priority_key] = 1
+        if not assignment['due_date']:
+            contribution['no_due_date'] = 1
+    return contribution
+
+def _apply_stats_delta(cursor, user_id, old=None, new=None):
+    """Adjust a user's rollup row for an assignment changing from ``old`` to ``new``, on the caller's cursor"""
+    _apply_stats_deltas(cursor, user_id, [(old, new)])
+
+def _apply_stats_deltas(cursor, user_id, changes):
+    """Adjust a user's rollup row for many ``(old, new)`` changes and bump its data_version, with one statement"""
+    if not changes:
+        return
+    delta = [0] * len(STATS_COUNTERS)
+    for old, new in changes:
+        old_counts = _stats_contribution(old)
+        new_counts = _stats_contribution(new)
+        for i, key in enumerate(STATS_COUNTERS):
+            delta[i] += new_counts[key] - old_counts[key]
+    columns = ', '.join(STATS_COUNTERS)
+    placeholders = ', '.join(['%s'] * len(STATS_COUNTERS))
+    updates = ', '.join(f"{key} = {key} + VALUES({key})" for key in STATS_COUNTERS)
+    cursor.execute(f"""
+        INSERT INTO user_assignment_stats (user_id, {columns}, data_version)
+        VALUES (%s, {placeholders}, 1)
+        ON DUPLICATE KEY UPDATE {updates}, data_version = data_version + 1
+    """, (user_id, *delta))
+
+def _bump_data_versions(cursor, assignment_ids):
+    """Bump the data_version of the owners of ``assignment_ids``; returns their user ids"""
+    placeholders = ', '.join(['%s'] * len(assignment_ids))
+    cursor.execute(f"""
+        SELECT DISTINCT user_id FROM assignments WHERE id IN ({placeholders})
+    """, tuple(assignment_ids))
+    user_ids = [row['user_id'] for row in cursor.fetchall()]
+    if user_ids:
+        cursor.executemany("""
+            INSERT INTO user_assignment_stats (user_id, data_version) VALUES (%s, 1)
+            ON DUPLICATE KEY UPDATE data_version = data_version + 1
+        """, [(user_id,) for user_id in user_ids])
+    return user_ids
+
+def _lock_assignment(cursor, assignment_id, user_id):
+    """Lock a user's assignment row for update and return it (None if not theirs)"""
+    cursor.execute("""
+        SELECT * FROM assignments 
+        WHERE id = %s AND user_id = %s 
+        FOR UPDATE
+    """, (assignment_id, user_id))
+    return cursor.fetchone()
+
+def _read_assignment(cursor, assignment_id):
+    """Read an assignment back inside the writing transaction"""
+    cursor.execute("SELECT * FROM assignments WHERE id = %s", (assignment_id,))
+    return cursor.fetchone()
+
+def _record_tombstones(cursor, user_id, assignment_ids):
+    """Log deleted assignments for delta sync, in the deleting transaction"""
+    cursor.executemany("""
+        INSERT INTO assignment_tombstones (assignment_id, user_id) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP
+    """, [(assignment_id, user_id) for assignment_id in assignment_ids])
+
+def _lock_assignments(cursor, assignment_ids, user_id):
+    """Lock the given assignments of a user for update; returns {id: row} for those that are theirs"""
+    placeholders = ', '.join(['%s'] * len(assignment_ids))
+    cursor.execute(f"""
+        SELECT * FROM assignments 
+        WHERE user_id = %s AND id IN ({placeholders}) 
+        FOR UPDATE
+    """, (user_id, *assignment_ids))
+    return {row['id']: row for row in cursor.fetchall()}
+
+# Columns needed to render assignment lists; omits the description TEXT column
+# and the notification bookkeeping columns
+ASSIGNMENT_SUMMARY_COLUMNS = "id, user_id, title, due_date, priority, status, created_at, updated_at"
+
+# Sync tokens start this far before the database time they were issued at, so
+# rows written by transactions that commit a moment after a sync are not
+# missed (updated_at has one-second resolution and is set before commit)
+CHANGES_OVERLAP_SECONDS = 5
+
+# Hot queries, shared with query_plans.py so its EXPLAIN check runs the exact
+# statements; {columns} is '*' or ASSIGNMENT_SUMMARY_COLUMNS
+USER_ASSIGNMENTS_SQL = """
+    SELECT {columns} FROM assignments 
+    WHERE user_id = %s 
+    ORDER BY due_date ASC
+"""
+
+ASSIGNMENTS_PAGE_SQL = """
+    SELECT {columns} FROM assignments 
+    WHERE user_id = %s 
+    ORDER BY due_date ASC, id ASC
+    LIMIT %s
+"""
+
+ASSIGNMENTS_PAGE_AFTER_SQL = """
+    SELECT {columns} FROM assignments 
+    WHERE user_id = %s 
+    AND due_date >= %s AND (due_date > %s OR id > %s)
+    ORDER BY due_date ASC, id ASC
+    LIMIT %s
+"""
+
+STATISTICS_BUCKETS_SQL = """
+    SELECT
+        SUM(due_date < %s) AS overdue,
+        SUM(due_date >= %s AND due_date < %s) AS due_today,
+        SUM(due_date >= %s AND due_date < %s) AS due_week,
+        SUM(due_date >= %s) AS due_next_week
+    FROM assignments
+    WHERE user_id = %s AND due_date < %s
+    AND status != 'completed'
+"""
+
+DATA_VERSION_SQL = """
+    SELECT data_version FROM user_assignment_stats WHERE user_id = %s
+"""
+
+CHANGED_ASSIGNMENTS_SQL = """
+    SELECT {columns} FROM assignments 
+    WHERE user_id = %s AND updated_at >= %s
+"""
+
+TOMBSTONES_SINCE_SQL = """
+    SELECT assignment_id FROM assignment_tombstones 
+    WHERE user_id = %s AND deleted_at >= %s
+"""
+
+DUE_ASSIGNMENTS_FOR_USER_SQL = """
+    SELECT a.*, u.email, u.first_name, u.last_name
+    FROM assignments a
+    JOIN users u ON a.user_id = u.id
+    WHERE a.user_id = %s
+    AND a.due_date BETWEEN UTC_TIMESTAMP() AND DATE_ADD(UTC_TIMESTAMP(), INTERVAL %s HOUR)
+    AND a.email_notification_sent = FALSE
+    AND a.status != 'completed'
+    ORDER BY a.due_date ASC
+"""
+
+DUE_TODAY_FOR_USER_SQL = """
+    SELECT a.*, u.email, u.first_name, u.last_name
+    FROM assignments a
+    JOIN users u ON a.user_id = u.id
+    WHERE a.user_id = %s
+    AND a.due_date >= %s AND a.due_date < %s
+    AND a.status != 'completed'
+    AND a.email_notification_sent = FALSE
+    ORDER BY a.due_date ASC
+"""
+
+REMINDER_WINDOW_SQL = """
+    SELECT id, due_date FROM assignments
+    WHERE email_notification_sent = FALSE
+    AND due_date >= %s AND due_date < %s
+    AND status != 'completed'
+"""
+
+ASSIGNMENTS_CHANGED_SINCE_SQL = """
+    SELECT id, user_id, due_date, status, priority, email_notification_sent
+    FROM assignments
+    WHERE updated_at >= %s
+"""
+
+CLAIM_OUTBOX_SQL = """
+    SELECT * FROM email_notifications 
+    WHERE status IN ('pending', 'retry', 'sending')
+    AND next_attempt_at <= UTC_TIMESTAMP()
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+"""
+
+# Emails whose bodies carry account tokens; the bodies are cleared once the row is sent or failed
+TOKEN_NOTIFICATION_TYPES = ('verification', 'password_reset')
+_TOKEN_TYPES_SQL = ', '.join(f"'{t}'" for t in TOKEN_NOTIFICATION_TYPES)
+
+_assignment_listeners = []
+
+def on_assignment_change(listener):
+    """Register ``listener(action, assignment_id, user_id, assignment)``, called after assignment writes commit"""
+    _assignment_listeners.append(listener)
+    return listener
+
+def _notify_assignment_change(action, assignment_id, user_id, assignment=None):
+    for listener in list(_assignment_listeners):
+        try:
+            listener(action, assignment_id, user_id, assignment)
+        except Exception as e:
+            print(f"⚠️  Assignment change listener failed: {e}")
 
 class Assignment:
     """Assignment model with user association"""
     
     @staticmethod
-    def get_all_assignments(user_id=None):
-        """Get all assignments, optionally filtered by user"""
+    def get_all_assignments(user_id=None, summary=False):
+        """Get all assignments, optionally filtered by user (cached per user)"""
+        columns = ASSIGNMENT_SUMMARY_COLUMNS if summary else '*'
+        if user_id:
+            return get_assignment_cache().get_or_load(
+                user_id, ('list', summary), lambda: Assignment._select_all(columns, user_id)
+            )
+        return Assignment._select_all(columns)
+    
+    @staticmethod
+    def _select_all(columns, user_id=None):
+        """Uncached read behind get_all_assignments"""
         with get_db() as conn:
             with conn.cursor() as cursor:
                 if user_id:
-                    cursor.execute("""
-                        SELECT * FROM assignments 
-                        WHERE user_id = %s 
-                        ORDER BY due_date ASC
-                    """, (user_id,))
+                    cursor.execute(USER_ASSIGNMENTS_SQL.format(columns=columns), (user_id,))
                 else:
-                    cursor.execute("SELECT * FROM assignments ORDER BY due_date ASC")
+                    cursor.execute(f"SELECT {columns} FROM assignments ORDER BY due_date ASC")
                 return cursor.fetchall()
     
+    @staticmethod
+    def get_assignments_page(user_id, limit, after=None, summary=False):
+        """Get one page of a user's assignments after the (due_date, id) cursor ``after``; returns (rows, has_more)"""
+        columns = ASSIGNMENT_SUMMARY_COLUMNS if summary else '*'
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                if after:
+                    after_due_date, after_id = after
+                    cursor.execute(
+                        ASSIGNMENTS_PAGE_AFTER_SQL.format(columns=columns),
+                        (user_id, after_due_date, after_due_date, after_id, limit + 1)
+                    )
+                else:
+                    cursor.execute(ASSIGNMENTS_PAGE_SQL.format(columns=columns), (user_id, limit + 1))
+                rows = cursor.fetchall()
+                return rows[:limit], len(rows) > limit
+    
+    @staticmethod
+    def get_statistics(user_id, now, today_start, today_end, week_end, next_week_end):
+        """Get a user's assignment counters from the rollup plus the time-dependent buckets (naive UTC bounds)"""
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"""
+                    SELECT {', '.join(STATS_COUNTERS)}
+                    FROM user_assignment_stats
+                    WHERE user_id = %s
+                """, (user_id,))
+                counters = cursor.fetchone() or dict.fromkeys(STATS_COUNTERS, 0)
+                
+                cursor.execute(
+                    STATISTICS_BUCKETS_SQL,
+                    (now, today_start, today_end, today_end, week_end, week_end, user_id, next_week_end)
+                )
+                buckets = cursor.fetchone()
+                
+                statistics = dict(counters)
+                statistics.update(buckets)
+                # SUM() over no rows is NULL and otherwise a Decimal
+                return {key: int(value or 0) for key, value in statistics.items()}
+    
+    @staticmethod
+    def get_data_version(user_id):
+        """Counter bumped by every write to a user's assignments, for cache validators"""
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(DATA_VERSION_SQL, (user_id,))
+                row = cursor.fetchone()
+                return row['data_version'] if row else 0
+    
+    @staticmethod
+    def get_changes(user_id, since=None, summary=False, retention_days=None):
+        """Get a user's assignments written or deleted since ``since``; returns (rows, deleted_ids, next_since, full)"""
+        columns = ASSIGNMENT_SUMMARY_COLUMNS if summary else '*'
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT NOW() - INTERVAL %s SECOND AS next_since, NOW() - INTERVAL %s DAY AS oldest
+                """, (CHANGES_OVERLAP_SECONDS, retention_days or 0))
+                clock = cursor.fetchone()
+                if since is None or (retention_days and since < clock['oldest']):
+                    cursor.execute(USER_ASSIGNMENTS_SQL.format(columns=columns), (user_id,))
+                    return cursor.fetchall(), [], clock['next_since'], True
+                cursor.execute(CHANGED_ASSIGNMENTS_SQL.format(columns=columns), (user_id, since))
+                rows = cursor.fetchall()
+                cursor.execute(TOMBSTONES_SINCE_SQL, (user_id, since))
+                deleted_ids = [row['assignment_id'] for row in cursor.fetchall()]
+                return rows, deleted_ids, clock['next_since'], False
+    
+    @staticmethod
+    def purge_tombstones(retention_days):
+        """Delete tombstones older than ``retention_days``; returns how many were removed"""
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    DELETE FROM assignment_tombstones 
+                    WHERE deleted_at < NOW() - INTERVAL %s DAY
+                """, (retention_days,))
+                conn.commit()
+                return cursor.rowcount
+    
     @staticmethod
     def get_assignment_by_id(assignment_id, user_id=None):
-        """Get assignment by ID, optionally filtered by user"""
+        """Get assignment by ID, optionally filtered by user (cached per user)"""
+        if user_id:
+            return get_assignment_cache().get_or_load(
+                user_id, ('assignment', assignment_id),
+                lambda: Assignment._select_by_id(assignment_id, user_id)
+            )
+        return Assignment._select_by_id(assignment_id)
+    
+    @staticmethod
+    def _select_by_id(assignment_id, user_id=None):
+        """Uncached read behind get_assignment_by_id"""
         with get_db() as conn:
             with conn.cursor() as cursor:
                 if user_id:
@@ -286,143 +593,317 @@ class Assignment:
     
     @staticmethod
     def create_assignment(user_id, title, description, due_date, priority, status):
-        """Create a new assignment"""
+        """Create a new assignment and return the stored row"""
         with get_db() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
                     INSERT INTO assignments (user_id, title, description, due_date, priority, status)
                     VALUES (%s, %s, %s, %s, %s, %s)
                 """, (user_id, title, description, due_date, priority, status))
-                assignment_id = cursor.lastrowid
+                assignment = _read_assignment(cursor, cursor.lastrowid)
+                _apply_stats_delta(cursor, user_id, new=assignment)
                 conn.commit()
-                return assignment_id
+        get_assignment_cache().invalidate(user_id)
+        _notify_assignment_change('created', assignment['id'], user_id, assignment)
+        return assignment
     
     @staticmethod
     def update_assignment(assignment_id, user_id, title, description, due_date, priority, status):
-        """Update an assignment"""
+        """Update a user's assignment; returns the updated row, or None if they have no such assignment"""
         print(f"Updating assignment {assignment_id} for user {user_id}")
         print(f"Data: title={title}, description={description}, due_date={due_date}, priority={priority}, status={status}")
-        try:
-            with get_db() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("""
-                        UPDATE assignments 
-                        SET title = %s, description = %s, due_date = %s, priority = %s, status = %s
-                        WHERE id = %s AND user_id = %s
-                    """, (title, description, due_date, priority, status, assignment_id, user_id))
-                    conn.commit()
-                    result = cursor.rowcount > 0
-                    return result
-        except Exception as e:
-            raise
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                old = _lock_assignment(cursor, assignment_id, user_id)
+                if not old:
+                    return None
+                cursor.execute("""
+                    UPDATE assignments 
+                    SET title = %s, description = %s, due_date = %s, priority = %s, status = %s
+                    WHERE id = %s AND user_id = %s
+                """, (title, description, due_date, priority, status, assignment_id, user_id))
+                assignment = _read_assignment(cursor, assignment_id)
+                _apply_stats_delta(cursor, user_id, old=old, new=assignment)
+                conn.commit()
+        get_assignment_cache().invalidate(user_id)
+        _notify_assignment_change('updated', assignment_id, user_id, assignment)
+        return assignment
     
     @staticmethod
     def update_status(assignment_id, user_id, status):
-        """Update assignment status"""
+        """Update a user's assignment status; returns the updated row, or None if they have no such assignment"""
         with get_db() as conn:
             with conn.cursor() as cursor:
+                old = _lock_assignment(cursor, assignment_id, user_id)
+                if not old:
+                    return None
                 cursor.execute("""
                     UPDATE assignments 
                     SET status = %s 
                     WHERE id = %s AND user_id = %s
                 """, (status, assignment_id, user_id))
+                assignment = _read_assignment(cursor, assignment_id)
+                _apply_stats_delta(cursor, user_id, old=old, new=assignment)
                 conn.commit()
-                return cursor.rowcount > 0
+        get_assignment_cache().invalidate(user_id)
+        _notify_assignment_change('updated', assignment_id, user_id, assignment)
+        return assignment
     
     @staticmethod
     def delete_assignment(assignment_id, user_id):
-        """Delete an assignment"""
+        """Delete a user's assignment; returns the deleted row, or None if they have no such assignment"""
         with get_db() as conn:
             with conn.cursor() as cursor:
+                old = _lock_assignment(cursor, assignment_id, user_id)
+                if not old:
+                    return None
                 cursor.execute("""
                     DELETE FROM assignments 
                     WHERE id = %s AND user_id = %s
                 """, (assignment_id, user_id))
+                _record_tombstones(cursor, user_id, [assignment_id])
+                _apply_stats_delta(cursor, user_id, old=old)
                 conn.commit()
-                return cursor.rowcount > 0
+        get_assignment_cache().invalidate(user_id)
+        _notify_assignment_change('deleted', assignment_id, user_id)
+        return old
     
     @staticmethod
-    def get_due_assignments():
-        """Get assignments that are due soon (for email notifications)"""
+    def create_assignments(user_id, assignments):
+        """Create many assignments for a user in one transaction; returns the stored rows in order"""
+        if not assignments:
+            return []
         with get_db() as conn:
             with conn.cursor() as cursor:
-                # Get assignments due in the next 24 hours that haven't been notified
+                values = ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(assignments))
+                cursor.execute(f"""
+                    INSERT INTO assignments (user_id, title, description, due_date, priority, status)
+                    VALUES {values}
+                """, tuple(value for a in assignments for value in (
+                    user_id, a['title'], a['description'], a['due_date'], a['priority'], a['status']
+                )))
+                # One multi-row INSERT gets consecutive ids from LAST_INSERT_ID() on
+                # (innodb_autoinc_lock_mode 0 or 1); refuse to guess otherwise
+                first_id = cursor.lastrowid
                 cursor.execute("""
-                    SELECT a.*, u.email, u.first_name, u.last_name
-                    FROM assignments a
-                    JOIN users u ON a.user_id = u.id
-                    WHERE a.due_date BETWEEN NOW() AND DATE_ADD(NOW(), INTERVAL 24 HOUR)
-                    AND a.email_notification_sent = FALSE
-                    AND a.status != 'completed'
-                """)
+                    SELECT * FROM assignments 
+                    WHERE user_id = %s AND id BETWEEN %s AND %s 
+                    ORDER BY id
+                """, (user_id, first_id, first_id + len(assignments) - 1))
+                rows = cursor.fetchall()
+                if len(rows) != len(assignments):
+                    conn.rollback()
+                    raise RuntimeError("Bulk insert ids are not consecutive; set innodb_autoinc_lock_mode to 0 or 1")
+                _apply_stats_deltas(cursor, user_id, [(None, row) for row in rows])
+                conn.commit()
+        get_assignment_cache().invalidate(user_id)
+        for row in rows:
+            _notify_assignment_change('created', row['id'], user_id, row)
+        return rows
+    
+    @staticmethod
+    def update_statuses(user_id, statuses):
+        """Set the status of many of a user's assignments; returns {id: updated row} for the ones they own"""
+        if not statuses:
+            return {}
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                old = _lock_assignments(cursor, list(statuses), user_id)
+                if not old:
+                    return {}
+                by_status = {}
+                for assignment_id in old:
+                    by_status.setdefault(statuses[assignment_id], []).append(assignment_id)
+                for status, ids in by_status.items():
+                    placeholders = ', '.join(['%s'] * len(ids))
+                    cursor.execute(f"""
+                        UPDATE assignments 
+                        SET status = %s 
+                        WHERE user_id = %s AND id IN ({placeholders})
+                    """, (status, user_id, *ids))
+                placeholders = ', '.join(['%s'] * len(old))
+                cursor.execute(f"SELECT * FROM assignments WHERE id IN ({placeholders})", tuple(old))
+                updated = {row['id']: row for row in cursor.fetchall()}
+                _apply_stats_deltas(cursor, user_id, [(old[i], updated[i]) for i in old])
+                conn.commit()
+        get_assignment_cache().invalidate(user_id)
+        for assignment_id, row in updated.items():
+            _notify_assignment_change('updated', assignment_id, user_id, row)
+        return updated
+    
+    @staticmethod
+    def delete_assignments(user_id, assignment_ids):
+        """Delete many of a user's assignments; returns {id: deleted row} for the ones they owned"""
+        if not assignment_ids:
+            return {}
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                old = _lock_assignments(cursor, list(assignment_ids), user_id)
+                if not old:
+                    return {}
+                placeholders = ', '.join(['%s'] * len(old))
+                cursor.execute(f"""
+                    DELETE FROM assignments 
+                    WHERE user_id = %s AND id IN ({placeholders})
+                """, (user_id, *old))
+                _record_tombstones(cursor, user_id, list(old))
+                _apply_stats_deltas(cursor, user_id, [(row, None) for row in old.values()])
+                conn.commit()
+        get_assignment_cache().invalidate(user_id)
+        for assignment_id in old:
+            _notify_assignment_change('deleted', assignment_id, user_id)
+        return old
+    
+    @staticmethod
+    def get_due_assignments_for_user(user_id, hours=24):
+        """Get a user's open, un-notified assignments due within the next ``hours``"""
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(DUE_ASSIGNMENTS_FOR_USER_SQL, (user_id, hours))
                 return cursor.fetchall()
     
     @staticmethod
-    def get_assignments_due_today():
-        """Get assignments that are due today"""
+    def get_assignments_due_today_for_user(user_id, day_start, day_end):
+        """Get a user's open, un-notified assignments due in [day_start, day_end) (naive UTC)"""
         with get_db() as conn:
             with conn.cursor() as cursor:
-                # Get assignments due today (between start and end of today)
-                cursor.execute("""
-                    SELECT a.*, u.email, u.first_name, u.last_name
-                    FROM assignments a
-                    JOIN users u ON a.user_id = u.id
-                    WHERE DATE(a.due_date) = CURDATE()
-                    AND a.status != 'completed'
-                    AND a.email_notification_sent = FALSE
-                    ORDER BY a.due_date ASC
-                """)
+                cursor.execute(DUE_TODAY_FOR_USER_SQL, (user_id, day_start, day_end))
                 return cursor.fetchall()
     
     @staticmethod
-    def mark_notification_sent(assignment_id):
-        """Mark that email notification has been sent for an assignment"""
+    def get_reminder_window(due_from, due_until):
+        """Get (id, due_date) of open, un-notified assignments due in [due_from, due_until)"""
         with get_db() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    UPDATE assignments 
-                    SET email_notification_sent = TRUE, notification_sent_at = NOW()
-                    WHERE id = %s
-                """, (assignment_id,))
-                conn.commit()
-
+                cursor.execute(REMINDER_WINDOW_SQL, (due_from, due_until))
+                return cursor.fetchall()
+    
+    @staticmethod
+    def get_assignments_changed_since(since):
+        """Get assignments written since ``since`` (database clock); returns (rows, now)"""
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT NOW() AS now")
+                now = cursor.fetchone()['now']
+                if since is None:
+                    return [], now
+                cursor.execute(ASSIGNMENTS_CHANGED_SINCE_SQL, (since,))
+                return cursor.fetchall(), now
+    
 class EmailNotification:
     """Email notification model"""
     
     @staticmethod
-    def create_notification(user_id, assignment_id, notification_type, email_address, subject, message):
-        """Create a new email notification record"""
+    def record_reminder_batch(notifications, notified_assignment_ids):
+        """Write the reminder notifications and notified flags of a batch in one transaction"""
+        if not notifications and not notified_assignment_ids:
+            return
+        insert_sql = """
+            INSERT INTO email_notifications 
+            (user_id, assignment_id, notification_type, email_address, subject, message,
+             html_message, sender_email, status, error_message, next_attempt_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, UTC_TIMESTAMP())
+        """
+        
+        def values(n):
+            return (
+                n['user_id'], n['assignment_id'], n['notification_type'], n['email_address'],
+                n['subject'], n['message'], n.get('html_message'), n.get('sender_email'),
+                n['status'], n.get('error_message')
+            )
+        
+        singles = [n for n in notifications if not n.get('assignment_ids')]
+        digests = [n for n in notifications if n.get('assignment_ids')]
+        
+        with get_db() as conn:
+            with conn.cursor() as cursor:
+                if singles:
+                    cursor.executemany(insert_sql, [values(n) for n in singles])
+                ledger = []
+                for digest in digests:
+                    cursor.execute(insert_sql, values(digest))
+                    notification_id = cursor.lastrowid
+                    ledger.extend((assignment_id, notification_id) for assignment_id in digest['assignment_ids'])
+                if ledger:
+                    cursor.executemany("""
+                        INSERT INTO email_notification_assignments (assignment_id, notification_id)
+                        VALUES (%s, %s)
+                    """, ledger)
+                notified_user_ids = []
+                if notified_assignment_ids:
+                    notified_user_ids = _bump_data_versions(cursor, notified_assignment_ids)
+                    placeholders = ', '.join(['%s'] * len(notified_assignment_ids))
+                    cursor.execute(f"""
+                        UPDATE assignments 
+                        SET email_notification_sent = TRUE, notification_sent_at = NOW()
+                        WHERE id IN ({placeholders})
+                    """, tuple(notified_assignment_ids))
+                conn.commit()
+        get_assignment_cache().invalidate(*notified_user_ids)
+    
+    @staticmethod
+    def enqueue(email_address, subject, message, html_message=None, sender_email=None,
+                user_id=None, assignment_id=None, notification_type='general'):
+        """Write an email to the outbox as a pending row; the dispatcher delivers it"""
         with get_db() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
                     INSERT INTO email_notifications 
-                    (user_id, assignment_id, notification_type, email_address, subject, message)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """, (user_id, assignment_id, notification_type, email_address, subject, message))
+                    (user_id, assignment_id, notification_type, email_address, subject, message,
+                     html_message, sender_email, status, next_attempt_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 'pending', UTC_TIMESTAMP())
+                """, (user_id, assignment_id, notification_type, email_address, subject, message,
+                      html_message, sender_email))
                 notification_id = cursor.lastrowid
                 conn.commit()
                 return notification_id
     
     @staticmethod
-    def mark_sent(notification_id, status='sent', error_message=None):
-        """Mark notification as sent"""
+    def claim_outbox_batch(limit, lease_seconds):
+        """Claim up to ``limit`` due outbox rows and lease them as 'sending' for ``lease_seconds``"""
         with get_db() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    UPDATE email_notifications 
-                    SET status = %s, error_message = %s
-                    WHERE id = %s
-                """, (status, error_message, notification_id))
+                cursor.execute(CLAIM_OUTBOX_SQL, (limit,))
+                rows = cursor.fetchall()
+                if rows:
+                    ids = [row['id'] for row in rows]
+                    placeholders = ', '.join(['%s'] * len(ids))
+                    cursor.execute(f"""
+                        UPDATE email_notifications 
+                        SET status = 'sending', attempts = attempts + 1,
+                            next_attempt_at = DATE_ADD(UTC_TIMESTAMP(), INTERVAL %s SECOND)
+                        WHERE id IN ({placeholders})
+                    """, (lease_seconds, *ids))
+                    for row in rows:
+                        row['attempts'] += 1
                 conn.commit()
+                return rows
     
     @staticmethod
-    def get_pending_notifications():
-        """Get pending email notifications"""
+    def record_outbox_results(sent_ids, failures):
+        """Record a delivered batch; ``failures`` are (id, 'retry' or 'failed', error, retry_in_seconds)"""
+        if not sent_ids and not failures:
+            return
         with get_db() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT * FROM email_notifications 
-                    WHERE status = 'pending'
-                    ORDER BY sent_at ASC
-                """)
-                return cursor.fetchall()
+                if sent_ids:
+                    placeholders = ', '.join(['%s'] * len(sent_ids))
+                    cursor.execute(f"""
+                        UPDATE email_notifications 
+                        SET status = 'sent', error_message = NULL, delivered_at = UTC_TIMESTAMP(),
+                            next_attempt_at = NULL,
+                            message = IF(notification_type IN ({_TOKEN_TYPES_SQL}), '', message),
+                            html_message = IF(notification_type IN ({_TOKEN_TYPES_SQL}), NULL, html_message)
+                        WHERE id IN ({placeholders})
+                    """, tuple(sent_ids))
+                if failures:
+                    cursor.executemany(f"""
+                        UPDATE email_notifications 
+                        SET status = %s, error_message = %s,
+                            next_attempt_at = DATE_ADD(UTC_TIMESTAMP(), INTERVAL %s SECOND),
+                            message = IF(%s AND notification_type IN ({_TOKEN_TYPES_SQL}), '', message),
+                            html_message = IF(%s AND notification_type IN ({_TOKEN_TYPES_SQL}), NULL, html_message)
+                        WHERE id = %s
+                    """, [(status, error, retry_in, status == 'failed', status == 'failed', notification_id)
+                          for notification_id, status, error, retry_in in failures])
+                conn.commit()
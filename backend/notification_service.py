@@ -1,190 +1,328 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 from models import Assignment, EmailNotification
-from email_service import EmailService
-import threading
-import time
+from email_service import EmailService, mail_configured
+from config import Config
+from timezones import utc_now
+
+# Digest ordering for assignments due at the same time
+PRIORITY_RANK = {'high': 0, 'medium': 1, 'low': 2}
+
+# Reminder queries, shared with query_plans.py. {shard_filter} is '' or
+# SHARD_FILTER_SQL; the "not reminded today" anti-joins cover single
+# reminders and digests (email_notification_assignments)
+SHARD_FILTER_SQL = "AND MOD(a.user_id, %s) = %s"
+
+NOT_REMINDED_TODAY_SQL = """
+    AND NOT EXISTS (
+        SELECT 1 FROM email_notifications en
+        WHERE en.assignment_id = a.id
+        AND en.status IN ('pending', 'sending', 'retry', 'sent')
+        AND en.sent_at >= %s AND en.sent_at < %s
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM email_notification_assignments ena
+        JOIN email_notifications en ON en.id = ena.notification_id
+        WHERE ena.assignment_id = a.id
+        AND en.status IN ('pending', 'sending', 'retry', 'sent')
+        AND en.sent_at >= %s AND en.sent_at < %s
+    )
+"""
+
+UNREMINDED_DUE_WITHIN_SQL = """
+    SELECT a.*, u.email, u.first_name, u.last_name
+    FROM assignments a
+    JOIN users u ON a.user_id = u.id
+    WHERE a.due_date >= %s AND a.due_date <= %s
+    AND a.status != 'completed'
+    AND a.email_notification_sent = FALSE
+    {shard_filter}
+""" + NOT_REMINDED_TODAY_SQL + """
+    ORDER BY a.due_date ASC
+"""
+
+UNREMINDED_BY_ID_SQL = """
+    SELECT a.*, u.email, u.first_name, u.last_name
+    FROM assignments a
+    JOIN users u ON a.user_id = u.id
+    WHERE a.id IN ({placeholders})
+    AND a.due_date >= %s
+    AND a.status != 'completed'
+    AND a.email_notification_sent = FALSE
+    {shard_filter}
+""" + NOT_REMINDED_TODAY_SQL + """
+    ORDER BY a.due_date ASC
+"""
 
 class NotificationService:
     """Service for handling assignment notifications"""
     
     @staticmethod
-    def check_and_send_daily_reminders():
-        """Check for assignments due within 3 days and send email reminders"""
-        try:
-            print("🔔 Checking for assignments due within 3 days...")
-            
-            # Get all assignments due within 3 days
-            upcoming_assignments = NotificationService.get_assignments_due_within_days(3)
-            
-            if not upcoming_assignments:
-                print("📅 No assignments due within 3 days")
-                return
-            
-            print(f"📧 Found {len(upcoming_assignments)} assignments due within 3 days")
-            
-            for assignment in upcoming_assignments:
-                # Check if we've already sent a notification for this assignment today
-                if not NotificationService.has_sent_notification_today(assignment['id']):
-                    NotificationService.send_daily_reminder(assignment)
-                else:
-                    pass  # Already sent notification today
-                    
-        except Exception as e:
-            print(f"❌ Error in daily reminder check: {e}")
-            pass  # Silent error handling
+    def send_scheduled_reminders(assignment_ids):
+        """Queue reminders for assignments whose reminder time has arrived.
+        
+        Called by the reminder scheduler. The assignments are re-read with the
+        same "open, un-notified, not reminded today" filters as the daily scan,
+        so stale scheduler entries are harmless. Returns the processed IDs.
+        """
+        if Config.REMINDER_SHARDS > 1 and len(assignment_ids) >= Config.REMINDER_SHARD_MIN_BATCH:
+            from reminder_shards import get_reminder_engine
+            return get_reminder_engine().run(assignment_ids=assignment_ids)['processed_ids']
+        assignments = NotificationService.get_unreminded_assignments(assignment_ids)
+        if not assignments:
+            return []
+        return NotificationService.queue_reminders(assignments)
+    
+    @staticmethod
+    def queue_reminders(assignments):
+        """Queue reminders (digests or single emails) in batches of REMINDER_BATCH_SIZE"""
+        processed = []
+        if Config.REMINDER_DIGEST_ENABLED:
+            for batch in NotificationService.batch_by_user(assignments, Config.REMINDER_BATCH_SIZE):
+                processed.extend(NotificationService.send_digest_batch(batch))
+        else:
+            batch_size = Config.REMINDER_BATCH_SIZE
+            for start in range(0, len(assignments), batch_size):
+                processed.extend(NotificationService.send_reminder_batch(assignments[start:start + batch_size]))
+        return processed
+    
+    @staticmethod
+    def _shard_filter(shard):
+        """SQL condition and params restricting a scan to shard (index, count) of the users"""
+        if not shard:
+            return '', ()
+        index, count = shard
+        return SHARD_FILTER_SQL, (count, index)
     
     @staticmethod
-    def get_assignments_due_within_days(days):
-        """Get assignments that are due within X days"""
+    def get_unreminded_assignments_due_within_days(days, shard=None):
+        """Get assignments due within X days that have no reminder queued or sent today.
+        
+        The "already reminded today" check is an anti-join in the same query, so
+        the whole scan is a single round trip. Assignments covered by a digest
+        are found through email_notification_assignments. ``shard`` is an
+        optional (index, count) pair restricting the scan to one user partition.
+        """
         try:
             from models import get_db
             with get_db() as conn:
                 with conn.cursor() as cursor:
-                    # Get assignments due within X days
-                    now = datetime.now()
+                    # Due dates are naive UTC
+                    now = utc_now()
                     future_date = now + timedelta(days=days)
+                    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+                    today_end = today_start + timedelta(days=1)
+                    shard_filter, shard_params = NotificationService._shard_filter(shard)
                     
-                    cursor.execute("""
-                        SELECT a.*, u.email, u.first_name, u.last_name
-                        FROM assignments a
-                        JOIN users u ON a.user_id = u.id
-                        WHERE a.due_date >= %s AND a.due_date <= %s
-                        AND a.status != 'completed'
-                        AND a.email_notification_sent = FALSE
-                        ORDER BY a.due_date ASC
-                    """, (now, future_date))
+                    cursor.execute(
+                        UNREMINDED_DUE_WITHIN_SQL.format(shard_filter=shard_filter),
+                        (now, future_date, *shard_params, today_start, today_end, today_start, today_end)
+                    )
                     
                     return cursor.fetchall()
         except Exception as e:
-            print(f"❌ Error getting assignments due within {days} days: {e}")
+            print(f"❌ Error getting unreminded assignments due within {days} days: {e}")
             return []
     
     @staticmethod
-    def get_assignments_due_today():
-        """Get assignments that are due today"""
+    def get_unreminded_assignments(assignment_ids, shard=None):
+        """Get the given assignments that are still open, un-notified, not yet due and not reminded today"""
+        if not assignment_ids:
+            return []
         try:
             from models import get_db
             with get_db() as conn:
                 with conn.cursor() as cursor:
-                    # Get assignments due today (between start and end of today)
-                    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+                    # Due dates are naive UTC
+                    now = utc_now()
+                    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
                     today_end = today_start + timedelta(days=1)
+                    placeholders = ', '.join(['%s'] * len(assignment_ids))
+                    shard_filter, shard_params = NotificationService._shard_filter(shard)
                     
-                    cursor.execute("""
-                        SELECT a.*, u.email, u.first_name, u.last_name
-                        FROM assignments a
-                        JOIN users u ON a.user_id = u.id
-                        WHERE a.due_date >= %s AND a.due_date < %s
-                        AND a.status != 'completed'
-                        AND a.email_notification_sent = FALSE
-                        ORDER BY a.due_date ASC
-                    """, (today_start, today_end))
+                    cursor.execute(
+                        UNREMINDED_BY_ID_SQL.format(placeholders=placeholders, shard_filter=shard_filter),
+                        (*assignment_ids, now, *shard_params, today_start, today_end, today_start, today_end)
+                    )
                     
                     return cursor.fetchall()
         except Exception as e:
+            print(f"❌ Error getting scheduled reminder assignments: {e}")
             return []
     
     @staticmethod
-    def has_sent_notification_today(assignment_id):
-        """Check if we've already sent a notification for this assignment today"""
+    def get_reminded_today(assignment_ids):
+        """Return the subset of assignment IDs that already had a reminder queued or sent today"""
+        if not assignment_ids:
+            return set()
         try:
             from models import get_db
             with get_db() as conn:
                 with conn.cursor() as cursor:
-                    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+                    today_start = utc_now().replace(hour=0, minute=0, second=0, microsecond=0)
                     today_end = today_start + timedelta(days=1)
+                    placeholders = ', '.join(['%s'] * len(assignment_ids))
                     
-                    cursor.execute("""
-                        SELECT COUNT(*) as count
+                    cursor.execute(f"""
+                        SELECT assignment_id
                         FROM email_notifications
-                        WHERE assignment_id = %s
+                        WHERE assignment_id IN ({placeholders})
+                        AND status IN ('pending', 'sending', 'retry', 'sent')
                         AND sent_at >= %s AND sent_at < %s
-                        AND status = 'sent'
-                    """, (assignment_id, today_start, today_end))
+                        UNION
+                        SELECT ena.assignment_id
+                        FROM email_notification_assignments ena
+                        JOIN email_notifications en ON en.id = ena.notification_id
+                        WHERE ena.assignment_id IN ({placeholders})
+                        AND en.status IN ('pending', 'sending', 'retry', 'sent')
+                        AND en.sent_at >= %s AND en.sent_at < %s
+                    """, (*assignment_ids, today_start, today_end, *assignment_ids, today_start, today_end))
                     
-                    result = cursor.fetchone()
-                    return result['count'] > 0
+                    return {row['assignment_id'] for row in cursor.fetchall()}
         except Exception as e:
-            return False
+            return set()
     
     @staticmethod
-    def send_daily_reminder(assignment):
-        """Send daily reminder email for an assignment"""
+    def _reminder_record(assignment, content, status, error_message=None):
+        """Build the email_notifications outbox row for a daily reminder"""
+        return {
+            'user_id': assignment['user_id'],
+            'assignment_id': assignment['id'],
+            'notification_type': 'daily_reminder',
+            'email_address': assignment['email'],
+            'subject': content['subject'],
+            'message': content['body'],
+            'html_message': content['html_body'],
+            'sender_email': content['sender_email'],
+            'status': status,
+            'error_message': error_message
+        }
+    
+    @staticmethod
+    def send_reminder_batch(assignments):
+        """Queue reminders for a batch of assignments.
+        
+        The emails are rendered in one pass, then the outbox rows and the
+        assignments' notified flags for the whole batch are written in a single
+        transaction; the outbox dispatcher delivers the emails. Returns the IDs
+        of the assignments that were processed.
+        """
+        if not assignments:
+            return []
+        
+        email_configured = mail_configured()
+        contents = EmailService.build_deadline_reminder_batch(
+            [(a['email'], a['first_name'], a) for a in assignments]
+        )
+        if email_configured:
+            records = [NotificationService._reminder_record(a, content, 'pending')
+                       for a, content in zip(assignments, contents)]
+        else:
+            # Still record the notification attempt
+            records = [NotificationService._reminder_record(a, content, 'skipped', 'Email not configured')
+                       for a, content in zip(assignments, contents)]
+        
+        notified_ids = [assignment['id'] for assignment in assignments] if email_configured else []
+        
         try:
-            # Check if email is configured
-            from config import Config
-            
-            # For Postmark, we check if server token is configured
-            if not Config.MAIL_PASSWORD:
-                # Still record the notification attempt
-                try:
-                    notification_id = EmailNotification.create_notification(
-                        assignment['user_id'],
-                        assignment['id'],
-                        'daily_reminder',
-                        assignment['email'],
-                        f"Deadline Reminder: {assignment['title']}",
-                        f"Assignment '{assignment['title']}' is due at {assignment['due_date']}"
-                    )
-                    EmailNotification.mark_sent(notification_id, 'pending', 'Email not configured')
-                    return True  # Return True to indicate "processed"
-                except Exception as e:
-                    return False
-            
-            # Send email reminder using user's email as recipient
-            email_sent = EmailService.send_deadline_reminder_email(
-                assignment['email'],  # User's email from registration
-                assignment['first_name'],
-                assignment
+            EmailNotification.record_reminder_batch(records, notified_ids)
+        except Exception as e:
+            print(f"❌ Error recording reminder batch: {e}")
+            return []
+        
+        if notified_ids:
+            print(f"✅ Daily reminders queued for {len(notified_ids)} assignment(s)")
+        return [assignment['id'] for assignment in assignments]
+    
+    @staticmethod
+    def digest_order(assignment):
+        """Sort key for assignments inside a digest: soonest first, then highest priority"""
+        return (assignment['due_date'], PRIORITY_RANK.get(assignment['priority'], len(PRIORITY_RANK)))
+    
+    @staticmethod
+    def batch_by_user(assignments, batch_size):
+        """Split assignments into batches of about ``batch_size`` without splitting a user.
+        
+        A user's assignments always land in the same batch so their digest
+        covers everything due for them in this run.
+        """
+        by_user = {}
+        for assignment in assignments:
+            by_user.setdefault(assignment['user_id'], []).append(assignment)
+        
+        batch = []
+        for user_assignments in by_user.values():
+            if batch and len(batch) + len(user_assignments) > batch_size:
+                yield batch
+                batch = []
+            batch.extend(user_assignments)
+        if batch:
+            yield batch
+    
+    @staticmethod
+    def send_digest_batch(assignments):
+        """Queue one digest email per user for a batch of assignments.
+        
+        Assignments are grouped by user and sorted by due date and priority.
+        Users with a single due assignment get the regular reminder; everyone
+        else gets one digest row in the outbox whose covered assignment IDs are
+        written to email_notification_assignments. All rows and notified flags
+        are committed in one transaction. Returns the IDs of the assignments
+        that were processed.
+        """
+        if not assignments:
+            return []
+        
+        by_user = {}
+        for assignment in assignments:
+            by_user.setdefault(assignment['user_id'], []).append(assignment)
+        
+        email_configured = mail_configured()
+        status, error_message = ('pending', None) if email_configured else ('skipped', 'Email not configured')
+        
+        singles = [group[0] for group in by_user.values() if len(group) == 1]
+        contents = EmailService.build_deadline_reminder_batch(
+            [(a['email'], a['first_name'], a) for a in singles]
+        )
+        records = [NotificationService._reminder_record(a, content, status, error_message)
+                   for a, content in zip(singles, contents)]
+        
+        for user_id, group in by_user.items():
+            if len(group) == 1:
+                continue
+            group.sort(key=NotificationService.digest_order)
+            first = group[0]
+            content = EmailService.build_deadline_digest_email(first['email'], first['first_name'], group)
+            record = NotificationService._reminder_record(first, content, status, error_message)
+            record.update(
+                assignment_id=None,
+                notification_type='daily_digest',
+                assignment_ids=[a['id'] for a in group]
             )
-            
-            if email_sent:
-                # Record the notification
-                notification_id = EmailNotification.create_notification(
-                    assignment['user_id'],
-                    assignment['id'],
-                    'daily_reminder',
-                    assignment['email'],
-                    f"Deadline Reminder: {assignment['title']}",
-                    f"Assignment '{assignment['title']}' is due at {assignment['due_date']}"
-                )
-                
-                # Mark notification as sent
-                EmailNotification.mark_sent(notification_id, 'sent')
-                
-                # Mark assignment as notified
-                Assignment.mark_notification_sent(assignment['id'])
-                
-                print(f"✅ Daily reminder sent for assignment {assignment['id']}")
-                return True
-            else:
-                print(f"❌ Failed to send daily reminder for assignment {assignment['id']}")
-                return False
-                
+            records.append(record)
+        
+        processed_ids = [assignment['id'] for assignment in assignments]
+        notified_ids = processed_ids if email_configured else []
+        
+        try:
+            EmailNotification.record_reminder_batch(records, notified_ids)
         except Exception as e:
-            print(f"❌ Error sending daily reminder: {e}")
-            return False
+            print(f"❌ Error recording reminder digests: {e}")
+            return []
+        
+        if notified_ids:
+            print(f"✅ Reminder digests queued for {len(by_user)} user(s) covering {len(notified_ids)} assignment(s)")
+        return processed_ids
+    
+    @staticmethod
+    def send_daily_reminder(assignment):
+        """Send daily reminder email for an assignment"""
+        return bool(NotificationService.send_reminder_batch([assignment]))
     
     @staticmethod
     def start_daily_reminder_scheduler():
-        """Start the daily reminder scheduler"""
-        def scheduler():
-            while True:
-                try:
-                    # Check for reminders every hour
-                    NotificationService.check_and_send_daily_reminders()
-                    
-                    # Sleep for 1 hour
-                    time.sleep(3600)  # 3600 seconds = 1 hour
-                    
-                except Exception as e:
-                    print(f"❌ Error in scheduler: {e}")
-                    time.sleep(300)  # Sleep for 5 minutes on error
-        
-        # Start scheduler in a separate thread
-        scheduler_thread = threading.Thread(target=scheduler, daemon=True)
-        scheduler_thread.start()
-        print("🕐 Daily reminder scheduler started")
+        """Campaign for the reminder scheduler lease; only the leader runs the scheduler"""
+        from leader_election import get_scheduler_election
+        get_scheduler_election().start()
     
     @staticmethod
     def send_immediate_reminder(assignment_id, user_id):
@@ -0,0 +1,157 @@
+import os
+import threading
+from concurrent.futures import wait
+from config import Config
+from email_service import build_message, get_sender_pool, mail_configured, MailQueueFullError
+from models import EmailNotification
+from event_bus import publish
+
+# Notification types announced to the user's live streams as reminder.sent
+REMINDER_NOTIFICATION_TYPES = ('daily_reminder', 'daily_digest', 'deadline_reminder')
+
+class OutboxDispatcher:
+    """Delivers pending rows of the email_notifications outbox.
+
+    Each cycle claims a batch with SELECT ... FOR UPDATE SKIP LOCKED, hands the
+    messages to the SMTP sender pool and records sent/retry/failed for the whole
+    batch in one transaction. Several dispatchers (threads or processes) can
+    drain the outbox in parallel without claiming the same row. Delivery is
+    at-least-once: a dispatcher that dies after sending but before recording
+    the result leaves its rows to be reclaimed when their lease expires.
+    """
+
+    def __init__(self, batch_size=50, poll_interval=5, lease_seconds=300,
+                 max_attempts=5, backoff_base=60, backoff_max=3600, send_timeout=120):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.send_timeout = send_timeout
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._stats = {
+            'batches': 0,
+            'claimed': 0,
+            'sent': 0,
+            'retried': 0,
+            'failed': 0
+        }
+
+    def retry_delay(self, attempts):
+        """Exponential backoff in seconds after ``attempts`` failed attempts"""
+        return min(self.backoff_max, self.backoff_base * (2 ** max(0, attempts - 1)))
+
+    def dispatch_batch(self):
+        """Claim and deliver one batch; return the number of rows claimed"""
+        rows = EmailNotification.claim_outbox_batch(self.batch_size, self.lease_seconds)
+        if not rows:
+            return 0
+
+        pool = get_sender_pool()
+        futures = {}
+        failures = []
+        for row in rows:
+            try:
+                recipients = [address.strip() for address in row['email_address'].split(',')]
+                msg = build_message(row['subject'], recipients, row['message'],
+                                    row['html_message'], row['sender_email'])
+                futures[row['id']] = (row, pool.submit(msg, recipients))
+            except MailQueueFullError as e:
+                # Local backpressure, not a delivery failure; try again shortly instead of backing off
+                failures.append((row['id'], 'retry', str(e), self.poll_interval))
+            except Exception as e:
+                failures.append(self._failure(row, e))
+
+        wait([future for _, future in futures.values()], timeout=self.send_timeout)
+
+        sent_ids = []
+        for notification_id, (row, future) in futures.items():
+            if not future.done():
+                failures.append(self._failure(row, TimeoutError('Timed out waiting for SMTP delivery')))
+            elif future.exception() is not None:
+                failures.append(self._failure(row, future.exception()))
+            else:
+                sent_ids.append(notification_id)
+
+        EmailNotification.record_outbox_results(sent_ids, failures)
+        for notification_id in sent_ids:
+            row = futures[notification_id][0]
+            if row['user_id'] and row['notification_type'] in REMINDER_NOTIFICATION_TYPES:
+                publish(row['user_id'], 'reminder.sent', {
+                    'notification_id': notification_id,
+                    'notification_type': row['notification_type'],
+                    'assignment_id': row['assignment_id'],
+                    'subject': row['subject']
+                })
+
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['claimed'] += len(rows)
+            self._stats['sent'] += len(sent_ids)
+            self._stats['retried'] += sum(1 for f in failures if f[1] == 'retry')
+            self._stats['failed'] += sum(1 for f in failures if f[1] == 'failed')
+        return len(rows)
+
+    def _failure(self, row, error):
+        if row['attempts'] >= self.max_attempts:
+            return (row['id'], 'failed', str(error), 0)
+        return (row['id'], 'retry', str(error), self.retry_delay(row['attempts']))
+
+    def drain(self):
+        """Dispatch batches until the outbox has nothing due"""
+        total = 0
+        while not self._stop.is_set():
+            claimed = self.dispatch_batch()
+            total += claimed
+            if claimed < self.batch_size:
+                break
+        return total
+
+    def run_forever(self):
+        """Poll the outbox until stop() is called"""
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except Exception as e:
+                print(f"❌ Error in outbox dispatcher: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def start(self):
+        """Run the dispatcher in a background thread (once per process)"""
+        if not mail_configured():
+            print("📭 Email not configured - outbox dispatcher not started")
+            return False
+        with self._lock:
+            if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+                return True
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name='outbox-dispatcher', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+        print("📬 Outbox dispatcher started")
+        return True
+
+    def stop(self):
+        self._stop.set()
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['running'] = bool(self._pid == os.getpid() and self._thread and self._thread.is_alive())
+        return stats
+
+_dispatcher = OutboxDispatcher(
+    batch_size=Config.OUTBOX_BATCH_SIZE,
+    poll_interval=Config.OUTBOX_POLL_INTERVAL,
+    lease_seconds=Config.OUTBOX_LEASE_SECONDS,
+    max_attempts=Config.OUTBOX_MAX_ATTEMPTS,
+    backoff_base=Config.OUTBOX_BACKOFF_BASE
+)
+
+def get_dispatcher():
+    """Return the process-wide outbox dispatcher"""
+    return _dispatcher
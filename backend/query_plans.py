@@ -0,0 +1,154 @@
+"""EXPLAIN-based regression check for the hot queries.
+
+Runs EXPLAIN for every query in HOT_QUERIES and fails if any table is read with
+a full table scan (type ALL), a full index scan (type index) or needs a
+filesort. Run it against a database with realistic data volume (staging or a
+production copy) after changing queries or indexes:
+
+    python query_plans.py
+"""
+import sys
+from datetime import timedelta
+from timezones import utc_now
+from models import (
+    get_db, ASSIGNMENT_SUMMARY_COLUMNS, USER_ASSIGNMENTS_SQL, ASSIGNMENTS_PAGE_SQL,
+    ASSIGNMENTS_PAGE_AFTER_SQL, STATISTICS_BUCKETS_SQL, DATA_VERSION_SQL, CHANGED_ASSIGNMENTS_SQL,
+    TOMBSTONES_SINCE_SQL, DUE_ASSIGNMENTS_FOR_USER_SQL, DUE_TODAY_FOR_USER_SQL, REMINDER_WINDOW_SQL,
+    ASSIGNMENTS_CHANGED_SINCE_SQL, CLAIM_OUTBOX_SQL
+)
+from notification_service import UNREMINDED_DUE_WITHIN_SQL, UNREMINDED_BY_ID_SQL
+
+# Access types that mean every row (or index entry) of a table is visited
+FULL_SCAN_TYPES = ('ALL', 'index')
+
+
+def _today_bounds():
+    today_start = utc_now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return today_start, today_start + timedelta(days=1)
+
+
+def get_hot_queries(user_id=1, assignment_id=1):
+    """Return [(name, sql, params)] for the queries the indexes are designed for.
+
+    The SQL is the models' own statements (module-level constants), so a
+    changed query is checked as it runs.
+    """
+    now = utc_now()
+    today_start, today_end = _today_bounds()
+    reminded_today = (today_start, today_end, today_start, today_end)
+
+    return [
+        (
+            'Assignment.get_all_assignments',
+            USER_ASSIGNMENTS_SQL.format(columns='*'),
+            (user_id,)
+        ),
+        (
+            'Assignment.get_assignments_page',
+            ASSIGNMENTS_PAGE_SQL.format(columns=ASSIGNMENT_SUMMARY_COLUMNS),
+            (user_id, 51)
+        ),
+        (
+            'Assignment.get_assignments_page (after cursor)',
+            ASSIGNMENTS_PAGE_AFTER_SQL.format(columns=ASSIGNMENT_SUMMARY_COLUMNS),
+            (user_id, now, now, assignment_id, 51)
+        ),
+        (
+            'Assignment.get_statistics',
+            STATISTICS_BUCKETS_SQL,
+            (now, today_start, today_end, today_end, now + timedelta(days=7),
+             now + timedelta(days=7), user_id, now + timedelta(days=14))
+        ),
+        (
+            'Assignment.get_data_version',
+            DATA_VERSION_SQL,
+            (user_id,)
+        ),
+        (
+            'Assignment.get_changes',
+            CHANGED_ASSIGNMENTS_SQL.format(columns='*'),
+            (user_id, now - timedelta(minutes=1))
+        ),
+        (
+            'Assignment.get_changes (tombstones)',
+            TOMBSTONES_SINCE_SQL,
+            (user_id, now - timedelta(minutes=1))
+        ),
+        (
+            'Assignment.get_due_assignments_for_user',
+            DUE_ASSIGNMENTS_FOR_USER_SQL,
+            (user_id, 24)
+        ),
+        (
+            'Assignment.get_assignments_due_today_for_user',
+            DUE_TODAY_FOR_USER_SQL,
+            (user_id, today_start, today_end)
+        ),
+        (
+            'Assignment.get_reminder_window',
+            REMINDER_WINDOW_SQL,
+            (now, now + timedelta(hours=6))
+        ),
+        (
+            'Assignment.get_assignments_changed_since',
+            ASSIGNMENTS_CHANGED_SINCE_SQL,
+            (now - timedelta(seconds=15),)
+        ),
+        (
+            'NotificationService.get_unreminded_assignments_due_within_days',
+            UNREMINDED_DUE_WITHIN_SQL.format(shard_filter=''),
+            (now, now + timedelta(days=3), *reminded_today)
+        ),
+        (
+            'NotificationService.get_unreminded_assignments',
+            UNREMINDED_BY_ID_SQL.format(placeholders='%s', shard_filter=''),
+            (assignment_id, now, *reminded_today)
+        ),
+        (
+            'EmailNotification.claim_outbox_batch',
+            CLAIM_OUTBOX_SQL,
+            (100,)
+        )
+    ]
+
+
+def explain(cursor, sql, params):
+    cursor.execute("EXPLAIN " + sql, params)
+    return cursor.fetchall()
+
+
+def find_plan_problems(plan_rows):
+    """Return human readable problems found in EXPLAIN output"""
+    problems = []
+    for row in plan_rows:
+        table = row.get('table')
+        access_type = row.get('type')
+        extra = row.get('Extra') or ''
+        if access_type in FULL_SCAN_TYPES:
+            problems.append(f"full scan on {table} (type={access_type})")
+        if 'Using filesort' in extra:
+            problems.append(f"filesort on {table}")
+    return problems
+
+
+def check_query_plans(verbose=True):
+    """EXPLAIN every hot query; return {query name: [problems]} for failing ones"""
+    failures = {}
+    with get_db() as conn:
+        with conn.cursor() as cursor:
+            for name, sql, params in get_hot_queries():
+                plan = explain(cursor, sql, params)
+                problems = find_plan_problems(plan)
+                if verbose:
+                    marker = '❌' if problems else '✅'
+                    keys = ', '.join(f"{row.get('table')}:{row.get('key')}" for row in plan)
+                    print(f"{marker} {name} [{keys}]")
+                    for problem in problems:
+                        print(f"   - {problem}")
+                if problems:
+                    failures[name] = problems
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if check_query_plans() else 0)
@@ -0,0 +1,285 @@
+import heapq
+import os
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from config import Config
+from models import Assignment, on_assignment_change
+from timezones import utc_now
+
+def _as_datetime(value):
+    if isinstance(value, str):
+        return datetime.strptime(value[:19], '%Y-%m-%d %H:%M:%S')
+    return value
+
+class ReminderScheduler:
+    """Fires deadline reminders at their exact reminder time.
+
+    Each open, un-notified assignment gets a reminder ``lead_time`` before it
+    is due. Upcoming fire times are kept in a min-heap; the scheduler thread
+    sleeps until the earliest one (or until a write changes it) and hands the
+    due assignments to NotificationService in one batch.
+
+    The heap only holds reminders firing before ``loaded_until``. It is filled
+    from the database one ``horizon`` window at a time, and assignment writes
+    in this process update it through the Assignment change hooks. Entries for
+    deleted, completed or rescheduled assignments are dropped lazily when they
+    reach the top of the heap. Writes made by other processes (the web tier)
+    are picked up by polling assignments.updated_at every ``poll_interval``
+    seconds, and a periodic resync reloads the whole window as a safety net.
+    """
+
+    def __init__(self, lead_time=timedelta(days=3), horizon=timedelta(hours=6),
+                 coalesce=timedelta(seconds=30), resync_interval=3600, poll_interval=15):
+        self.lead_time = lead_time
+        self.horizon = horizon
+        self.coalesce = coalesce
+        self.resync_interval = resync_interval
+        self.poll_interval = poll_interval
+        self._cond = threading.Condition()
+        self._heap = []
+        self._fire_at = {}  # assignment_id -> current fire time; heap entries that disagree are stale
+        self._loaded_until = None
+        self._next_resync = None
+        self._next_poll = None
+        self._changes_since = None  # database time of the last change poll
+        self._loading = None  # changes made by hooks while a window is being loaded
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._started_at = None
+        self._guard = None  # callable that must return True right before reminders are sent
+        self._lags = deque(maxlen=1000)
+        self._stats = {
+            'loads': 0,
+            'loaded': 0,
+            'polled_changes': 0,
+            'fired': 0,
+            'runs': 0,
+            'errors': 0,
+            'fenced': 0
+        }
+
+    def fire_time(self, due_date):
+        return _as_datetime(due_date) - self.lead_time
+
+    def _set(self, assignment_id, fire_at):
+        """Schedule (or, with fire_at None, unschedule) a reminder; caller holds the lock"""
+        if self._loading is not None:
+            self._loading[assignment_id] = fire_at
+        if fire_at is None or self._loaded_until is None or fire_at >= self._loaded_until:
+            # Beyond the loaded window; the window load that covers it will pick it up
+            self._fire_at.pop(assignment_id, None)
+            return
+        self._fire_at[assignment_id] = fire_at
+        heapq.heappush(self._heap, (fire_at, assignment_id))
+        if self._heap[0] == (fire_at, assignment_id):
+            self._cond.notify()
+
+    def on_assignment_change(self, action, assignment_id, user_id, assignment):
+        """Assignment write hook: reschedule or drop the assignment's reminder"""
+        fire_at = None
+        if action != 'deleted' and assignment and assignment['status'] != 'completed' and assignment['due_date']:
+            fire_at = self.fire_time(assignment['due_date'])
+        with self._cond:
+            self._set(assignment_id, fire_at)
+
+    def _load(self, fire_from, fire_until, replace=False):
+        """Load reminders firing in [fire_from, fire_until) from the database.
+
+        With ``replace`` the window's current contents are discarded first; this
+        is how a resync drops assignments completed or notified elsewhere.
+        """
+        with self._cond:
+            self._loading = {}
+        try:
+            rows = Assignment.get_reminder_window(fire_from + self.lead_time, fire_until + self.lead_time)
+        except Exception:
+            with self._cond:
+                self._loading = None
+            raise
+
+        with self._cond:
+            changes, self._loading = self._loading, None
+            if replace:
+                self._fire_at = {}
+                self._heap = []
+            self._loaded_until = max(self._loaded_until or fire_until, fire_until)
+            for row in rows:
+                if row['id'] not in changes:
+                    self._fire_at[row['id']] = self.fire_time(row['due_date'])
+            # Hook updates that raced with the query win over what it read
+            for assignment_id, fire_at in changes.items():
+                if fire_at is None or fire_at >= self._loaded_until:
+                    self._fire_at.pop(assignment_id, None)
+                else:
+                    self._fire_at[assignment_id] = fire_at
+            self._heap = [(fire_at, assignment_id) for assignment_id, fire_at in self._fire_at.items()]
+            heapq.heapify(self._heap)
+            self._stats['loads'] += 1
+            self._stats['loaded'] += len(rows)
+            self._cond.notify()
+
+    def _poll_changes(self):
+        """Apply assignment writes made by other processes since the last poll"""
+        rows, db_now = Assignment.get_assignments_changed_since(self._changes_since)
+        with self._cond:
+            for row in rows:
+                fire_at = None
+                if row['status'] != 'completed' and not row['email_notification_sent'] and row['due_date']:
+                    fire_at = self.fire_time(row['due_date'])
+                self._set(row['id'], fire_at)
+            self._stats['polled_changes'] += len(rows)
+        # Overlap polls so rows committed late with an earlier updated_at are not missed
+        self._changes_since = db_now - timedelta(seconds=max(60, 2 * self.poll_interval))
+
+    def _refresh(self, now):
+        """Resync or extend the loaded window and poll for changes when it is time to"""
+        if self.poll_interval and (self._next_poll is None or now >= self._next_poll):
+            self._poll_changes()
+            self._next_poll = now + timedelta(seconds=self.poll_interval)
+        if self._loaded_until is None or now >= self._next_resync:
+            # Reminders whose time passed while nothing was running are due immediately
+            self._load(now - self.lead_time, now + self.horizon, replace=True)
+            self._next_resync = now + timedelta(seconds=self.resync_interval)
+        elif now >= self._loaded_until - self.horizon / 2:
+            self._load(self._loaded_until, self._loaded_until + self.horizon)
+
+    def _pop_due(self, now):
+        """Pop every live entry due by now (plus the coalescing window); caller holds the lock"""
+        due = []
+        cutoff = now + self.coalesce
+        while self._heap and self._heap[0][0] <= cutoff:
+            fire_at, assignment_id = heapq.heappop(self._heap)
+            if self._fire_at.get(assignment_id) != fire_at:
+                continue  # stale entry
+            del self._fire_at[assignment_id]
+            due.append((fire_at, assignment_id))
+        return due
+
+    def _next_wakeup(self, now):
+        """Seconds until the next fire time or window refresh; caller holds the lock"""
+        while self._heap and self._fire_at.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if self._loaded_until is None:
+            return 0.0  # stopped or never loaded
+        wake_at = min(self._loaded_until - self.horizon / 2, self._next_resync)
+        if self.poll_interval and self._next_poll is not None:
+            wake_at = min(wake_at, self._next_poll)
+        if self._heap:
+            wake_at = min(wake_at, self._heap[0][0])
+        return max(0.0, (wake_at - now).total_seconds())
+
+    def run_once(self):
+        """Refresh the window if needed and fire due reminders; return seconds until the next wakeup"""
+        from notification_service import NotificationService
+
+        if self._started_at is None:
+            self._started_at = utc_now()
+        self._refresh(utc_now())
+        now = utc_now()
+        with self._cond:
+            due = self._pop_due(now)
+
+        if due and self._guard is not None and not self._guard():
+            # Leadership lapsed (e.g. a lease renewal is stuck); keep the reminders for when it is back
+            with self._cond:
+                for fire_at, assignment_id in due:
+                    self._set(assignment_id, fire_at)
+                self._stats['fenced'] += 1
+            return 1.0
+
+        if due:
+            NotificationService.send_scheduled_reminders([assignment_id for _, assignment_id in due])
+            fired_at = utc_now()
+            with self._cond:
+                self._stats['fired'] += len(due)
+                self._stats['runs'] += 1
+                # Reminders that came due before the scheduler started count from the start
+                self._lags.extend(
+                    max(0.0, (fired_at - max(fire_at, self._started_at)).total_seconds()) for fire_at, _ in due
+                )
+
+        with self._cond:
+            return self._next_wakeup(utc_now())
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            try:
+                timeout = self.run_once()
+            except Exception as e:
+                print(f"❌ Error in reminder scheduler: {e}")
+                with self._cond:
+                    self._stats['errors'] += 1
+                timeout = 60
+            with self._cond:
+                if not self._stop.is_set():
+                    self._cond.wait(timeout)
+
+    def start(self, guard=None):
+        """Run the scheduler in a background thread (once per process); ``guard()`` gates every send"""
+        self._guard = guard
+        thread = self._thread
+        if self._pid == os.getpid() and thread and thread.is_alive():
+            if not self._stop.is_set():
+                return True
+            # Restarting after stop(): let the previous run finish its batch first
+            thread.join(timeout=60)
+        with self._cond:
+            # Start from a fresh load; the heap was not maintained while stopped
+            self._loaded_until = None
+            self._fire_at = {}
+            self._heap = []
+            self._next_poll = None
+            self._changes_since = None
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name='reminder-scheduler', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+        print("🕐 Reminder scheduler started")
+        return True
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._loaded_until = None
+            self._cond.notify()
+
+    def metrics(self):
+        """Heap size, next fire time and firing lag percentiles"""
+        with self._cond:
+            stats = dict(self._stats)
+            lags = sorted(self._lags)
+            stats['heap_size'] = len(self._heap)
+            stats['scheduled'] = len(self._fire_at)
+            next_fire = min(self._fire_at.values()) if self._fire_at else None
+            stats['loaded_until'] = self._loaded_until.isoformat() if self._loaded_until else None
+        stats['next_fire_in_seconds'] = (
+            round((next_fire - utc_now()).total_seconds(), 1) if next_fire else None
+        )
+        stats['running'] = bool(self._pid == os.getpid() and self._thread and self._thread.is_alive())
+
+        def percentile(values, pct):
+            if not values:
+                return 0.0
+            return round(values[min(len(values) - 1, int(len(values) * pct))] * 1000, 1)
+
+        stats['lag_ms'] = {
+            'p50': percentile(lags, 0.5),
+            'p95': percentile(lags, 0.95),
+            'max': round(lags[-1] * 1000, 1) if lags else 0.0
+        }
+        return stats
+
+_scheduler = ReminderScheduler(
+    lead_time=timedelta(days=Config.REMINDER_LEAD_DAYS),
+    horizon=timedelta(seconds=Config.REMINDER_SCHEDULER_HORIZON),
+    coalesce=timedelta(seconds=Config.REMINDER_SCHEDULER_COALESCE),
+    resync_interval=Config.REMINDER_SCHEDULER_RESYNC,
+    poll_interval=Config.REMINDER_SCHEDULER_POLL
+)
+on_assignment_change(_scheduler.on_assignment_change)
+
+def get_reminder_scheduler():
+    """Return the process-wide reminder scheduler"""
+    return _scheduler
@@ -0,0 +1,175 @@
+"""Sharded reminder processing.
+
+The due set is partitioned by ``MOD(user_id, shards)`` and every shard is
+handled by a separate process: it reads only its users' assignments, renders
+their reminders and writes its outbox rows independently, so throughput grows
+with the number of cores. Shards are claimed through a lease (see
+leader_election), which lets several nodes run the same pass cooperatively:
+a shard being processed by one node is skipped by the others.
+
+Usage:
+    python reminder_shards.py [days]    Run one sharded pass and print a per-shard report
+"""
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from config import Config
+
+def process_shard(shard, shards, days=None, assignment_ids=None, claim_ttl=0):
+    """Queue reminders for one user partition; runs in a worker process.
+
+    Processes either the assignments due within ``days`` or the given
+    ``assignment_ids``. Returns a progress report for the shard.
+    """
+    from leader_election import get_lease_store
+    from notification_service import NotificationService
+
+    started = time.monotonic()
+    report = {'shard': shard, 'pid': os.getpid(), 'found': 0, 'queued': 0, 'processed_ids': []}
+    lease_name = f"reminder_shard:{shard}/{shards}"
+    holder = f"{socket.gethostname()}:{os.getpid()}"
+    store = get_lease_store() if claim_ttl else None
+    if store and not store.try_acquire(lease_name, holder, claim_ttl):
+        report['status'] = 'claimed_elsewhere'
+        return report
+
+    try:
+        if assignment_ids is not None:
+            assignments = NotificationService.get_unreminded_assignments(assignment_ids, shard=(shard, shards))
+        else:
+            assignments = NotificationService.get_unreminded_assignments_due_within_days(days, shard=(shard, shards))
+        processed = NotificationService.queue_reminders(assignments) if assignments else []
+    finally:
+        if store:
+            store.release(lease_name, holder)
+
+    elapsed = time.monotonic() - started
+    report.update(
+        status='done',
+        found=len(assignments),
+        queued=len(processed),
+        processed_ids=processed,
+        seconds=round(elapsed, 3),
+        per_second=round(len(processed) / elapsed, 1) if elapsed > 0 else 0.0
+    )
+    return report
+
+class ShardedReminderEngine:
+    """Fans a reminder pass out over a pool of worker processes, one task per shard"""
+
+    def __init__(self, shards=4, workers=None, claim_ttl=300):
+        self.shards = shards
+        self.workers = workers or min(shards, os.cpu_count() or 1)
+        self.claim_ttl = claim_ttl
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._progress = {}
+        self._last_run = None
+        self._stats = {
+            'runs': 0,
+            'queued': 0,
+            'failed_shards': 0
+        }
+
+    def _get_executor(self):
+        if self._executor is None or self._pid != os.getpid():
+            # spawn: workers must not inherit the parent's threads, locks or pooled sockets
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context('spawn'))
+            self._pid = os.getpid()
+        return self._executor
+
+    def _reset_executor(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, days=None, assignment_ids=None):
+        """Run one pass over every shard and return the combined report"""
+        started = time.monotonic()
+        with self._lock:
+            self._progress = {shard: {'shard': shard, 'status': 'running'} for shard in range(self.shards)}
+
+        executor = self._get_executor()
+        futures = {
+            executor.submit(process_shard, shard, self.shards, days, assignment_ids, self.claim_ttl): shard
+            for shard in range(self.shards)
+        }
+        processed_ids = []
+        broken = False
+        for future in as_completed(futures):
+            shard = futures[future]
+            try:
+                report = future.result()
+            except Exception as e:
+                broken = broken or isinstance(e, BrokenProcessPool)
+                report = {'shard': shard, 'status': 'failed', 'error': str(e), 'found': 0, 'queued': 0}
+                print(f"❌ Reminder shard {shard}/{self.shards} failed: {e}")
+            else:
+                processed_ids.extend(report.pop('processed_ids'))
+                if report['status'] == 'done':
+                    print(f"✅ Reminder shard {shard}/{self.shards}: queued {report['queued']} "
+                          f"in {report['seconds']}s ({report['per_second']}/s)")
+            with self._lock:
+                self._progress[shard] = report
+        if broken:
+            self._reset_executor()
+
+        elapsed = time.monotonic() - started
+        with self._lock:
+            shard_reports = [self._progress[shard] for shard in range(self.shards)]
+            self._last_run = {
+                'shards': self.shards,
+                'workers': self.workers,
+                'queued': len(processed_ids),
+                'seconds': round(elapsed, 3),
+                'per_second': round(len(processed_ids) / elapsed, 1) if elapsed > 0 else 0.0,
+                'finished_at': time.time()
+            }
+            self._stats['runs'] += 1
+            self._stats['queued'] += len(processed_ids)
+            self._stats['failed_shards'] += sum(1 for r in shard_reports if r['status'] == 'failed')
+            result = dict(self._last_run, shard_reports=shard_reports, processed_ids=processed_ids)
+        print(f"📧 Sharded reminder pass queued {len(processed_ids)} reminder(s) in {elapsed:.2f}s")
+        return result
+
+    def metrics(self):
+        """Counters, the last pass's throughput and per-shard progress of the current/last pass"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['last_run'] = dict(self._last_run) if self._last_run else None
+            stats['progress'] = [dict(self._progress[shard]) for shard in sorted(self._progress)]
+        stats['shards'] = self.shards
+        stats['workers'] = self.workers
+        return stats
+
+    def shutdown(self):
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=True)
+        self._executor = None
+
+_engine = ShardedReminderEngine(
+    shards=Config.REMINDER_SHARDS,
+    workers=Config.REMINDER_SHARD_WORKERS,
+    claim_ttl=Config.REMINDER_SHARD_CLAIM_TTL
+)
+
+def get_reminder_engine():
+    """Return the process-wide sharded reminder engine"""
+    return _engine
+
+def main(argv):
+    days = float(argv[1]) if len(argv) > 1 else Config.REMINDER_LEAD_DAYS
+    result = get_reminder_engine().run(days=days)
+    for report in result['shard_reports']:
+        print(f"   shard {report['shard']}: {report['status']}, found {report['found']}, queued {report['queued']}")
+    get_reminder_engine().shutdown()
+    return 1 if any(r['status'] == 'failed' for r in result['shard_reports']) else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,103 @@
+"""Maintenance commands for the user_assignment_stats rollup.
+
+The rollup is kept current by the Assignment model on every write; these
+commands recompute it from the assignments table to detect or repair drift.
+
+Usage:
+    python rollups.py verify     Report users whose rollup differs from a recount
+    python rollups.py rebuild    Recompute every rollup row from scratch
+"""
+import sys
+from models import get_db, STATS_COUNTERS
+
+_RECOUNT_SQL = """
+    SELECT
+        user_id,
+        COUNT(*) AS total,
+        SUM(status = 'completed') AS completed,
+        SUM(status = 'pending') AS pending,
+        SUM(status = 'in-progress') AS in_progress,
+        SUM(status != 'completed' AND priority = 'high') AS high_priority,
+        SUM(status != 'completed' AND priority = 'medium') AS medium_priority,
+        SUM(status != 'completed' AND priority = 'low') AS low_priority,
+        SUM(status != 'completed' AND due_date IS NULL) AS no_due_date
+    FROM assignments
+    GROUP BY user_id
+"""
+
+
+def _normalise(row):
+    return {key: int(row[key] or 0) for key in STATS_COUNTERS}
+
+
+def verify_rollups():
+    """Compare every rollup row with a recount; return {user_id: {counter: (stored, actual)}}"""
+    with get_db() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(_RECOUNT_SQL)
+            actual = {row['user_id']: _normalise(row) for row in cursor.fetchall()}
+            cursor.execute(f"SELECT user_id, {', '.join(STATS_COUNTERS)} FROM user_assignment_stats")
+            stored = {row['user_id']: _normalise(row) for row in cursor.fetchall()}
+
+    zero = dict.fromkeys(STATS_COUNTERS, 0)
+    drift = {}
+    for user_id in set(actual) | set(stored):
+        expected = actual.get(user_id, zero)
+        current = stored.get(user_id, zero)
+        differences = {
+            key: (current[key], expected[key])
+            for key in STATS_COUNTERS if current[key] != expected[key]
+        }
+        if differences:
+            drift[user_id] = differences
+    return drift
+
+
+def rebuild_rollups():
+    """Recompute all rollup rows in one transaction; return the number of users recounted"""
+    columns = ', '.join(STATS_COUNTERS)
+    updates = ', '.join(f"{key} = VALUES({key})" for key in STATS_COUNTERS)
+    with get_db() as conn:
+        with conn.cursor() as cursor:
+            # Recounted statistics may differ from what clients hold; bump every data_version
+            cursor.execute(f"""
+                UPDATE user_assignment_stats
+                SET {', '.join(f'{key} = 0' for key in STATS_COUNTERS)}, data_version = data_version + 1
+            """)
+            cursor.execute(f"""
+                INSERT INTO user_assignment_stats (user_id, {columns}, data_version)
+                SELECT user_id, {columns}, 1 FROM ({_RECOUNT_SQL}) AS recount
+                ON DUPLICATE KEY UPDATE {updates}
+            """)
+            cursor.execute("SELECT COUNT(DISTINCT user_id) AS users FROM assignments")
+            users = cursor.fetchone()['users']
+            conn.commit()
+    return users
+
+
+def main(argv):
+    command = argv[1] if len(argv) > 1 else 'verify'
+
+    if command == 'verify':
+        drift = verify_rollups()
+        if not drift:
+            print("✅ All assignment statistics rollups match a recount")
+            return 0
+        print(f"❌ Rollup drift found for {len(drift)} user(s):")
+        for user_id, differences in sorted(drift.items()):
+            details = ', '.join(f"{key} stored={stored} actual={actual}"
+                                for key, (stored, actual) in differences.items())
+            print(f"   user {user_id}: {details}")
+        return 1
+
+    if command == 'rebuild':
+        users = rebuild_rollups()
+        print(f"✅ Rebuilt assignment statistics rollups for {users} user(s)")
+        return 0
+
+    print(__doc__)
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
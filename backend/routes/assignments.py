@@ -1,11 +1,33 @@
-from flask import Blueprint, request, jsonify, session
-from models import Assignment, EmailNotification
+from flask import Blueprint, request, jsonify, session, make_response
+from models import Assignment, EmailNotification, User
+from assignment_cache import get_assignment_cache
+from config import Config
 from email_service import EmailService
-from datetime import datetime, timedelta
-import pytz
+from timezones import convert_rows, due_date_bounds, get_timezone, local_to_utc, utc_to_local, DEFAULT_TIMEZONE
+from datetime import datetime
+import base64
+import hashlib
+import time
+import json
 
 assignments_bp = Blueprint('assignments', __name__)
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+VALID_PRIORITIES = ('low', 'medium', 'high')
+VALID_STATUSES = ('pending', 'in-progress', 'completed')
+
+# Column limits: assignments.title is VARCHAR(200), description is TEXT (bytes)
+MAX_TITLE_LENGTH = 200
+MAX_DESCRIPTION_BYTES = 65535
+
+# Items accepted by one bulk request
+MAX_BULK_ITEMS = 500
+
+# Statistics ETags change at least this often because the due-date buckets move with the clock
+STATISTICS_ETAG_SECONDS = 60
+
 def require_auth():
     """Decorator to require authentication"""
     try:
@@ -17,62 +39,240 @@ def require_auth():
         print(f"❌ Authentication error: {e}")
         return jsonify({'error': 'Authentication failed'}), 401
 
-def convert_utc_to_eat(utc_datetime_str):
-    """Convert UTC datetime string to EAT datetime string"""
+def get_request_timezone(user_id):
+    """The signed-in user's timezone name; read once per session, then kept in the session"""
+    timezone = session.get('timezone')
+    if timezone is None:
+        timezone = User.get_timezone(user_id) or DEFAULT_TIMEZONE
+        session['timezone'] = timezone
+    return timezone
+
+def encode_cursor(values):
+    """Encode keyset values into an opaque, URL-safe cursor string"""
+    payload = json.dumps([v.strftime('%Y-%m-%d %H:%M:%S') if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor; raises ValueError if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    return values
+
+def get_data_version(user_id):
+    """Version of the user's assignment data for ETags.
+    
+    While the assignment cache is active the response body comes from the
+    cache, which is keyed by the user's shared generation, so the ETag uses
+    that same generation and costs no database query. Otherwise the body is
+    read from the database and so is the version: the user's data_version
+    counter, bumped in every transaction that writes their assignments.
+    """
+    cache = get_assignment_cache()
+    if cache.is_enabled():
+        generation = cache.generation(user_id)
+        if generation is not None:
+            return f"g{generation}"
+    return f"d{Assignment.get_data_version(user_id)}"
+
+def make_etag(*parts):
+    """Opaque validator for the given parts"""
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()[:32]
+
+def set_cache_headers(response, etag):
+    """Weak ETag plus headers for per-user, cookie-authenticated responses.
+    
+    ``private`` keeps shared caches from storing it, ``no-cache`` makes the
+    browser revalidate with If-None-Match on every use, and Vary keeps
+    responses for different sessions and CORS origins apart.
+    """
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.vary.update(('Cookie', 'Origin'))
+    return response
+
+def not_modified(etag):
+    """A 304 response if the request's If-None-Match matches ``etag``, else None"""
+    if request.if_none_match.contains_weak(etag):
+        return set_cache_headers(make_response('', 304), etag)
+    return None
+
+def parse_assignment_fields(data, tz):
+    """Validate an assignment payload and convert its due date from ``tz`` to UTC.
+    
+    Returns (fields, None) or (None, error message).
+    """
+    if not isinstance(data, dict):
+        return None, 'Assignment must be an object'
+    
+    # Validate required fields
+    for field in ('title', 'due_date'):
+        if not data.get(field):
+            return None, f'{field} is required'
+    
+    title = data['title']
+    description = data.get('description') or ''
+    due_date = data['due_date']
+    priority = data.get('priority', 'medium')
+    status = data.get('status', 'pending')
+    
+    if not isinstance(title, str) or not title.strip():
+        return None, 'title must be a non-empty string'
+    title = title.strip()
+    if len(title) > MAX_TITLE_LENGTH:
+        return None, f'title must be at most {MAX_TITLE_LENGTH} characters'
+    
+    if not isinstance(description, str):
+        return None, 'description must be a string'
+    description = description.strip()
+    if len(description.encode('utf-8')) > MAX_DESCRIPTION_BYTES:
+        return None, 'description is too long'
+    
+    # Convert local time to UTC for storage
+    # due_date comes as "YYYY-MM-DD HH:MM" from frontend (user's timezone)
     try:
-        if not utc_datetime_str:
-            return None
+        due_date_utc = local_to_utc(due_date, tz)
+    except (TypeError, ValueError):
+        return None, f'Invalid date format: {due_date}. Expected: YYYY-MM-DD HH:MM'
+    
+    if priority not in VALID_PRIORITIES:
+        return None, 'Invalid priority value'
+    
+    if status not in VALID_STATUSES:
+        return None, 'Invalid status value'
+    
+    return {
+        'title': title,
+        'description': description,
+        'due_date': due_date_utc,
+        'priority': priority,
+        'status': status
+    }, None
+
+@assignments_bp.route('/assignments', methods=['GET'])
+def get_assignments():
+    """Get assignments for the authenticated user.
+    
+    Query parameters:
+        view    - 'summary' omits description and notification bookkeeping columns
+        limit   - page size; enables keyset pagination ordered by (due_date, id)
+        cursor  - next_cursor from the previous page
+    
+    Without limit/cursor the full list is returned as a JSON array.
+    """
+    try:
+        user_id = require_auth()
+        if isinstance(user_id, tuple):  # Error response
+            return user_id
+        
+        view = request.args.get('view', 'full')
+        if view not in ('full', 'summary'):
+            return jsonify({'error': 'Invalid view value'}), 400
+        summary = view == 'summary'
+        
+        limit = request.args.get('limit')
+        cursor = request.args.get('cursor')
+        
+        timezone = get_request_timezone(user_id)
+        etag = make_etag('assignments', request.query_string, get_data_version(user_id), timezone)
+        response = not_modified(etag)
+        if response:
+            return response
+        
+        if limit is None and cursor is None:
+            assignments = Assignment.get_all_assignments(user_id, summary=summary)
             
-        # Handle different datetime formats
-        if isinstance(utc_datetime_str, str):
-            # Try different formats
-            for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d']:
-                try:
-                    utc_dt = datetime.strptime(utc_datetime_str, fmt)
-                    break
-                except ValueError:
-                    continue
-            else:
-                # If no format matches, return original
-                print(f"Could not parse datetime: {utc_datetime_str}")
-                return utc_datetime_str
-        else:
-            # If it's already a datetime object
-            utc_dt = utc_datetime_str
+            # Convert UTC times to the user's timezone for display
+            convert_rows(assignments, timezone)
             
-        # Make it timezone-aware if it isn't already
-        if utc_dt.tzinfo is None:
-            utc_dt = pytz.UTC.localize(utc_dt)
+            return set_cache_headers(jsonify(assignments), etag), 200
         
-        # Convert to EAT
-        eat_tz = pytz.timezone('Africa/Nairobi')
-        eat_dt = utc_dt.astimezone(eat_tz)
-        
-        # Return in EAT format
-        return eat_dt.strftime('%Y-%m-%d %H:%M:%S')
+        try:
+            limit = int(limit) if limit is not None else DEFAULT_PAGE_SIZE
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+        
+        after = None
+        if cursor:
+            try:
+                after_due_date, after_id = decode_cursor(cursor)
+                after = (datetime.strptime(after_due_date, '%Y-%m-%d %H:%M:%S'), int(after_id))
+            except (ValueError, TypeError):
+                return jsonify({'error': 'Invalid cursor'}), 400
+        
+        assignments, has_more = Assignment.get_assignments_page(user_id, limit, after, summary=summary)
+        
+        next_cursor = None
+        if has_more:
+            last = assignments[-1]
+            next_cursor = encode_cursor([last['due_date'], last['id']])
+        
+        # Convert UTC times to the user's timezone for display
+        convert_rows(assignments, timezone)
+        
+        return set_cache_headers(jsonify({
+            'assignments': assignments,
+            'next_cursor': next_cursor,
+            'has_more': has_more
+        }), etag), 200
     except Exception as e:
-        print(f"Error converting UTC to EAT: {e}")
-        # If conversion fails, return original
-        return utc_datetime_str
+        return jsonify({'error': 'Failed to fetch assignments'}), 500
 
-@assignments_bp.route('/assignments', methods=['GET'])
-def get_assignments():
-    """Get all assignments for the authenticated user"""
+@assignments_bp.route('/assignments/changes', methods=['GET'])
+def get_assignment_changes():
+    """Get the authenticated user's assignments changed since a sync token.
+    
+    Query parameters:
+        since   - sync_token from the previous response; omit for a full sync
+        view    - 'summary' as for GET /assignments
+    
+    Returns {assignments, deleted, sync_token, full}. With ``full`` the client
+    replaces its list with ``assignments``; otherwise it upserts them by id and
+    drops the ids in ``deleted``. Rows may repeat across calls.
+    """
     try:
         user_id = require_auth()
         if isinstance(user_id, tuple):  # Error response
             return user_id
         
-        assignments = Assignment.get_all_assignments(user_id)
+        view = request.args.get('view', 'full')
+        if view not in ('full', 'summary'):
+            return jsonify({'error': 'Invalid view value'}), 400
+        
+        since = None
+        token = request.args.get('since')
+        if token:
+            try:
+                since = datetime.strptime(decode_cursor(token)[0], '%Y-%m-%d %H:%M:%S')
+            except (ValueError, TypeError, IndexError):
+                return jsonify({'error': 'Invalid sync token'}), 400
         
-        # Convert UTC times to EAT for display
-        for assignment in assignments:
-            if assignment['due_date']:
-                assignment['due_date'] = convert_utc_to_eat(assignment['due_date'])
+        assignments, deleted, next_since, full = Assignment.get_changes(
+            user_id, since, summary=view == 'summary', retention_days=Config.TOMBSTONE_RETENTION_DAYS
+        )
         
-        return jsonify(assignments), 200
+        # Convert UTC times to the user's timezone for display
+        convert_rows(assignments, get_request_timezone(user_id))
+        
+        response = jsonify({
+            'assignments': assignments,
+            'deleted': deleted,
+            'sync_token': encode_cursor([next_since]),
+            'full': full
+        })
+        response.cache_control.private = True
+        response.cache_control.no_store = True
+        return response, 200
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch assignments'}), 500
+        print(f"Error in get_assignment_changes: {e}")
+        return jsonify({'error': 'Failed to fetch assignment changes'}), 500
 
 @assignments_bp.route('/assignments/<int:assignment_id>', methods=['GET'])
 def get_assignment(assignment_id):
@@ -82,15 +282,20 @@ def get_assignment(assignment_id):
         if isinstance(user_id, tuple):  # Error response
             return user_id
         
+        timezone = get_request_timezone(user_id)
+        etag = make_etag('assignment', assignment_id, get_data_version(user_id), timezone)
+        response = not_modified(etag)
+        if response:
+            return response
+        
         assignment = Assignment.get_assignment_by_id(assignment_id, user_id)
         if not assignment:
             return jsonify({'error': 'Assignment not found'}), 404
         
-        # Convert UTC time to EAT for display
-        if assignment['due_date']:
-            assignment['due_date'] = convert_utc_to_eat(assignment['due_date'])
+        # Convert UTC time to the user's timezone for display
+        assignment['due_date'] = utc_to_local(assignment['due_date'], timezone)
         
-        return jsonify(assignment), 200
+        return set_cache_headers(jsonify(assignment), etag), 200
     except Exception as e:
         return jsonify({'error': 'Failed to fetch assignment'}), 500
 
@@ -102,51 +307,19 @@ def create_assignment():
         if isinstance(user_id, tuple):  # Error response
             return user_id
         
-        data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['title', 'due_date']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({'error': f'{field} is required'}), 400
-        
-        title = data['title'].strip()
-        description = data.get('description', '').strip()
-        due_date = data['due_date']
-        priority = data.get('priority', 'medium')
-        status = data.get('status', 'pending')
-        
-        # Convert EAT time to UTC for storage
-        # due_date comes as "YYYY-MM-DD HH:MM" from frontend (EAT timezone)
-        try:
-            # Parse the EAT datetime string
-            eat_tz = pytz.timezone('Africa/Nairobi')  # EAT timezone
-            local_dt = datetime.strptime(due_date, '%Y-%m-%d %H:%M')
-            # Make it timezone-aware in EAT
-            local_dt = eat_tz.localize(local_dt)
-            # Convert to UTC for storage
-            utc_dt = local_dt.astimezone(pytz.UTC)
-            due_date_utc = utc_dt.strftime('%Y-%m-%d %H:%M:%S')
-        except Exception as e:
-            return jsonify({'error': f'Invalid date format: {due_date}. Expected: YYYY-MM-DD HH:MM'}), 400
-        
-        # Validate priority and status
-        valid_priorities = ['low', 'medium', 'high']
-        valid_statuses = ['pending', 'in-progress', 'completed']
-        
-        if priority not in valid_priorities:
-            return jsonify({'error': 'Invalid priority value'}), 400
-        
-        if status not in valid_statuses:
-            return jsonify({'error': 'Invalid status value'}), 400
+        timezone = get_request_timezone(user_id)
+        fields, error = parse_assignment_fields(request.get_json(), timezone)
+        if error:
+            return jsonify({'error': error}), 400
         
         # Create assignment with UTC time
-        assignment_id = Assignment.create_assignment(
-            user_id, title, description, due_date_utc, priority, status
+        assignment = Assignment.create_assignment(
+            user_id, fields['title'], fields['description'], fields['due_date'],
+            fields['priority'], fields['status']
         )
         
-        # Get the created assignment
-        assignment = Assignment.get_assignment_by_id(assignment_id, user_id)
+        # Convert UTC time to the user's timezone for display
+        convert_rows([assignment], timezone)
         
         return jsonify({
             'message': 'Assignment created successfully',
@@ -164,58 +337,22 @@ def update_assignment(assignment_id):
         if isinstance(user_id, tuple):  # Error response
             return user_id
         
-        data = request.get_json()
-        
-        # Check if assignment exists and belongs to user
-        existing_assignment = Assignment.get_assignment_by_id(assignment_id, user_id)
-        if not existing_assignment:
-            return jsonify({'error': 'Assignment not found'}), 404
-        
-        # Validate required fields
-        required_fields = ['title', 'due_date']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({'error': f'{field} is required'}), 400
+        timezone = get_request_timezone(user_id)
+        fields, error = parse_assignment_fields(request.get_json(), timezone)
+        if error:
+            return jsonify({'error': error}), 400
         
-        title = data['title'].strip()
-        description = data.get('description', '').strip()
-        due_date = data['due_date']
-        priority = data.get('priority', 'medium')
-        status = data.get('status', 'pending')
-        
-        # Convert EAT time to UTC for storage
-        try:
-            # Parse the EAT datetime string
-            eat_tz = pytz.timezone('Africa/Nairobi')  # EAT timezone
-            local_dt = datetime.strptime(due_date, '%Y-%m-%d %H:%M')
-            # Make it timezone-aware in EAT
-            local_dt = eat_tz.localize(local_dt)
-            # Convert to UTC for storage
-            utc_dt = local_dt.astimezone(pytz.UTC)
-            due_date_utc = utc_dt.strftime('%Y-%m-%d %H:%M:%S')
-        except Exception as e:
-            return jsonify({'error': f'Invalid date format: {due_date}. Expected: YYYY-MM-DD HH:MM'}), 400
-        
-        # Validate priority and status
-        valid_priorities = ['low', 'medium', 'high']
-        valid_statuses = ['pending', 'in-progress', 'completed']
-        
-        if priority not in valid_priorities:
-            return jsonify({'error': 'Invalid priority value'}), 400
-        
-        if status not in valid_statuses:
-            return jsonify({'error': 'Invalid status value'}), 400
-        
-        # Update assignment with UTC time
-        success = Assignment.update_assignment(
-            assignment_id, user_id, title, description, due_date_utc, priority, status
+        # Update assignment with UTC time; checks ownership in the same transaction
+        assignment = Assignment.update_assignment(
+            assignment_id, user_id, fields['title'], fields['description'], fields['due_date'],
+            fields['priority'], fields['status']
         )
         
-        if not success:
-            return jsonify({'error': 'Failed to update assignment'}), 500
+        if not assignment:
+            return jsonify({'error': 'Assignment not found'}), 404
         
-        # Get the updated assignment
-        assignment = Assignment.get_assignment_by_id(assignment_id, user_id)
+        # Convert UTC time to the user's timezone for display
+        convert_rows([assignment], timezone)
         
         return jsonify({
             'message': 'Assignment updated successfully',
@@ -236,25 +373,24 @@ def update_assignment_status(assignment_id):
         if isinstance(user_id, tuple):  # Error response
             return user_id
         
-        data = request.get_json()
+        data = request.get_json(silent=True)
         
-        if not data.get('status'):
+        if not isinstance(data, dict) or not data.get('status'):
             return jsonify({'error': 'Status is required'}), 400
         
         status = data['status']
-        valid_statuses = ['pending', 'in-progress', 'completed']
         
-        if status not in valid_statuses:
+        if status not in VALID_STATUSES:
             return jsonify({'error': 'Invalid status value'}), 400
         
         # Update status
-        success = Assignment.update_status(assignment_id, user_id, status)
+        assignment = Assignment.update_status(assignment_id, user_id, status)
         
-        if not success:
+        if not assignment:
             return jsonify({'error': 'Assignment not found or update failed'}), 404
         
-        # Get the updated assignment
-        assignment = Assignment.get_assignment_by_id(assignment_id, user_id)
+        # Convert UTC time to the user's timezone for display
+        convert_rows([assignment], get_request_timezone(user_id))
         
         return jsonify({
             'message': 'Assignment status updated successfully',
@@ -272,22 +408,168 @@ def delete_assignment(assignment_id):
         if isinstance(user_id, tuple):  # Error response
             return user_id
         
-        # Check if assignment exists and belongs to user
-        existing_assignment = Assignment.get_assignment_by_id(assignment_id, user_id)
-        if not existing_assignment:
+        # Delete assignment; checks ownership in the same transaction
+        if not Assignment.delete_assignment(assignment_id, user_id):
             return jsonify({'error': 'Assignment not found'}), 404
         
-        # Delete assignment
-        success = Assignment.delete_assignment(assignment_id, user_id)
-        
-        if not success:
-            return jsonify({'error': 'Failed to delete assignment'}), 500
-        
         return jsonify({'message': 'Assignment deleted successfully'}), 200
         
     except Exception as e:
         return jsonify({'error': 'Failed to delete assignment'}), 500
 
+def get_bulk_items(data, key):
+    """The list under ``key`` of a bulk request body; returns (items, None) or (None, error response)"""
+    items = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({'error': f'{key} must be a non-empty list'}), 400)
+    if len(items) > MAX_BULK_ITEMS:
+        return None, (jsonify({'error': f'At most {MAX_BULK_ITEMS} items per request'}), 400)
+    return items, None
+
+def parse_bulk_id(item, seen):
+    """Assignment id of a bulk item (an id or an object with "id"); returns (id, None) or (None, error message)"""
+    assignment_id = item.get('id') if isinstance(item, dict) else item
+    if isinstance(assignment_id, bool) or not isinstance(assignment_id, int):
+        return None, 'id must be an integer'
+    if assignment_id in seen:
+        return None, 'Duplicate id'
+    seen.add(assignment_id)
+    return assignment_id, None
+
+def bulk_response(results, success_status):
+    """Per-item results; ``success_status`` if every item succeeded, otherwise 207 Multi-Status"""
+    succeeded = sum(1 for result in results if result['status'] < 400)
+    return jsonify({
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'results': results
+    }), success_status if succeeded == len(results) else 207
+
+@assignments_bp.route('/assignments/bulk', methods=['POST'])
+def create_assignments_bulk():
+    """Create many assignments in one transaction.
+    
+    Body: {"assignments": [<assignment>, ...]}, each item as for POST /assignments.
+    Invalid items are reported and skipped; the valid ones are created together.
+    """
+    try:
+        user_id = require_auth()
+        if isinstance(user_id, tuple):  # Error response
+            return user_id
+        
+        items, error_response = get_bulk_items(request.get_json(silent=True), 'assignments')
+        if error_response:
+            return error_response
+        
+        # Resolve the user's timezone once for the whole payload
+        timezone = get_request_timezone(user_id)
+        tz = get_timezone(timezone)
+        results = [None] * len(items)
+        valid = []
+        for index, item in enumerate(items):
+            fields, error = parse_assignment_fields(item, tz)
+            if error:
+                results[index] = {'index': index, 'status': 400, 'error': error}
+            else:
+                valid.append((index, fields))
+        
+        rows = Assignment.create_assignments(user_id, [fields for _, fields in valid])
+        # Convert UTC times to the user's timezone for display
+        convert_rows(rows, tz)
+        for (index, _), assignment in zip(valid, rows):
+            results[index] = {'index': index, 'status': 201, 'assignment': assignment}
+        
+        return bulk_response(results, 201)
+        
+    except Exception as e:
+        print(f"Error creating assignments in bulk: {e}")
+        return jsonify({'error': 'Failed to create assignments'}), 500
+
+@assignments_bp.route('/assignments/bulk', methods=['PATCH'])
+def update_assignment_statuses_bulk():
+    """Update the status of many assignments in one transaction.
+    
+    Body: {"updates": [{"id": 1, "status": "completed"}, ...]}
+    """
+    try:
+        user_id = require_auth()
+        if isinstance(user_id, tuple):  # Error response
+            return user_id
+        
+        items, error_response = get_bulk_items(request.get_json(silent=True), 'updates')
+        if error_response:
+            return error_response
+        
+        results = [None] * len(items)
+        statuses = {}
+        indexes = {}
+        seen = set()
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                assignment_id, error = None, 'Update must be an object'
+            else:
+                assignment_id, error = parse_bulk_id(item, seen)
+            if not error and item.get('status') not in VALID_STATUSES:
+                error = 'Invalid status value'
+            if error:
+                results[index] = {'index': index, 'status': 400, 'error': error}
+            else:
+                statuses[assignment_id] = item['status']
+                indexes[assignment_id] = index
+        
+        updated = Assignment.update_statuses(user_id, statuses)
+        # Convert UTC times to the user's timezone for display
+        convert_rows(list(updated.values()), get_request_timezone(user_id))
+        for assignment_id, index in indexes.items():
+            if assignment_id in updated:
+                results[index] = {'index': index, 'status': 200, 'assignment': updated[assignment_id]}
+            else:
+                results[index] = {'index': index, 'status': 404, 'error': 'Assignment not found'}
+        
+        return bulk_response(results, 200)
+        
+    except Exception as e:
+        print(f"Error updating assignments in bulk: {e}")
+        return jsonify({'error': 'Failed to update assignments'}), 500
+
+@assignments_bp.route('/assignments/bulk', methods=['DELETE'])
+def delete_assignments_bulk():
+    """Delete many assignments in one transaction.
+    
+    Body: {"ids": [1, 2, ...]}
+    """
+    try:
+        user_id = require_auth()
+        if isinstance(user_id, tuple):  # Error response
+            return user_id
+        
+        items, error_response = get_bulk_items(request.get_json(silent=True), 'ids')
+        if error_response:
+            return error_response
+        
+        results = [None] * len(items)
+        indexes = {}
+        seen = set()
+        for index, item in enumerate(items):
+            assignment_id, error = parse_bulk_id(item, seen)
+            if error:
+                results[index] = {'index': index, 'status': 400, 'error': error}
+            else:
+                indexes[assignment_id] = index
+        
+        deleted = Assignment.delete_assignments(user_id, list(indexes))
+        for assignment_id, index in indexes.items():
+            if assignment_id in deleted:
+                results[index] = {'index': index, 'status': 200, 'id': assignment_id}
+            else:
+                results[index] = {'index': index, 'status': 404, 'error': 'Assignment not found'}
+        
+        return bulk_response(results, 200)
+        
+    except Exception as e:
+        print(f"Error deleting assignments in bulk: {e}")
+        return jsonify({'error': 'Failed to delete assignments'}), 500
+
 @assignments_bp.route('/assignments/due-soon', methods=['GET'])
 def get_due_assignments():
     """Get assignments that are due soon (for the authenticated user)"""
@@ -296,16 +578,17 @@ def get_due_assignments():
         if isinstance(user_id, tuple):  # Error response
             return user_id
         
-        # Get assignments due in the next 24 hours
-        assignments = Assignment.get_due_assignments()
-        
-        # Filter for current user only
-        user_assignments = [a for a in assignments if a['user_id'] == user_id]
+        # Get this user's assignments due in the next 24 hours
+        user_assignments = Assignment.get_due_assignments_for_user(user_id)
         
         return jsonify(user_assignments), 200
     except Exception as e:
         return jsonify({'error': 'Failed to fetch due assignments'}), 500
 
+def get_due_date_bounds(tz=None):
+    """Due-date bucket edges for "now" in the given timezone (default EAT), as naive UTC datetimes"""
+    return due_date_bounds(tz)
+
 @assignments_bp.route('/assignments/statistics', methods=['GET'])
 def get_assignment_statistics():
     """Get assignment statistics for the authenticated user"""
@@ -314,59 +597,20 @@ def get_assignment_statistics():
         if isinstance(user_id, tuple):  # Error response
             return user_id
         
-        assignments = Assignment.get_all_assignments(user_id)
-        
-        # Calculate statistics
-        total = len(assignments)
-        completed = len([a for a in assignments if a['status'] == 'completed'])
-        pending = len([a for a in assignments if a['status'] == 'pending'])
-        in_progress = len([a for a in assignments if a['status'] == 'in-progress'])
-        
-        # Priority breakdown
-        high_priority = len([a for a in assignments if a['priority'] == 'high' and a['status'] != 'completed'])
-        medium_priority = len([a for a in assignments if a['priority'] == 'medium' and a['status'] != 'completed'])
-        low_priority = len([a for a in assignments if a['priority'] == 'low' and a['status'] != 'completed'])
-        
-        # Overdue assignments (using EAT timezone)
-        now = datetime.now()
-        overdue = 0
-        due_today = 0
-        due_week = 0
-        due_next_week = 0
-        no_due_date = 0
-        
-        for assignment in assignments:
-            if assignment['status'] == 'completed':
-                continue
-                
-            if assignment['due_date']:
-                try:
-                    # Convert UTC to EAT for comparison
-                    due_date_eat = convert_utc_to_eat(assignment['due_date'])
-                    due_datetime = datetime.strptime(due_date_eat, '%Y-%m-%d %H:%M:%S')
-                    
-                    # Check if overdue
-                    if due_datetime < now:
-                        overdue += 1
-                    
-                    # Check due date categories
-                    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-                    today_end = today_start + timedelta(days=1)
-                    week_end = today_start + timedelta(days=7)
-                    next_week_end = today_start + timedelta(days=14)
-                    
-                    if today_start <= due_datetime < today_end:
-                        due_today += 1
-                    elif today_start <= due_datetime < week_end:
-                        due_week += 1
-                    elif week_end <= due_datetime < next_week_end:
-                        due_next_week += 1
-                except Exception as e:
-                    # If date parsing fails, skip this assignment for date calculations
-                    print(f"Error parsing due_date for assignment {assignment.get('id', 'unknown')}: {e}")
-                    continue
-            else:
-                no_due_date += 1
+        # Overdue and due-date buckets move with the clock, so the ETag also changes every minute
+        timezone = get_request_timezone(user_id)
+        time_bucket = int(time.time() // STATISTICS_ETAG_SECONDS)
+        etag = make_etag('statistics', get_data_version(user_id), timezone, time_bucket)
+        response = not_modified(etag)
+        if response:
+            return response
+        
+        # Bucket edges are computed once in the user's timezone and compared against UTC due dates in SQL
+        counts = Assignment.get_statistics(user_id, **get_due_date_bounds(timezone))
+        
+        total = counts['total']
+        completed = counts['completed']
+        overdue = counts['overdue']
         
         # Calculate rates
         completion_rate = round((completed / total * 100) if total > 0 else 0, 1)
@@ -375,21 +619,21 @@ def get_assignment_statistics():
         statistics = {
             'total': total,
             'completed': completed,
-            'pending': pending,
-            'in_progress': in_progress,
+            'pending': counts['pending'],
+            'in_progress': counts['in_progress'],
             'overdue': overdue,
-            'high_priority': high_priority,
-            'medium_priority': medium_priority,
-            'low_priority': low_priority,
-            'due_today': due_today,
-            'due_week': due_week,
-            'due_next_week': due_next_week,
-            'no_due_date': no_due_date,
+            'high_priority': counts['high_priority'],
+            'medium_priority': counts['medium_priority'],
+            'low_priority': counts['low_priority'],
+            'due_today': counts['due_today'],
+            'due_week': counts['due_week'],
+            'due_next_week': counts['due_next_week'],
+            'no_due_date': counts['no_due_date'],
             'completion_rate': completion_rate,
             'ontime_rate': ontime_rate
         }
         
-        return jsonify(statistics), 200
+        return set_cache_headers(jsonify(statistics), etag), 200
     except Exception as e:
         print(f"Error in get_assignment_statistics: {e}")
         import traceback
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, session, current_app
 from werkzeug.security import generate_password_hash
 from models import User
 from email_service import EmailService
+from timezones import DEFAULT_TIMEZONE
 import re
 
 auth_bp = Blueprint('auth', __name__)
@@ -79,6 +80,7 @@ def login():
         session['user_id'] = user['id']
         session['user_email'] = user['email']
         session['user_name'] = f"{user['first_name']} {user['last_name']}"
+        session['timezone'] = user.get('timezone') or DEFAULT_TIMEZONE
         
         # Force session to be saved
         session.modified = True
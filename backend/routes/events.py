@@ -0,0 +1,87 @@
+import json
+import time
+from flask import Blueprint, Response, request, jsonify, session
+from config import Config
+from event_bus import get_event_bus
+from routes.assignments import get_request_timezone
+from timezones import utc_to_local
+
+events_bp = Blueprint('events', __name__)
+
+# Reconnect delay suggested to EventSource clients, in milliseconds
+RETRY_MS = 3000
+
+def format_event(event, timezone):
+    """One SSE frame; assignment due dates are shown in the user's timezone"""
+    data = event['data']
+    assignment = data.get('assignment') if isinstance(data, dict) else None
+    if assignment and assignment.get('due_date'):
+        # Events are shared by every stream of the user; convert a copy
+        data = dict(data, assignment=dict(assignment, due_date=utc_to_local(assignment['due_date'], timezone)))
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def stream_events(bus, user_id, timezone, last_event_id):
+    """Yield SSE frames until the stream's lifetime ends or the client goes away.
+
+    The subscription is taken when streaming starts and before the replay, so
+    nothing published in between is lost; events delivered by the replay are
+    skipped when they arrive live as well. Idle streams get a comment frame
+    every EVENTS_HEARTBEAT seconds, which keeps proxies from closing them and
+    lets the server notice disconnected clients.
+    """
+    subscription = bus.subscribe(user_id)
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        replayed = set()
+        if last_event_id:
+            events, complete = bus.replay(user_id, last_event_id)
+            if not complete:
+                # Events were missed; the client reloads (e.g. via /api/assignments/changes)
+                yield "event: resync\ndata: {}\n\n"
+            for event in events:
+                replayed.add(event['id'])
+                yield format_event(event, timezone)
+
+        deadline = time.monotonic() + Config.EVENTS_MAX_STREAM
+        while time.monotonic() < deadline:
+            events = subscription.get(Config.EVENTS_HEARTBEAT)
+            if subscription.overflowed:
+                break
+            if not events:
+                yield ": heartbeat\n\n"
+                continue
+            for event in events:
+                if event['id'] not in replayed:
+                    yield format_event(event, timezone)
+    finally:
+        subscription.close()
+
+@events_bp.route('/events', methods=['GET'])
+def get_events():
+    """Server-Sent Events stream of the authenticated user's assignment changes and reminders.
+
+    Event types: assignment.created, assignment.updated, assignment.deleted,
+    reminder.sent and resync. Reconnecting clients send Last-Event-ID (or
+    ?last_event_id=) and receive the events they missed.
+    """
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Authentication required'}), 401
+
+    # The session is not available once streaming starts
+    timezone = get_request_timezone(user_id)
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+
+    try:
+        bus = get_event_bus()
+    except Exception as e:
+        print(f"❌ Could not open event stream: {e}")
+        return jsonify({'error': 'Event stream unavailable'}), 503
+
+    response = Response(
+        stream_events(bus, user_id, timezone, last_event_id),
+        mimetype='text/event-stream'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify, session
-from models import Assignment, EmailNotification
+from models import Assignment, EmailNotification, User
 from notification_service import NotificationService
+from routes.assignments import get_due_date_bounds, get_request_timezone
+from timezones import canonical_timezone
 from datetime import datetime
 
 notifications_bp = Blueprint('notifications', __name__)
@@ -62,9 +64,11 @@ def check_today_notifications():
         if isinstance(user_id, tuple):  # Error response
             return user_id
         
-        # Get assignments due today for this user
-        today_assignments = Assignment.get_assignments_due_today()
-        user_assignments = [a for a in today_assignments if a['user_id'] == user_id]
+        # Get assignments due today (in the user's timezone) for this user
+        bounds = get_due_date_bounds(get_request_timezone(user_id))
+        user_assignments = Assignment.get_assignments_due_today_for_user(
+            user_id, bounds['today_start'], bounds['today_end']
+        )
         
         if not user_assignments:
             return jsonify({
@@ -72,17 +76,16 @@ def check_today_notifications():
                 'assignments': []
             }), 200
         
-        # Send notifications for each assignment
-        sent_notifications = []
-        for assignment in user_assignments:
-            if not NotificationService.has_sent_notification_today(assignment['id']):
-                success = NotificationService.send_daily_reminder(assignment)
-                if success:
-                    sent_notifications.append({
-                        'assignment_id': assignment['id'],
-                        'title': assignment['title'],
-                        'due_date': assignment['due_date']
-                    })
+        # Send notifications for assignments not reminded yet today
+        reminded_today = NotificationService.get_reminded_today([a['id'] for a in user_assignments])
+        to_send = [a for a in user_assignments if a['id'] not in reminded_today]
+        processed_ids = set(NotificationService.send_reminder_batch(to_send)) if to_send else set()
+        
+        sent_notifications = [{
+            'assignment_id': assignment['id'],
+            'title': assignment['title'],
+            'due_date': assignment['due_date']
+        } for assignment in to_send if assignment['id'] in processed_ids]
         
         return jsonify({
             'message': f'Processed {len(user_assignments)} assignments due today',
@@ -146,13 +149,12 @@ def get_notification_settings():
         if isinstance(user_id, tuple):  # Error response
             return user_id
         
-        # For now, return default settings
-        # In a real app, you'd store these in the database
+        # Only the timezone is stored so far; the rest are defaults
         settings = {
             'email_notifications': True,
             'daily_reminders': True,
             'reminder_time': '09:00',  # 9 AM
-            'timezone': 'EAT'
+            'timezone': get_request_timezone(user_id)
         }
         
         return jsonify(settings), 200
@@ -174,10 +176,20 @@ def update_notification_settings():
         email_notifications = data.get('email_notifications', True)
         daily_reminders = data.get('daily_reminders', True)
         reminder_time = data.get('reminder_time', '09:00')
-        timezone = data.get('timezone', 'EAT')
+        timezone = data.get('timezone')
+        
+        # The timezone is stored per user and used for all due date display and input
+        if timezone is not None:
+            try:
+                timezone = canonical_timezone(timezone)
+            except ValueError:
+                return jsonify({'error': f'Unknown timezone: {timezone}'}), 400
+            User.update_timezone(user_id, timezone)
+            session['timezone'] = timezone
+        else:
+            timezone = get_request_timezone(user_id)
         
-        # In a real app, you'd save these to the database
-        # For now, just return success
+        # The other settings are not stored yet
         settings = {
             'email_notifications': email_notifications,
             'daily_reminders': daily_reminders,
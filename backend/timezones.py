@@ -0,0 +1,134 @@
+"""Conversion between stored UTC datetimes and users' local time.
+
+Due dates are stored as naive UTC datetimes. The API shows them, and accepts
+them, in the user's timezone (``users.timezone``, EAT when unset). tzinfo
+objects are resolved once per name and cached; pytz is imported on first use.
+"""
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_TIMEZONE = 'Africa/Nairobi'
+
+# Short names accepted from clients in addition to IANA names
+TIMEZONE_ALIASES = {
+    'EAT': 'Africa/Nairobi',
+    'UTC': 'UTC'
+}
+
+DISPLAY_FORMAT = '%Y-%m-%d %H:%M:%S'
+INPUT_FORMAT = '%Y-%m-%d %H:%M'
+
+_timezones = {}
+_transitions = {}
+
+def utc_now():
+    """Current time as a naive UTC datetime, matching stored due dates"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def canonical_timezone(name):
+    """IANA name for ``name`` (aliases resolved); raises ValueError if unknown"""
+    name = TIMEZONE_ALIASES.get(name or DEFAULT_TIMEZONE, name or DEFAULT_TIMEZONE)
+    get_timezone(name)
+    return name
+
+def get_timezone(name=None):
+    """Cached tzinfo for a timezone name or alias (default EAT); raises ValueError if unknown"""
+    key = name or DEFAULT_TIMEZONE
+    tz = _timezones.get(key)
+    if tz is None:
+        import pytz
+        try:
+            tz = pytz.timezone(TIMEZONE_ALIASES.get(key, key))
+        except pytz.UnknownTimeZoneError:
+            raise ValueError(f"Unknown timezone: {name}")
+        _timezones[key] = tz
+    return tz
+
+def parse_datetime(value):
+    """Parse a stored/legacy datetime string; returns None if it is not one"""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+def utc_to_local(value, tz=None):
+    """Convert a naive UTC datetime (or datetime string) to a local 'YYYY-MM-DD HH:MM:SS' string.
+
+    Unparseable strings and empty values are returned unchanged.
+    """
+    if not value:
+        return value
+    tz = get_timezone(tz) if tz is None or isinstance(tz, str) else tz
+    if isinstance(value, str):
+        parsed = parse_datetime(value)
+        if parsed is None:
+            return value
+        value = parsed
+    if value.tzinfo is not None:
+        return value.astimezone(tz).strftime(DISPLAY_FORMAT)
+    # fromutc() on a naive UTC value tagged with the zone is pytz's cheapest conversion
+    return tz.fromutc(value.replace(tzinfo=tz)).strftime(DISPLAY_FORMAT)
+
+def _utc_transitions(tz):
+    """(transition times, offsets) of a pytz zone, both in UTC order; cached per zone"""
+    cached = _transitions.get(tz.zone)
+    if cached is None:
+        times = getattr(tz, '_utc_transition_times', None)
+        if times:
+            cached = (times, [info[0] for info in tz._transition_info])
+        else:
+            # Fixed-offset zones (UTC, StaticTzInfo)
+            cached = ([datetime.min], [tz.utcoffset(datetime(2000, 1, 1))])
+        _transitions[tz.zone] = cached
+    return cached
+
+def convert_rows(rows, tz=None, fields=('due_date',)):
+    """Convert ``fields`` of every row from UTC to local strings in place; returns rows.
+
+    The timezone's UTC offset table is resolved once for the whole result set.
+    The naive datetimes PyMySQL returns take a fast path: one bisect for the
+    offset, an addition and str() formatting, with no tzinfo objects or
+    parsing. Other values go through utc_to_local().
+    """
+    tz = get_timezone(tz) if tz is None or isinstance(tz, str) else tz
+    times, offsets = _utc_transitions(tz)
+    fixed = offsets[0] if len(offsets) == 1 else None
+    for row in rows:
+        for field in fields:
+            value = row.get(field)
+            if value.__class__ is datetime and value.tzinfo is None and not value.microsecond:
+                if fixed is not None:
+                    row[field] = str(value + fixed)
+                else:
+                    row[field] = str(value + offsets[max(0, bisect_right(times, value) - 1)])
+            elif value:
+                row[field] = utc_to_local(value, tz)
+    return rows
+
+def local_to_utc(value, tz=None, fmt=INPUT_FORMAT):
+    """Parse a local datetime string in ``fmt`` and return it as a naive UTC datetime.
+
+    Raises ValueError if the string does not match the format.
+    """
+    import pytz
+    tz = get_timezone(tz) if tz is None or isinstance(tz, str) else tz
+    local_dt = tz.localize(datetime.strptime(value, fmt))
+    return local_dt.astimezone(pytz.UTC).replace(tzinfo=None)
+
+def due_date_bounds(tz=None):
+    """Due-date bucket edges for "now" in ``tz``, as naive UTC datetimes"""
+    import pytz
+    tz = get_timezone(tz) if tz is None or isinstance(tz, str) else tz
+    now_local = datetime.now(pytz.UTC).astimezone(tz)
+    today_start_local = tz.localize(now_local.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None))
+
+    def to_utc(local_dt):
+        return local_dt.astimezone(pytz.UTC).replace(tzinfo=None)
+
+    return {
+        'now': to_utc(now_local),
+        'today_start': to_utc(today_start_local),
+        'today_end': to_utc(tz.normalize(today_start_local + timedelta(days=1))),
+        'week_end': to_utc(tz.normalize(today_start_local + timedelta(days=7))),
+        'next_week_end': to_utc(tz.normalize(today_start_local + timedelta(days=14)))
+    }
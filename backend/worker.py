@@ -0,0 +1,149 @@
+"""Background worker: reminder scheduler, email outbox dispatcher and maintenance jobs.
+
+The web app (app.py) only serves requests; run this next to it, scaled
+independently:
+
+    python -m worker
+
+Every worker process drains the outbox (rows are claimed with SKIP LOCKED).
+The reminder scheduler and the maintenance jobs run only in the worker that
+holds the leader lease. Metrics are logged every WORKER_METRICS_INTERVAL
+seconds and served as JSON on WORKER_METRICS_PORT when it is set.
+"""
+import json
+import signal
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import Config
+from models import init_db, get_pool, Assignment
+from email_service import init_mail, get_mail_metrics
+from notification_service import NotificationService
+from outbox import get_dispatcher
+from leader_election import get_scheduler_election
+from reminder_scheduler import get_reminder_scheduler
+from reminder_shards import get_reminder_engine
+from assignment_cache import get_assignment_cache
+from event_bus import get_event_bus
+
+class Worker:
+    """Runs the background jobs until SIGTERM/SIGINT"""
+
+    def __init__(self, maintenance_interval=3600, metrics_interval=60, metrics_port=0):
+        self.maintenance_interval = maintenance_interval
+        self.metrics_interval = metrics_interval
+        self.metrics_port = metrics_port
+        self._stop = threading.Event()
+        self._threads = []
+        self._metrics_server = None
+
+    def start(self):
+        init_db()
+        try:
+            get_pool().prefill()
+        except Exception as e:
+            print(f"⚠️  Could not prefill database pool: {e}")
+        init_mail(None)
+
+        if not get_event_bus().shared:
+            print("⚠️  EVENTS_REDIS_URL/EVENTS_SQLITE_PATH not set - reminder.sent and assignment "
+                  "events from the worker will not reach the API's event streams")
+        NotificationService.start_daily_reminder_scheduler()
+        get_dispatcher().start()
+        self._spawn(self.run_maintenance_forever, 'maintenance')
+        self._spawn(self.log_metrics_forever, 'worker-metrics')
+        if self.metrics_port:
+            self._serve_metrics()
+        print("🛠️  Worker started")
+
+    def _spawn(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def run_maintenance(self):
+        """Periodic housekeeping; only the leader runs it"""
+        if not get_scheduler_election().is_leader():
+            return
+        from rollups import verify_rollups, rebuild_rollups
+        drift = verify_rollups()
+        if drift:
+            print(f"⚠️  Assignment statistics drift for {len(drift)} user(s); rebuilding rollups")
+            rebuild_rollups()
+        purged = Assignment.purge_tombstones(Config.TOMBSTONE_RETENTION_DAYS)
+        if purged:
+            print(f"🧹 Purged {purged} assignment tombstone(s)")
+
+    def run_maintenance_forever(self):
+        while not self._stop.wait(self.maintenance_interval):
+            try:
+                self.run_maintenance()
+            except Exception as e:
+                print(f"❌ Error in maintenance job: {e}")
+
+    def metrics(self):
+        return {
+            'db_pool': get_pool().stats(),
+            'mail': get_mail_metrics(),
+            'outbox': get_dispatcher().metrics(),
+            'reminder_scheduler': get_reminder_scheduler().metrics(),
+            'leader': get_scheduler_election().metrics(),
+            'reminder_shards': get_reminder_engine().metrics(),
+            'assignment_cache': get_assignment_cache().metrics(),
+            'events': get_event_bus().metrics()
+        }
+
+    def log_metrics_forever(self):
+        while not self._stop.wait(self.metrics_interval):
+            try:
+                print(f"📊 Worker metrics: {json.dumps(self.metrics(), default=str)}")
+            except Exception as e:
+                print(f"❌ Error collecting worker metrics: {e}")
+
+    def _serve_metrics(self):
+        worker = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps(worker.metrics(), default=str).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._metrics_server = ThreadingHTTPServer(('0.0.0.0', self.metrics_port), MetricsHandler)
+        self._spawn(self._metrics_server.serve_forever, 'worker-metrics-http')
+        print(f"📊 Worker metrics on http://0.0.0.0:{self.metrics_port}/")
+
+    def stop(self):
+        """Stop the jobs; the leader lease is released so another worker can take over at once"""
+        self._stop.set()
+        get_dispatcher().stop()
+        get_scheduler_election().stop()
+        get_reminder_engine().shutdown()
+        if self._metrics_server:
+            self._metrics_server.shutdown()
+        print("🛑 Worker stopped")
+
+    def run(self):
+        signal.signal(signal.SIGTERM, lambda signum, frame: self._stop.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: self._stop.set())
+        self.start()
+        self._stop.wait()
+        self.stop()
+        return 0
+
+def main():
+    worker = Worker(
+        maintenance_interval=Config.WORKER_MAINTENANCE_INTERVAL,
+        metrics_interval=Config.WORKER_METRICS_INTERVAL,
+        metrics_port=Config.WORKER_METRICS_PORT
+    )
+    return worker.run()
+
+if __name__ == '__main__':
+    sys.exit(main())
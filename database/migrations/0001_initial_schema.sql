@@ -0,0 +1,58 @@
+-- Baseline schema: tables, indexes and constraints previously created by init_db()
+-- Databases initialised by the old init_db() already contain these objects;
+-- the migration runner treats "already exists" errors as no-ops.
+
+CREATE TABLE IF NOT EXISTS users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    password_hash VARCHAR(255) NOT NULL,
+    first_name VARCHAR(100) NOT NULL,
+    last_name VARCHAR(100) NOT NULL,
+    email_verified BOOLEAN DEFAULT FALSE,
+    email_verification_token VARCHAR(255),
+    reset_password_token VARCHAR(255),
+    reset_password_expires DATETIME,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS assignments (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    title VARCHAR(200) NOT NULL,
+    description TEXT,
+    due_date DATETIME NOT NULL,
+    priority VARCHAR(20) NOT NULL DEFAULT 'medium',
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    email_notification_sent BOOLEAN DEFAULT FALSE,
+    notification_sent_at DATETIME,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS email_notifications (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    assignment_id INT,
+    notification_type VARCHAR(50) NOT NULL,
+    email_address VARCHAR(255) NOT NULL,
+    subject VARCHAR(255) NOT NULL,
+    message TEXT NOT NULL,
+    sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    status VARCHAR(20) DEFAULT 'pending',
+    error_message TEXT
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE INDEX idx_users_email ON users(email);
+CREATE INDEX idx_users_verification_token ON users(email_verification_token);
+CREATE INDEX idx_users_reset_token ON users(reset_password_token);
+CREATE INDEX idx_assignments_user_id ON assignments(user_id);
+CREATE INDEX idx_assignments_due_date ON assignments(due_date);
+CREATE INDEX idx_assignments_status ON assignments(status);
+CREATE INDEX idx_assignments_notification_sent ON assignments(email_notification_sent);
+CREATE INDEX idx_email_notifications_user_id ON email_notifications(user_id);
+CREATE INDEX idx_email_notifications_status ON email_notifications(status);
+CREATE INDEX idx_email_notifications_sent_at ON email_notifications(sent_at);
+
+ALTER TABLE assignments ADD CONSTRAINT chk_priority CHECK (priority IN ('low', 'medium', 'high'));
+ALTER TABLE assignments ADD CONSTRAINT chk_status CHECK (status IN ('pending', 'in-progress', 'completed'));
@@ -0,0 +1,15 @@
+-- Composite indexes shaped after the hot query predicates
+-- Verify the resulting plans with: python backend/query_plans.py
+
+-- Assignment.get_all_assignments: WHERE user_id = ? ORDER BY due_date
+CREATE INDEX idx_assignments_user_due ON assignments(user_id, due_date);
+DROP INDEX idx_assignments_user_id ON assignments;
+
+-- NotificationService.get_assignments_due_within_days:
+-- WHERE email_notification_sent = FALSE AND due_date BETWEEN ? AND ? AND status != 'completed' ORDER BY due_date
+CREATE INDEX idx_assignments_reminder_scan ON assignments(email_notification_sent, due_date, status);
+DROP INDEX idx_assignments_notification_sent ON assignments;
+
+-- NotificationService.has_sent_notification_today (covering):
+-- WHERE assignment_id = ? AND status = 'sent' AND sent_at >= ? AND sent_at < ?
+CREATE INDEX idx_email_notifications_assignment_status_sent ON email_notifications(assignment_id, status, sent_at);
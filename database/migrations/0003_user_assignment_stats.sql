@@ -0,0 +1,41 @@
+-- Per-user statistics rollup maintained by the Assignment model on every write.
+-- Only status/priority counters are stored; time-dependent buckets (overdue,
+-- due today, ...) are derived at read time.
+-- Recompute or check for drift with: python backend/rollups.py verify|rebuild
+
+CREATE TABLE IF NOT EXISTS user_assignment_stats (
+    user_id INT PRIMARY KEY,
+    total INT NOT NULL DEFAULT 0,
+    completed INT NOT NULL DEFAULT 0,
+    pending INT NOT NULL DEFAULT 0,
+    in_progress INT NOT NULL DEFAULT 0,
+    high_priority INT NOT NULL DEFAULT 0,
+    medium_priority INT NOT NULL DEFAULT 0,
+    low_priority INT NOT NULL DEFAULT 0,
+    no_due_date INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT INTO user_assignment_stats
+    (user_id, total, completed, pending, in_progress, high_priority, medium_priority, low_priority, no_due_date)
+SELECT
+    user_id,
+    COUNT(*),
+    SUM(status = 'completed'),
+    SUM(status = 'pending'),
+    SUM(status = 'in-progress'),
+    SUM(status != 'completed' AND priority = 'high'),
+    SUM(status != 'completed' AND priority = 'medium'),
+    SUM(status != 'completed' AND priority = 'low'),
+    SUM(status != 'completed' AND due_date IS NULL)
+FROM assignments
+GROUP BY user_id
+ON DUPLICATE KEY UPDATE
+    total = VALUES(total),
+    completed = VALUES(completed),
+    pending = VALUES(pending),
+    in_progress = VALUES(in_progress),
+    high_priority = VALUES(high_priority),
+    medium_priority = VALUES(medium_priority),
+    low_priority = VALUES(low_priority),
+    no_due_date = VALUES(no_due_date);
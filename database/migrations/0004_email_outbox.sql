@@ -0,0 +1,17 @@
+-- Turn email_notifications into a durable outbox drained by outbox.OutboxDispatcher.
+-- Status lifecycle: pending -> sending -> sent | retry -> ... -> failed
+-- next_attempt_at is when a pending/retry row becomes due, and the lease expiry
+-- of a row in 'sending' (a crashed dispatcher's rows are reclaimed after it).
+
+ALTER TABLE email_notifications MODIFY user_id INT NULL;
+ALTER TABLE email_notifications ADD COLUMN html_message TEXT NULL;
+ALTER TABLE email_notifications ADD COLUMN sender_email VARCHAR(255) NULL;
+ALTER TABLE email_notifications ADD COLUMN attempts INT NOT NULL DEFAULT 0;
+ALTER TABLE email_notifications ADD COLUMN next_attempt_at DATETIME NULL;
+ALTER TABLE email_notifications ADD COLUMN delivered_at DATETIME NULL;
+
+CREATE INDEX idx_email_notifications_outbox ON email_notifications(status, next_attempt_at);
+
+-- Rows left 'pending' by the old code were bookkeeping for unsent mail
+-- ("Email not configured"); they must not be delivered now
+UPDATE email_notifications SET status = 'skipped' WHERE status = 'pending';
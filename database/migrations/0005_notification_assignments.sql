@@ -0,0 +1,10 @@
+-- Ledger of the assignments covered by each notification. A digest email is a
+-- single email_notifications row (assignment_id NULL) with one row here per
+-- assignment it lists.
+
+CREATE TABLE IF NOT EXISTS email_notification_assignments (
+    assignment_id INT NOT NULL,
+    notification_id INT NOT NULL,
+    PRIMARY KEY (assignment_id, notification_id),
+    INDEX idx_notification_assignments_notification (notification_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,11 @@
+-- Leadership leases for singleton background jobs (e.g. the reminder scheduler).
+-- A process leads while it holds an unexpired lease and renews it with a
+-- heartbeat; see backend/leader_election.py. Times come from the database
+-- clock so hosts with skewed clocks agree on expiry.
+
+CREATE TABLE IF NOT EXISTS leader_leases (
+    name VARCHAR(64) PRIMARY KEY,
+    holder VARCHAR(255) NOT NULL,
+    expires_at DATETIME(6) NOT NULL,
+    acquired_at DATETIME(6) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
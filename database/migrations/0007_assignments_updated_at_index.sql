@@ -0,0 +1,4 @@
+-- Lets the background worker's reminder scheduler pick up assignment writes
+-- made by web processes with a range scan on updated_at.
+
+CREATE INDEX idx_assignments_updated_at ON assignments(updated_at);
@@ -0,0 +1,3 @@
+-- Per-user display timezone (IANA name). NULL means the default, Africa/Nairobi (EAT).
+
+ALTER TABLE users ADD COLUMN timezone VARCHAR(64) NULL;
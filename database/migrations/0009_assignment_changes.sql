@@ -0,0 +1,15 @@
+-- Delta sync for GET /api/assignments/changes.
+-- Rows changed since a sync token are found with a range scan on
+-- (user_id, updated_at); deletes leave a tombstone so clients can drop the
+-- assignment. Tombstones older than TOMBSTONE_RETENTION_DAYS are purged by the
+-- worker, and older tokens get a full resync.
+
+CREATE INDEX idx_assignments_user_updated ON assignments(user_id, updated_at);
+
+CREATE TABLE IF NOT EXISTS assignment_tombstones (
+    assignment_id INT PRIMARY KEY,
+    user_id INT NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_assignment_tombstones_user_deleted (user_id, deleted_at),
+    INDEX idx_assignment_tombstones_deleted (deleted_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
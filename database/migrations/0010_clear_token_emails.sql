@@ -0,0 +1,6 @@
+-- Verification and password reset emails carry account tokens in their bodies.
+-- The outbox now clears those bodies once a row is sent or failed; this clears
+-- the ones recorded before it did.
+
+UPDATE email_notifications SET message = '', html_message = NULL
+WHERE notification_type IN ('verification', 'password_reset') AND status IN ('sent', 'failed');
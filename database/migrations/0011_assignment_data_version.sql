@@ -0,0 +1,5 @@
+-- Per-user counter behind the assignment ETags. Every transaction that writes a
+-- user's assignments bumps it together with the rollup counters, so two writes in
+-- the same second (updated_at has one-second resolution) still change the ETag.
+
+ALTER TABLE user_assignment_stats ADD COLUMN data_version BIGINT NOT NULL DEFAULT 0;
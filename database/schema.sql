@@ -1,9 +1,8 @@
 -- Deadline Tracker Database Schema for MySQL
--- This file contains the SQL schema for the assignments table
-
--- Deadline Tracker Database Schema for MySQL
--- This file contains ONLY the table creation statements
--- Indexes and constraints are handled separately by the Python code
+-- The resulting schema after every migration in database/migrations (through
+-- 0011_assignment_data_version.sql), for reference only. The application applies the
+-- migrations themselves (python backend/migrate.py upgrade); regenerate this file
+-- whenever a migration is added.
 
 -- Create users table
 CREATE TABLE IF NOT EXISTS users (
@@ -17,7 +16,11 @@ CREATE TABLE IF NOT EXISTS users (
     reset_password_token VARCHAR(255),
     reset_password_expires DATETIME,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    timezone VARCHAR(64) NULL,
+    INDEX idx_users_email (email),
+    INDEX idx_users_verification_token (email_verification_token),
+    INDEX idx_users_reset_token (reset_password_token)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Create assignments table
@@ -32,13 +35,21 @@ CREATE TABLE IF NOT EXISTS assignments (
     email_notification_sent BOOLEAN DEFAULT FALSE,
     notification_sent_at DATETIME,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_assignments_due_date (due_date),
+    INDEX idx_assignments_status (status),
+    INDEX idx_assignments_user_due (user_id, due_date),
+    INDEX idx_assignments_reminder_scan (email_notification_sent, due_date, status),
+    INDEX idx_assignments_updated_at (updated_at),
+    INDEX idx_assignments_user_updated (user_id, updated_at),
+    CONSTRAINT chk_priority CHECK (priority IN ('low', 'medium', 'high')),
+    CONSTRAINT chk_status CHECK (status IN ('pending', 'in-progress', 'completed'))
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
--- Create email_notifications table
+-- Create email_notifications table (also the outbox drained by backend/outbox.py)
 CREATE TABLE IF NOT EXISTS email_notifications (
     id INT AUTO_INCREMENT PRIMARY KEY,
-    user_id INT NOT NULL,
+    user_id INT NULL,
     assignment_id INT,
     notification_type VARCHAR(50) NOT NULL,
     email_address VARCHAR(255) NOT NULL,
@@ -46,5 +57,55 @@ CREATE TABLE IF NOT EXISTS email_notifications (
     message TEXT NOT NULL,
     sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     status VARCHAR(20) DEFAULT 'pending',
-    error_message TEXT
+    error_message TEXT,
+    html_message TEXT NULL,
+    sender_email VARCHAR(255) NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at DATETIME NULL,
+    delivered_at DATETIME NULL,
+    INDEX idx_email_notifications_user_id (user_id),
+    INDEX idx_email_notifications_status (status),
+    INDEX idx_email_notifications_sent_at (sent_at),
+    INDEX idx_email_notifications_assignment_status_sent (assignment_id, status, sent_at),
+    INDEX idx_email_notifications_outbox (status, next_attempt_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Create email_notification_assignments table (assignments covered by each notification)
+CREATE TABLE IF NOT EXISTS email_notification_assignments (
+    assignment_id INT NOT NULL,
+    notification_id INT NOT NULL,
+    PRIMARY KEY (assignment_id, notification_id),
+    INDEX idx_notification_assignments_notification (notification_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Create user_assignment_stats table (per-user statistics rollup)
+CREATE TABLE IF NOT EXISTS user_assignment_stats (
+    user_id INT PRIMARY KEY,
+    total INT NOT NULL DEFAULT 0,
+    completed INT NOT NULL DEFAULT 0,
+    pending INT NOT NULL DEFAULT 0,
+    in_progress INT NOT NULL DEFAULT 0,
+    high_priority INT NOT NULL DEFAULT 0,
+    medium_priority INT NOT NULL DEFAULT 0,
+    low_priority INT NOT NULL DEFAULT 0,
+    no_due_date INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    data_version BIGINT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Create leader_leases table (leases for singleton background jobs)
+CREATE TABLE IF NOT EXISTS leader_leases (
+    name VARCHAR(64) PRIMARY KEY,
+    holder VARCHAR(255) NOT NULL,
+    expires_at DATETIME(6) NOT NULL,
+    acquired_at DATETIME(6) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Create assignment_tombstones table (deleted assignments, for delta sync)
+CREATE TABLE IF NOT EXISTS assignment_tombstones (
+    assignment_id INT PRIMARY KEY,
+    user_id INT NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_assignment_tombstones_user_deleted (user_id, deleted_at),
+    INDEX idx_assignment_tombstones_deleted (deleted_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;